@@ -3,6 +3,8 @@ import bcrypt
 import os
 from datetime import datetime
 from utils.log_config import setup_logging
+from utils.storage_profile import load_storage_profile, apply_storage_profile
+from database.migrations import run_migrations
 
 class DatabaseInitializer:
     def __init__(self):
@@ -17,6 +19,7 @@ class DatabaseInitializer:
         
         # Connect to database
         conn = sqlite3.connect(self.db_path)
+        apply_storage_profile(conn, load_storage_profile())
         cursor = conn.cursor()
         
         try:
@@ -130,6 +133,9 @@ class DatabaseInitializer:
             
             # Commit changes
             conn.commit()
+            
+            # Bring new and existing databases up to the current schema version
+            run_migrations(conn)
             self.logger.info("Database initialized successfully")
             
         except Exception as e:
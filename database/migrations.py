@@ -0,0 +1,382 @@
+import sqlite3
+from typing import Callable, Dict, List, NamedTuple, Tuple
+from utils.log_config import setup_logging
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+
+def _add_secondary_indexes(cursor: sqlite3.Cursor) -> None:
+    """Index the columns used by lookups, filters and date-range reports"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_criminals_status ON criminals (status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_criminals_crime_type ON criminals (crime_type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_criminals_arrest_date ON criminals (arrest_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cases_status ON cases (status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cases_date_reported ON cases (date_reported)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_evidence_case_id ON evidence (case_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_evidence_date_collected ON evidence (date_collected)")
+    # case_criminals is keyed on (case_id, criminal_id); reverse lookups need their own index
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_case_criminals_criminal_id ON case_criminals (criminal_id)")
+
+
+# Columns mirrored into each table's <table>_fts full-text index
+SEARCH_INDEXES = {
+    'criminals': ('name', 'crime_type', 'notes'),
+    'cases': ('title', 'description'),
+    'evidence': ('name', 'description', 'notes'),
+}
+
+
+def fts5_available(cursor: sqlite3.Cursor) -> bool:
+    """Whether this SQLite build can create FTS5 tables"""
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        cursor.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _add_search_indexes(cursor: sqlite3.Cursor) -> None:
+    """Full-text indexes kept in sync by triggers, backfilled from existing rows"""
+    if not fts5_available(cursor):
+        # Searches fall back to LIKE when the index tables are missing
+        setup_logging('migrations').warning("SQLite was built without FTS5; full-text search is disabled")
+        return
+
+    for table, columns in SEARCH_INDEXES.items():
+        fts = f"{table}_fts"
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+
+        # External content: the index stores only tokens and reads column
+        # values back from the base table; prefix indexes serve "term*"
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {column_list},
+                content='{table}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+# Natural keys that upserts use as their ON CONFLICT target
+NATURAL_KEYS = {
+    'cases': 'case_number',
+    'evidence': 'evidence_number',
+}
+
+
+def _add_natural_key_indexes(cursor: sqlite3.Cursor) -> None:
+    """Unique indexes on natural keys, where existing data allows them"""
+    for table, column in NATURAL_KEYS.items():
+        duplicate = cursor.execute(
+            f"SELECT {column} FROM {table} GROUP BY {column} HAVING COUNT(*) > 1 LIMIT 1"
+        ).fetchone()
+        if duplicate:
+            # Creating the index would fail; leave the data for a person to fix
+            setup_logging('migrations').warning(
+                f"{table}.{column} has duplicates (e.g. {duplicate[0]!r}); skipping its "
+                f"unique index, so upserts on {table} are unavailable"
+            )
+            continue
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_{column} ON {table} ({column})")
+
+
+# Columns whose per-value row counts are kept in entity_counters, next to
+# each table's total (stored with dimension and value '')
+COUNTED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'criminals': ('status', 'crime_type'),
+    'cases': ('status',),
+    'evidence': ('status',),
+}
+
+
+def rebuild_entity_counters(cursor: sqlite3.Cursor) -> None:
+    """Recount entity_counters from the base tables"""
+    cursor.execute("DELETE FROM entity_counters")
+    for table, columns in COUNTED_COLUMNS.items():
+        cursor.execute(f"""
+            INSERT INTO entity_counters (entity, dimension, value, count)
+            SELECT '{table}', '', '', COUNT(*) FROM {table}
+        """)
+        for column in columns:
+            # NULLs are counted under ''; the key columns cannot hold NULL
+            cursor.execute(f"""
+                INSERT INTO entity_counters (entity, dimension, value, count)
+                SELECT '{table}', '{column}', COALESCE({column}, ''), COUNT(*)
+                FROM {table}
+                GROUP BY COALESCE({column}, '')
+            """)
+
+
+def _add_entity_counters(cursor: sqlite3.Cursor) -> None:
+    """Row counts per table, status and crime type, kept current by triggers"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS entity_counters (
+            entity TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (entity, dimension, value)
+        ) WITHOUT ROWID
+    """)
+
+    def change(table: str, dimension: str, value: str, delta: str) -> str:
+        return (f"INSERT INTO entity_counters (entity, dimension, value, count) "
+                f"VALUES ('{table}', '{dimension}', {value}, {delta}) "
+                f"ON CONFLICT (entity, dimension, value) DO UPDATE SET count = count + ({delta});")
+
+    for table, columns in COUNTED_COLUMNS.items():
+        added = [change(table, '', "''", '1')]
+        added += [change(table, column, f"COALESCE(new.{column}, '')", '1') for column in columns]
+        removed = [change(table, '', "''", '-1')]
+        removed += [change(table, column, f"COALESCE(old.{column}, '')", '-1') for column in columns]
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_counters_insert AFTER INSERT ON {table} BEGIN
+                {' '.join(added)}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_counters_delete AFTER DELETE ON {table} BEGIN
+                {' '.join(removed)}
+            END
+        """)
+        for column in columns:
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_counters_{column} AFTER UPDATE OF {column} ON {table}
+                WHEN old.{column} IS NOT new.{column} BEGIN
+                    {change(table, column, f"COALESCE(old.{column}, '')", '-1')}
+                    {change(table, column, f"COALESCE(new.{column}, '')", '1')}
+                END
+            """)
+
+    rebuild_entity_counters(cursor)
+
+
+class MonthlyRollup(NamedTuple):
+    rollup: str
+    date_column: str
+    # (rollup column, amount each base row adds); {row} is the row alias
+    measures: Tuple[Tuple[str, str], ...]
+    # Other base columns the amounts depend on
+    inputs: Tuple[str, ...] = ()
+
+
+# Rows whose date is NULL belong to no month and are left out
+MONTHLY_ROLLUPS: Dict[str, MonthlyRollup] = {
+    'cases': MonthlyRollup('case_monthly', 'date_reported', (
+        ('total_cases', "1"),
+        ('closed_cases', "CASE WHEN {row}.status = 'Closed' THEN 1 ELSE 0 END"),
+    ), inputs=('status',)),
+    'evidence': MonthlyRollup('evidence_monthly', 'date_collected', (
+        ('evidence_count', "1"),
+    )),
+}
+
+
+def _add_monthly_rollups(cursor: sqlite3.Cursor) -> None:
+    """Per-month case and evidence totals kept current by triggers"""
+    for table, (rollup, date_column, measures, inputs) in MONTHLY_ROLLUPS.items():
+        names = [name for name, _ in measures]
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {rollup} (
+                month TEXT PRIMARY KEY,
+                {', '.join(f'{name} INTEGER NOT NULL DEFAULT 0' for name in names)}
+            ) WITHOUT ROWID
+        """)
+
+        def change(row: str, sign: str) -> str:
+            month = f"strftime('%Y-%m', {row}.{date_column})"
+            amounts = ", ".join(f"{sign}({amount.format(row=row)})" for _, amount in measures)
+            # The WHERE clause also keeps ON CONFLICT from parsing as a join constraint
+            return (f"INSERT INTO {rollup} (month, {', '.join(names)}) "
+                    f"SELECT {month}, {amounts} WHERE {month} IS NOT NULL "
+                    f"ON CONFLICT (month) DO UPDATE SET "
+                    + ", ".join(f"{name} = {name} + excluded.{name}" for name in names) + ";")
+
+        watched = (date_column, *inputs)
+        changed = " OR ".join(f"old.{column} IS NOT new.{column}" for column in watched)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {rollup}_insert AFTER INSERT ON {table} BEGIN
+                {change('new', '+')}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {rollup}_delete AFTER DELETE ON {table} BEGIN
+                {change('old', '-')}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {rollup}_update AFTER UPDATE OF {', '.join(watched)} ON {table}
+            WHEN {changed} BEGIN
+                {change('old', '-')}
+                {change('new', '+')}
+            END
+        """)
+
+        # Backfill with one grouped scan of the base table
+        month = f"strftime('%Y-%m', {date_column})"
+        cursor.execute(f"DELETE FROM {rollup}")
+        cursor.execute(f"""
+            INSERT INTO {rollup} (month, {', '.join(names)})
+            SELECT {month} as month, {', '.join(f"SUM({amount.format(row=table)})" for _, amount in measures)}
+            FROM {table}
+            WHERE {month} IS NOT NULL
+            GROUP BY month
+        """)
+
+
+# Months covered by calendar_months, as the first day of each end month
+CALENDAR_SPAN = ('1900-01-01', '2199-12-01')
+
+
+def _add_calendar_months(cursor: sqlite3.Cursor) -> None:
+    """Month dimension table for month-by-month reports"""
+    # Reports join a month to its rows as a date range from month_start,
+    # which the date indexes serve
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS calendar_months (
+            month TEXT PRIMARY KEY,
+            month_start DATE NOT NULL
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        WITH RECURSIVE months(start) AS (
+            SELECT date(?)
+            UNION ALL
+            SELECT date(start, '+1 month') FROM months WHERE start < date(?)
+        )
+        INSERT OR IGNORE INTO calendar_months (month, month_start)
+        SELECT strftime('%Y-%m', start), start
+        FROM months
+    """, CALENDAR_SPAN)
+
+
+def _add_login_failures(cursor: sqlite3.Cursor) -> None:
+    """Failed login times, so login throttling survives restarts"""
+    # scope is 'user' (key = lower-cased username) or 'process' (key = '')
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS login_failures (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            failed_at REAL NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_login_failures_key
+        ON login_failures (scope, key, failed_at)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_login_failures_failed_at ON login_failures (failed_at)")
+
+
+# Tables written by triggers when the key table changes; the query cache
+# invalidates them together
+DERIVED_TABLES: Dict[str, Tuple[str, ...]] = {
+    'criminals': ('criminals_fts', 'entity_counters'),
+    'cases': ('cases_fts', 'entity_counters', 'case_monthly'),
+    'evidence': ('evidence_fts', 'entity_counters', 'evidence_monthly'),
+}
+
+
+# Append new steps with the next version number; never edit or reorder
+# a step that has shipped. Every step must be safe to run on a database
+# that already has its changes.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Secondary indexes for lookups and date-range reports", _add_secondary_indexes),
+    Migration(2, "FTS5 search indexes for criminals, cases and evidence", _add_search_indexes),
+    Migration(3, "Unique natural keys for case and evidence numbers", _add_natural_key_indexes),
+    Migration(4, "Trigger-maintained entity counters", _add_entity_counters),
+    Migration(5, "Monthly case and evidence rollups", _add_monthly_rollups),
+    Migration(6, "Calendar months for monthly reports", _add_calendar_months),
+    Migration(7, "Persisted failed logins for throttling", _add_login_failures),
+]
+
+
+class MigrationRunner:
+    """Bring a database up to the latest schema version"""
+
+    def __init__(self, conn: sqlite3.Connection, migrations: List[Migration] = MIGRATIONS):
+        self.conn = conn
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.logger = setup_logging('migrations')
+
+    def current_version(self) -> int:
+        """Highest migration version recorded in schema_version"""
+        row = self.conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        return row[0] or 0
+
+    def latest_version(self) -> int:
+        """Version the database will be at after run()"""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def run(self) -> int:
+        """Apply pending migrations in order, each in its own transaction
+
+        Returns the number of migrations applied.
+        """
+        isolation_level = self.conn.isolation_level
+        self.conn.isolation_level = None  # Manage transactions explicitly, DDL included
+        try:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            current = self.current_version()
+            pending = [m for m in self.migrations if m.version > current]
+            for migration in pending:
+                self._apply(migration)
+
+            if pending:
+                self.logger.info(f"Schema upgraded from version {current} to {self.current_version()}")
+            return len(pending)
+        finally:
+            self.conn.isolation_level = isolation_level
+
+    def _apply(self, migration: Migration) -> None:
+        """Apply one migration and record it atomically"""
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            migration.apply(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (migration.version, migration.description)
+            )
+            cursor.execute("COMMIT")
+            self.logger.info(f"Applied migration {migration.version}: {migration.description}")
+        except sqlite3.Error as e:
+            cursor.execute("ROLLBACK")
+            self.logger.error(f"Migration {migration.version} failed: {str(e)}")
+            raise
+
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """Apply all pending migrations to an open connection"""
+    return MigrationRunner(conn).run()
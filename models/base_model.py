@@ -1,17 +1,57 @@
-from typing import Dict, List, Optional, Any
+import re
+from typing import Dict, Iterable, List, Optional, Any, Iterator, Sequence, Tuple, Union
 from utils.db_helper import DatabaseHelper
+from database.migrations import COUNTED_COLUMNS
+
+# A projection name from the model's projections, an explicit column list,
+# or None for every column
+Columns = Union[None, str, Sequence[str]]
+
+
+def match_expression(query: str) -> str:
+    """FTS5 MATCH expression requiring every word of query as a prefix
+
+    Words are quoted, so FTS5 operators typed by the user are searched for
+    literally instead of being interpreted.
+    """
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
+
 
 class BaseModel:
     table_name: str = ""
     primary_key: str = "id"
+    # Named column sets; a None entry selects every column
+    projections: Dict[str, Optional[Tuple[str, ...]]] = {}
+    # Column(s) identifying a record outside the database; the default
+    # conflict target of upsert_many()
+    natural_key: Union[None, str, Tuple[str, ...]] = None
     
     def __init__(self):
         self.db = DatabaseHelper()
+        self._search_index: Optional[bool] = None
+        self._columns: Optional[List[str]] = None
+        self._counters: Optional[bool] = None
     
     def create(self, data: Dict[str, Any]) -> int:
         """Create a new record"""
         return self.db.insert_and_get_id(self.table_name, data)
     
+    def create_many(self, rows: Sequence[Dict[str, Any]]) -> List[int]:
+        """Create many records in one transaction and return their IDs"""
+        return self.db.insert_many(self.table_name, rows, self.primary_key)
+    
+    def upsert_many(self, rows: Sequence[Dict[str, Any]],
+                    key: Union[None, str, Sequence[str]] = None) -> List[int]:
+        """Create records or update the ones whose key matches, in one transaction
+        
+        key defaults to the model's natural_key. Returns each row's ID.
+        """
+        key = key or self.natural_key
+        if not key:
+            raise ValueError(f"{self.table_name} has no natural key; pass key explicitly")
+        key = (key,) if isinstance(key, str) else tuple(key)
+        return self.db.upsert_many(self.table_name, rows, key, self.primary_key)
+    
     def update(self, id: int, data: Dict[str, Any]) -> None:
         """Update an existing record"""
         self.db.update_record(
@@ -36,14 +76,201 @@ class BaseModel:
             (id,)
         )
     
-    def get_all(self) -> List[Dict[str, Any]]:
+    def get_by_ids(self, ids: Iterable[int], columns: Columns = None,
+                   row_format: str = 'dict') -> List[Dict[str, Any]]:
+        """Records for many IDs, in the order given; unknown IDs are skipped
+        
+        IDs are looked up in IN (...) chunks as large as SQLite allows, so
+        even a very large set takes only a few queries.
+        """
+        pk = self.primary_key
+        ids = list(dict.fromkeys(ids))
+        select = self.select_list(columns, required=(pk,))
+        found = {}
+        for chunk in self._id_chunks(ids):
+            for row in self.db.execute_query(
+                f"SELECT {select} FROM {self.table_name} WHERE {pk} IN ({', '.join('?' * len(chunk))})",
+                chunk,
+                row_format=row_format
+            ):
+                found[row[pk]] = row
+        return [found[id] for id in ids if id in found]
+
+    def missing_ids(self, ids: Iterable[int]) -> List[int]:
+        """The given IDs that have no record, in the order given"""
+        pk = self.primary_key
+        ids = list(dict.fromkeys(ids))
+        existing = set()
+        for chunk in self._id_chunks(ids):
+            existing.update(row[pk] for row in self.db.execute_query(
+                f"SELECT {pk} FROM {self.table_name} WHERE {pk} IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ))
+        return [id for id in ids if id not in existing]
+
+    def _id_chunks(self, ids: Iterable[int]) -> Iterator[Tuple[int, ...]]:
+        """Distinct IDs in groups small enough to bind in one statement"""
+        ids = tuple(dict.fromkeys(ids))
+        size = self.db.max_variables()
+        for start in range(0, len(ids), size):
+            yield ids[start:start + size]
+
+    def get_all(self, row_format: str = 'dict', columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all records"""
-        return self.db.execute_query(f"SELECT * FROM {self.table_name}")
-    
-    def get_by_field(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        return self.db.execute_query(
+            f"SELECT {self.select_list(columns)} FROM {self.table_name}",
+            row_format=row_format
+        )
+
+    def iter_all(self, batch_size: int = 500, row_format: str = 'dict',
+                 columns: Columns = None) -> Iterator[Dict[str, Any]]:
+        """Stream all records without loading the whole table"""
+        return self.db.iter_query(
+            f"SELECT {self.select_list(columns)} FROM {self.table_name}",
+            batch_size=batch_size,
+            row_format=row_format
+        )
+
+    def iter_ids(self, batch_size: int = 1000) -> Iterator[int]:
+        """Stream the primary keys of all records"""
+        for row in self.db.iter_query(
+            f"SELECT {self.primary_key} FROM {self.table_name}",
+            batch_size=batch_size
+        ):
+            yield row[self.primary_key]
+
+    def column_names(self) -> List[str]:
+        """Columns of the model's table"""
+        if self._columns is None:
+            self._columns = [row['name'] for row in self.db.execute_query(
+                f"PRAGMA table_info({self.table_name})"
+            )]
+        return self._columns
+
+    def select_list(self, columns: Columns = None, alias: str = "",
+                    required: Sequence[str] = ()) -> str:
+        """SELECT list for a projection name or explicit columns
+        
+        required columns are added when the projection lacks them; alias
+        qualifies every column with a table alias.
+        """
+        if isinstance(columns, str):
+            if columns not in self.projections:
+                raise ValueError(f"Unknown projection '{columns}' for {self.table_name}")
+            columns = self.projections[columns]
+
+        prefix = f"{alias}." if alias else ""
+        if columns is None:
+            return f"{prefix}*"
+
+        known = self.column_names()
+        selected = list(columns)
+        selected += [c for c in dict.fromkeys(required) if c not in selected]
+        for column in selected:
+            if column not in known:
+                raise ValueError(f"Unknown column '{column}' for {self.table_name}")
+        return ", ".join(f"{prefix}{column}" for column in selected)
+
+    def get_page(self, order_by: str = 'id', after_key: Optional[Tuple[Any, int]] = None,
+                 limit: int = 50, filters: Optional[Dict[str, Any]] = None,
+                 descending: bool = False, row_format: str = 'dict',
+                 columns: Columns = None) -> Dict[str, Any]:
+        """One page of records ordered by (order_by, id)
+        
+        Keyset pagination: pass the previous page's next_key as after_key to
+        get the page after it. Each page seeks straight to its first row
+        instead of skipping over the earlier ones, so with an index on
+        order_by page N costs the same as page 1. filters are equality
+        conditions and columns picks a projection (see select_list()).
+        Returns a dict with rows, next_key (None on the last page) and
+        approx_total.
+        """
+        filters = filters or {}
+        known = self.column_names()
+        for field in (order_by, *filters):
+            if field not in known:
+                raise ValueError(f"Unknown column '{field}' for {self.table_name}")
+
+        pk = self.primary_key
+        direction = "DESC" if descending else "ASC"
+        order = f"{pk} {direction}" if order_by == pk else f"{order_by} {direction}, {pk} {direction}"
+        filter_sql = "".join(f" AND {field} = ?" for field in filters)
+        select = self.select_list(columns, required=(pk, order_by))
+
+        # Fetch one extra row to learn whether another page follows
+        rows = []
+        for condition, params in self._seek_segments(order_by, after_key, descending):
+            wanted = limit + 1 - len(rows)
+            if wanted <= 0:
+                break
+            rows += self.db.execute_query(
+                f"SELECT {select} FROM {self.table_name} WHERE {condition}{filter_sql} ORDER BY {order} LIMIT ?",
+                (*params, *filters.values(), wanted),
+                row_format=row_format
+            )
+
+        next_key = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_key = (rows[-1][order_by], rows[-1][pk])
+
+        return {
+            'rows': rows,
+            'next_key': next_key,
+            'approx_total': self.approximate_count(filters),
+        }
+
+    def _seek_segments(self, order_by: str, after_key: Optional[Tuple[Any, int]],
+                       descending: bool) -> List[Tuple[str, list]]:
+        """WHERE conditions for the rest of the ordering, in reading order
+        
+        Row-value comparisons let SQLite seek in the order_by index but
+        never match NULL, so rows with a NULL order_by are read as their own
+        segment: first when ascending, last when descending.
+        """
+        pk = self.primary_key
+        op = "<" if descending else ">"
+        if order_by == pk:
+            return [(f"{pk} {op} ?", [after_key[1]]) if after_key else ("1", [])]
+
+        nulls = (f"{order_by} IS NULL", [])
+        values = (f"{order_by} IS NOT NULL", [])
+        if after_key is not None:
+            value, last_id = after_key
+            if value is None:
+                nulls = (f"{order_by} IS NULL AND {pk} {op} ?", [last_id])
+                return [nulls] if descending else [nulls, values]
+            values = (f"({order_by}, {pk}) {op} (?, ?)", [value, last_id])
+            return [values, nulls] if descending else [values]
+        return [values, nulls] if descending else [nulls, values]
+
+    def approximate_count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Row count for paging controls
+        
+        Read from entity_counters when the table counts the filtered column
+        (see count_where()), so it costs the same on every page however
+        large the table is. Other filters run a COUNT(*) that the query
+        cache keeps until the table is written.
+        """
+        filters = filters or {}
+        if not filters:
+            return self.count()
+        if len(filters) == 1 and self.has_counters():
+            (field, value), = filters.items()
+            if field in COUNTED_COLUMNS[self.table_name]:
+                return self.count_where(field, value)
+        where = " AND ".join(f"{field} = ?" for field in filters)
+        result = self.db.get_single_result(
+            f"SELECT COUNT(*) as count FROM {self.table_name}" + (f" WHERE {where}" if where else ""),
+            tuple(filters.values()),
+            cache=True
+        )
+        return result['count'] if result else 0
+
+    def get_by_field(self, field: str, value: Any, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get records by field value"""
         return self.db.execute_query(
-            f"SELECT * FROM {self.table_name} WHERE {field} = ?",
+            f"SELECT {self.select_list(columns)} FROM {self.table_name} WHERE {field} = ?",
             (value,)
         )
     
@@ -57,10 +284,58 @@ class BaseModel:
     
     def count(self) -> int:
         """Get total count of records"""
+        if self.has_counters():
+            return self._read_counter('', '')
+        result = self.db.get_single_result(
+            f"SELECT COUNT(*) as count FROM {self.table_name}",
+            cache=True
+        )
+        return result['count'] if result else 0
+
+    def has_counters(self) -> bool:
+        """Whether entity_counters keeps this table's counts (see database/migrations.py)"""
+        if self._counters is None:
+            self._counters = (self.table_name in COUNTED_COLUMNS
+                              and self.db.table_exists('entity_counters'))
+        return self._counters
+
+    def count_where(self, field: str, value: Any) -> int:
+        """Number of records whose field equals value; None counts NULLs"""
+        if self.has_counters() and field in COUNTED_COLUMNS[self.table_name]:
+            # NULLs are counted under '', as counts_by() reports them
+            return self._read_counter(field, '' if value is None else value)
+        if field not in self.column_names():
+            raise ValueError(f"Unknown column '{field}' for {self.table_name}")
         result = self.db.get_single_result(
-            f"SELECT COUNT(*) as count FROM {self.table_name}"
+            f"SELECT COUNT(*) as count FROM {self.table_name} WHERE {field} IS ?",
+            (value,),
+            cache=True
         )
         return result['count'] if result else 0
+
+    def counts_by(self, field: str) -> Dict[Optional[str], int]:
+        """Number of records per distinct value of field"""
+        if self.has_counters() and field in COUNTED_COLUMNS[self.table_name]:
+            rows = self.db.execute_query("""
+                SELECT NULLIF(value, '') as value, count
+                FROM entity_counters
+                WHERE entity = ? AND dimension = ? AND count > 0
+            """, (self.table_name, field), cache=True)
+        else:
+            if field not in self.column_names():
+                raise ValueError(f"Unknown column '{field}' for {self.table_name}")
+            rows = self.db.execute_query(
+                f"SELECT {field} as value, COUNT(*) as count FROM {self.table_name} GROUP BY {field}",
+                cache=True
+            )
+        return {row['value']: row['count'] for row in rows}
+
+    def _read_counter(self, dimension: str, value: Any) -> int:
+        result = self.db.get_single_result("""
+            SELECT count FROM entity_counters
+            WHERE entity = ? AND dimension = ? AND value = ?
+        """, (self.table_name, dimension, value), cache=True)
+        return result['count'] if result else 0
     
     def search(self, query: str, fields: List[str]) -> List[Dict[str, Any]]:
         """Search records across specified fields"""
@@ -69,4 +344,29 @@ class BaseModel:
         return self.db.execute_query(
             f"SELECT * FROM {self.table_name} WHERE {conditions}",
             params
-        ) 
\ No newline at end of file
+        )
+
+    def has_search_index(self) -> bool:
+        """Whether the table has an FTS5 index (see database/migrations.py)"""
+        if self._search_index is None:
+            self._search_index = self.db.table_exists(f"{self.table_name}_fts")
+        return self._search_index
+
+    def full_text_search(self, query: str, fields: List[str]) -> List[Dict[str, Any]]:
+        """Search the table's full-text index, best matches first
+
+        Every word matches as a prefix and results are ordered by bm25.
+        Falls back to search() over fields when the index is unavailable.
+        """
+        match = match_expression(query)
+        if not match or not self.has_search_index():
+            return self.search(query, fields)
+
+        fts = f"{self.table_name}_fts"
+        return self.db.execute_query(f"""
+            SELECT t.*
+            FROM {fts}
+            JOIN {self.table_name} t ON t.{self.primary_key} = {fts}.rowid
+            WHERE {fts} MATCH ?
+            ORDER BY bm25({fts})
+        """, (match,)) 
\ No newline at end of file
@@ -1,15 +1,24 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from datetime import datetime
-from .base_model import BaseModel
+from .base_model import BaseModel, Columns
+from .criminal import CriminalModel
 import sqlite3
 
 class CaseModel(BaseModel):
     table_name = "cases"
+    natural_key = "case_number"
+    projections = {
+        'list': ('id', 'case_number', 'title', 'status', 'date_reported', 'closed_date'),
+        'detail': None,
+        'export': ('id', 'case_number', 'title', 'description', 'status', 'date_reported',
+                   'closed_date', 'notes'),
+    }
     
     def __init__(self):
         """Initialize the case model"""
         super().__init__()
         self.searchable_fields = ['title', 'status', 'description']
+        self.criminal_model = CriminalModel()
     
     def create_case(self, data: Dict[str, Any], criminal_ids: List[int] = None) -> int:
         """Create a new case with optional linked criminals"""
@@ -17,59 +26,59 @@ class CaseModel(BaseModel):
         data['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         data['updated_at'] = data['created_at']
         
-        # Create case
-        case_id = self.create(data)
-        
-        # Link criminals if provided
-        if criminal_ids:
-            self.link_criminals(case_id, criminal_ids)
+        # Create the case and its links in one transaction
+        with self.db.transaction():
+            case_id = self.create(data)
+            
+            # Link criminals if provided
+            if criminal_ids:
+                self.link_criminals(case_id, criminal_ids)
             
         return case_id
     
     def update_case(self, id: int, data: Dict[str, Any], criminal_ids: List[int] = None) -> None:
         """Update a case with optional criminal links update"""
-        if not self.exists(id):
-            raise ValueError(f"Case with ID {id} not found")
-        
-        # Update timestamp
-        data['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Update case
-        self.update(id, data)
-        
-        # Update criminal links if provided
-        if criminal_ids is not None:  # Allow empty list to remove all links
-            self.update_criminal_links(id, criminal_ids)
+        with self.db.transaction():
+            if not self.exists(id):
+                raise ValueError(f"Case with ID {id} not found")
+            
+            # Update timestamp
+            data['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            # Update case
+            self.update(id, data)
+            
+            # Update criminal links if provided
+            if criminal_ids is not None:  # Allow empty list to remove all links
+                self.update_criminal_links(id, criminal_ids)
     
     def link_criminals(self, case_id: int, criminal_ids: List[int]) -> None:
         """Link criminals to a case"""
-        # First verify all criminals exist
-        for criminal_id in criminal_ids:
-            result = self.db.get_single_result(
-                "SELECT id FROM criminals WHERE id = ?",
-                (criminal_id,)
+        with self.db.transaction():
+            # First verify all criminals exist
+            missing = self.criminal_model.missing_ids(criminal_ids)
+            if missing:
+                raise ValueError(f"Criminal ID {missing[0]} does not exist")
+            
+            # If all criminals exist, create the links
+            values = [(case_id, criminal_id) for criminal_id in criminal_ids]
+            self.db.execute_many(
+                "INSERT INTO case_criminals (case_id, criminal_id) VALUES (?, ?)",
+                values
             )
-            if not result:
-                raise ValueError(f"Criminal ID {criminal_id} does not exist")
-        
-        # If all criminals exist, create the links
-        values = [(case_id, criminal_id) for criminal_id in criminal_ids]
-        self.db.execute_many(
-            "INSERT INTO case_criminals (case_id, criminal_id) VALUES (?, ?)",
-            values
-        )
     
     def update_criminal_links(self, case_id: int, criminal_ids: List[int]) -> None:
         """Update the criminals linked to a case"""
-        # Remove existing links
-        self.db.execute_query(
-            "DELETE FROM case_criminals WHERE case_id = ?",
-            (case_id,)
-        )
-        
-        # Add new links
-        if criminal_ids:
-            self.link_criminals(case_id, criminal_ids)
+        with self.db.transaction():
+            # Remove existing links
+            self.db.execute_query(
+                "DELETE FROM case_criminals WHERE case_id = ?",
+                (case_id,)
+            )
+            
+            # Add new links
+            if criminal_ids:
+                self.link_criminals(case_id, criminal_ids)
     
     def get_case_criminals(self, case_id: int) -> List[Dict[str, Any]]:
         """Get all criminals linked to a case"""
@@ -82,24 +91,55 @@ class CaseModel(BaseModel):
     
     def get_case_with_details(self, case_id: int) -> Optional[Dict[str, Any]]:
         """Get case with criminal details"""
-        case = self.db.get_single_result("""
-            SELECT c.*
-            FROM cases c
-            WHERE c.id = ?
-        """, (case_id,))
-        
-        if case:
-            case['criminals'] = self.get_case_criminals(case_id)
+        return self.hydrate_case(case_id)
+    
+    def hydrate_case(self, case_id: int) -> Optional[Dict[str, Any]]:
+        """A case with its 'criminals' and 'evidence' lists, or None"""
+        cases = self.hydrate_cases([case_id])
+        return cases[0] if cases else None
+    
+    def hydrate_cases(self, case_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Cases with their linked criminals and evidence, in the order given
         
-        return case
+        Cases, criminals and evidence are read with one query each (per
+        chunk of IDs) inside a single snapshot, so the three always agree.
+        Each case gets 'criminals' and 'evidence' lists ordered by id;
+        unknown IDs are skipped.
+        """
+        with self.db.read_snapshot():
+            cases = self.get_by_ids(case_ids)
+            by_id = {}
+            for case in cases:
+                case['criminals'] = []
+                case['evidence'] = []
+                by_id[case['id']] = case
+            
+            for chunk in self._id_chunks(by_id):
+                placeholders = ', '.join('?' * len(chunk))
+                for row in self.db.execute_query(f"""
+                    SELECT cc.case_id as linked_case_id, cr.*
+                    FROM case_criminals cc
+                    JOIN criminals cr ON cr.id = cc.criminal_id
+                    WHERE cc.case_id IN ({placeholders})
+                    ORDER BY cc.case_id, cr.id
+                """, chunk):
+                    by_id[row.pop('linked_case_id')]['criminals'].append(row)
+                for row in self.db.execute_query(f"""
+                    SELECT *
+                    FROM evidence
+                    WHERE case_id IN ({placeholders})
+                    ORDER BY case_id, id
+                """, chunk):
+                    by_id[row['case_id']]['evidence'].append(row)
+        return cases
     
     def get_cases_by_officer(self, officer_id: int) -> List[Dict[str, Any]]:
         """Get all cases assigned to an officer"""
         return self.get_by_field('officer_id', officer_id)
     
-    def get_cases_by_status(self, status: str) -> List[Dict[str, Any]]:
+    def get_cases_by_status(self, status: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get cases by status"""
-        return self.get_by_field('status', status)
+        return self.get_by_field('status', status, columns)
     
     def get_recent_cases(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most recently created cases"""
@@ -112,21 +152,19 @@ class CaseModel(BaseModel):
         """Get case statistics"""
         total = self.count()
         
-        status_stats = self.db.execute_query("""
-            SELECT status, COUNT(*) as count
-            FROM cases
-            GROUP BY status
-        """)
+        status_stats = [
+            {'status': status, 'count': count}
+            for status, count in self.counts_by('status').items()
+        ]
         
+        # Maintained by triggers (see database/migrations.py); cases with
+        # no date_reported are not part of any month
         monthly_stats = self.db.execute_query("""
-            SELECT 
-                strftime('%Y-%m', date_reported) as month,
-                COUNT(*) as total_cases,
-                SUM(CASE WHEN status = 'Closed' THEN 1 ELSE 0 END) as closed_cases
-            FROM cases
-            GROUP BY month
+            SELECT month, total_cases, closed_cases
+            FROM case_monthly
+            WHERE total_cases > 0
             ORDER BY month ASC
-        """)
+        """, cache=True)
         
         return {
             'total_cases': total,
@@ -135,56 +173,69 @@ class CaseModel(BaseModel):
         }
     
     def search_cases(self, query: str) -> List[Dict[str, Any]]:
-        """Search cases across multiple fields"""
-        return self.search(query, self.searchable_fields)
+        """Search cases by title and description, best matches first"""
+        return self.full_text_search(query, self.searchable_fields)
     
-    def get_all_cases(self) -> List[Dict[str, Any]]:
+    def get_all_cases(self, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all cases"""
-        return self.db.execute_query("""
-            SELECT c.*
+        return self.db.execute_query(f"""
+            SELECT {self.select_list(columns, alias='c')}
             FROM cases c
             ORDER BY c.date_reported DESC
-        """)
+        """, cache=True)
 
-    def get_status_report(self, start_date, end_date) -> List[Dict[str, Any]]:
-        """Generate case status report for the given date range"""
-        return self.db.execute_query("""
-            SELECT 
-                c.id,
-                c.title,
-                c.status,
-                c.date_reported,
-                c.closed_date,
-                (SELECT COUNT(*) FROM case_criminals cc WHERE cc.case_id = c.id) as criminal_count,
-                (SELECT COUNT(*) FROM evidence e WHERE e.case_id = c.id) as evidence_count
-            FROM cases c
-            WHERE c.date_reported BETWEEN ? AND ?
-            ORDER BY c.date_reported DESC
-        """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+    def get_status_report(self, start_date, end_date, row_format: str = 'dict') -> List[Dict[str, Any]]:
+        """Generate case status report for the given date range
 
-    def get_timeline_report(self, start_date, end_date) -> List[Dict[str, Any]]:
-        """Generate case timeline report for the given date range"""
-        return self.db.execute_query("""
-            SELECT 
-                c.id,
-                c.title,
-                c.description,
-                c.status,
-                c.date_reported,
-                c.closed_date,
-                GROUP_CONCAT(cr.name, ', ') as criminals,
-                (
-                    SELECT GROUP_CONCAT(e.description || ' (' || e.type || ')', ', ')
-                    FROM evidence e
-                    WHERE e.case_id = c.id
-                ) as evidence
-            FROM cases c
-            LEFT JOIN case_criminals cc ON c.id = cc.case_id
-            LEFT JOIN criminals cr ON cc.criminal_id = cr.id
-            WHERE c.date_reported BETWEEN ? AND ?
-            GROUP BY c.id
-            ORDER BY c.date_reported DESC
-        """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+        Both counts are seeks on covering indexes, and the id tie-break lets
+        idx_cases_date_reported deliver rows in order without a sort.
+        """
+        with self.db.read_snapshot():
+            return self.db.execute_query("""
+                SELECT 
+                    c.id,
+                    c.title,
+                    c.status,
+                    c.date_reported,
+                    c.closed_date,
+                    (SELECT COUNT(*) FROM case_criminals cc WHERE cc.case_id = c.id) as criminal_count,
+                    (SELECT COUNT(*) FROM evidence e WHERE e.case_id = c.id) as evidence_count
+                FROM cases c
+                WHERE c.date_reported BETWEEN ? AND ?
+                ORDER BY c.date_reported DESC, c.id DESC
+            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), row_format=row_format)
+
+    def get_timeline_report(self, start_date, end_date, row_format: str = 'dict') -> List[Dict[str, Any]]:
+        """Generate case timeline report for the given date range
+
+        Names and evidence are concatenated per case from index seeks, so
+        linked criminals no longer multiply the case rows and no GROUP BY
+        is needed; rows stream in idx_cases_date_reported order.
+        """
+        with self.db.read_snapshot():
+            return self.db.execute_query("""
+                SELECT 
+                    c.id,
+                    c.title,
+                    c.description,
+                    c.status,
+                    c.date_reported,
+                    c.closed_date,
+                    (
+                        SELECT GROUP_CONCAT(cr.name, ', ')
+                        FROM case_criminals cc
+                        JOIN criminals cr ON cr.id = cc.criminal_id
+                        WHERE cc.case_id = c.id
+                    ) as criminals,
+                    (
+                        SELECT GROUP_CONCAT(e.description || ' (' || e.type || ')', ', ')
+                        FROM evidence e
+                        WHERE e.case_id = c.id
+                    ) as evidence
+                FROM cases c
+                WHERE c.date_reported BETWEEN ? AND ?
+                ORDER BY c.date_reported DESC, c.id DESC
+            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), row_format=row_format)
 
     def get_monthly_case_trends(self, start_date=None, end_date=None):
         """Get monthly case counts for a date range
@@ -195,23 +246,22 @@ class CaseModel(BaseModel):
         """
         try:
             if start_date is None:
-                start_date_clause = "date('now', '-12 months')"
+                start_month_clause = "strftime('%Y-%m', 'now', '-12 months')"
             else:
-                start_date_clause = f"date('{start_date.strftime('%Y-%m-%d')}')"
+                start_month_clause = f"'{start_date.strftime('%Y-%m')}'"
                 
             if end_date is None:
-                end_date_clause = "date('now')"
+                end_month_clause = "strftime('%Y-%m', 'now')"
             else:
-                end_date_clause = f"date('{end_date.strftime('%Y-%m-%d')}')"
+                end_month_clause = f"'{end_date.strftime('%Y-%m')}'"
             
+            # Whole months from the case_monthly rollup
             query = f"""
-                SELECT 
-                    strftime('%Y-%m', date_reported) as month,
-                    COUNT(*) as count
-                FROM cases 
-                WHERE date_reported >= {start_date_clause}
-                AND date_reported <= {end_date_clause}
-                GROUP BY strftime('%Y-%m', date_reported)
+                SELECT month, total_cases as count
+                FROM case_monthly
+                WHERE month >= {start_month_clause}
+                AND month <= {end_month_clause}
+                AND total_cases > 0
                 ORDER BY month ASC
             """
             
@@ -223,27 +273,24 @@ class CaseModel(BaseModel):
 
     def count_by_status(self, status: str) -> int:
         """Count cases by status"""
-        result = self.db.get_single_result(
-            "SELECT COUNT(*) as count FROM cases WHERE status = ?",
-            (status,)
-        )
-        return result['count'] if result else 0
+        return self.count_where('status', status)
 
     def get_monthly_case_counts(self, start_date: str, end_date: str) -> List[tuple]:
-        """Get monthly case counts for the specified date range"""
+        """Get monthly case counts for the specified date range
+        
+        Every month from start_date's through end_date's is listed, with
+        zero for months without cases. Months come from calendar_months and
+        each one is matched as a date_reported range on its index.
+        """
         return self.db.execute_query("""
-            WITH RECURSIVE dates(date) AS (
-                SELECT date(?)
-                UNION ALL
-                SELECT date(date, '+1 month')
-                FROM dates
-                WHERE date < date(?)
-            )
             SELECT 
-                strftime('%Y-%m', dates.date) as month,
-                COUNT(cases.id) as count
-            FROM dates
-            LEFT JOIN cases ON strftime('%Y-%m', cases.date_reported) = strftime('%Y-%m', dates.date)
-            GROUP BY strftime('%Y-%m', dates.date)
-            ORDER BY dates.date ASC
+                m.month,
+                COUNT(c.id) as count
+            FROM calendar_months m
+            LEFT JOIN cases c
+                ON c.date_reported >= m.month_start
+                AND c.date_reported < date(m.month_start, '+1 month')
+            WHERE m.month BETWEEN strftime('%Y-%m', ?) AND strftime('%Y-%m', ?)
+            GROUP BY m.month
+            ORDER BY m.month ASC
         """, (start_date, end_date)) 
\ No newline at end of file
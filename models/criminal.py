@@ -1,11 +1,17 @@
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from .base_model import BaseModel
+from .base_model import BaseModel, Columns
 from utils.image_helper import ImageHelper
 import os
 
 class CriminalModel(BaseModel):
     table_name = "criminals"
+    projections = {
+        'list': ('id', 'name', 'age', 'gender', 'crime_type', 'status', 'arrest_date'),
+        'detail': None,
+        'export': ('id', 'name', 'age', 'gender', 'crime_type', 'status', 'arrest_date',
+                   'address', 'contact_info', 'notes'),
+    }
     
     def __init__(self):
         super().__init__()
@@ -63,16 +69,16 @@ class CriminalModel(BaseModel):
         self.delete(id)
     
     def search_criminals(self, query: str) -> List[Dict[str, Any]]:
-        """Search criminals across multiple fields"""
-        return self.search(query, self.searchable_fields)
+        """Search criminals by name, crime type and notes, best matches first"""
+        return self.full_text_search(query, self.searchable_fields)
     
-    def get_by_status(self, status: str) -> List[Dict[str, Any]]:
+    def get_by_status(self, status: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get criminals by status"""
-        return self.get_by_field('status', status)
+        return self.get_by_field('status', status, columns)
     
-    def get_by_crime_type(self, crime_type: str) -> List[Dict[str, Any]]:
+    def get_by_crime_type(self, crime_type: str, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get criminals by crime type"""
-        return self.get_by_field('crime_type', crime_type)
+        return self.get_by_field('crime_type', crime_type, columns)
     
     def get_recent_criminals(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most recently added criminals"""
@@ -83,57 +89,60 @@ class CriminalModel(BaseModel):
     
     def get_crime_type_stats(self) -> List[Dict[str, Any]]:
         """Get statistics of criminals by crime type"""
-        return self.db.execute_query("""
-            SELECT crime_type, COUNT(*) as count
-            FROM criminals
-            GROUP BY crime_type
-            ORDER BY count DESC
-        """)
+        counts = self.counts_by('crime_type')
+        return [
+            {'crime_type': crime_type, 'count': count}
+            for crime_type, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        ]
 
-    def get_statistics_report(self, start_date, end_date) -> List[Dict[str, Any]]:
+    def get_statistics_report(self, start_date, end_date, row_format: str = 'dict') -> List[Dict[str, Any]]:
         """Generate criminal statistics report for the given date range"""
-        return self.db.execute_query("""
-            SELECT 
-                crime_type,
-                COUNT(*) as total_count,
-                SUM(CASE WHEN status = 'Arrested' THEN 1 ELSE 0 END) as arrested_count,
-                SUM(CASE WHEN status = 'Wanted' THEN 1 ELSE 0 END) as wanted_count,
-                SUM(CASE WHEN status = 'In Custody' THEN 1 ELSE 0 END) as in_custody_count,
-                AVG(age) as average_age,
-                SUM(CASE WHEN gender = 'Male' THEN 1 ELSE 0 END) as male_count,
-                SUM(CASE WHEN gender = 'Female' THEN 1 ELSE 0 END) as female_count
-            FROM criminals
-            WHERE arrest_date BETWEEN ? AND ?
-            GROUP BY crime_type
-            ORDER BY total_count DESC
-        """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+        with self.db.read_snapshot():
+            return self.db.execute_query("""
+                SELECT 
+                    crime_type,
+                    COUNT(*) as total_count,
+                    SUM(CASE WHEN status = 'Arrested' THEN 1 ELSE 0 END) as arrested_count,
+                    SUM(CASE WHEN status = 'Wanted' THEN 1 ELSE 0 END) as wanted_count,
+                    SUM(CASE WHEN status = 'In Custody' THEN 1 ELSE 0 END) as in_custody_count,
+                    AVG(age) as average_age,
+                    SUM(CASE WHEN gender = 'Male' THEN 1 ELSE 0 END) as male_count,
+                    SUM(CASE WHEN gender = 'Female' THEN 1 ELSE 0 END) as female_count
+                FROM criminals
+                WHERE arrest_date BETWEEN ? AND ?
+                GROUP BY crime_type
+                ORDER BY total_count DESC
+            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), row_format=row_format)
 
-    def get_history_report(self, start_date, end_date) -> List[Dict[str, Any]]:
-        """Generate criminal history report for the given date range"""
-        return self.db.execute_query("""
-            SELECT 
-                cr.id,
-                cr.name,
-                cr.age,
-                cr.gender,
-                cr.crime_type,
-                cr.status,
-                cr.arrest_date,
-                COUNT(DISTINCT cc.case_id) as case_count,
-                GROUP_CONCAT(DISTINCT c.title) as cases,
-                (
-                    SELECT COUNT(*)
-                    FROM case_criminals cc2
-                    JOIN cases c2 ON cc2.case_id = c2.id
-                    WHERE cc2.criminal_id = cr.id AND c2.status = 'Closed'
-                ) as closed_cases
-            FROM criminals cr
-            LEFT JOIN case_criminals cc ON cr.id = cc.criminal_id
-            LEFT JOIN cases c ON cc.case_id = c.id
-            WHERE cr.arrest_date BETWEEN ? AND ?
-            GROUP BY cr.id
-            ORDER BY cr.arrest_date DESC
-        """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+    def get_history_report(self, start_date, end_date, row_format: str = 'dict') -> List[Dict[str, Any]]:
+        """Generate criminal history report for the given date range
+
+        Closed cases are counted in the same pass over each criminal's
+        links; case_criminals is keyed on (case_id, criminal_id), so every
+        joined case is counted once. Grouping on (arrest_date, id) lets
+        idx_criminals_arrest_date feed both the GROUP BY and the ORDER BY,
+        so rows stream out without a sort.
+        """
+        with self.db.read_snapshot():
+            return self.db.execute_query("""
+                SELECT 
+                    cr.id,
+                    cr.name,
+                    cr.age,
+                    cr.gender,
+                    cr.crime_type,
+                    cr.status,
+                    cr.arrest_date,
+                    COUNT(DISTINCT cc.case_id) as case_count,
+                    GROUP_CONCAT(DISTINCT c.title) as cases,
+                    COUNT(CASE WHEN c.status = 'Closed' THEN 1 END) as closed_cases
+                FROM criminals cr
+                LEFT JOIN case_criminals cc ON cr.id = cc.criminal_id
+                LEFT JOIN cases c ON cc.case_id = c.id
+                WHERE cr.arrest_date BETWEEN ? AND ?
+                GROUP BY cr.arrest_date, cr.id
+                ORDER BY cr.arrest_date DESC, cr.id DESC
+            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), row_format=row_format)
 
     def get_total_count(self) -> int:
         """Get total number of criminals"""
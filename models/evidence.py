@@ -1,11 +1,31 @@
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from .base_model import BaseModel
+from .base_model import BaseModel, Columns
 from utils.image_helper import ImageHelper
 import os
 
 class EvidenceModel(BaseModel):
     table_name = "evidence"
+    natural_key = "evidence_number"
+    projections = {
+        'list': ('id', 'evidence_number', 'name', 'type', 'storage_location', 'status', 'case_id'),
+        'detail': None,
+        'export': ('id', 'evidence_number', 'name', 'description', 'type', 'storage_location',
+                   'status', 'notes', 'date_collected', 'case_id', 'criminal_id'),
+    }
+    # Criminal names per case, built once for the cases with evidence in the
+    # ?1..?2 date range; joining case_criminals per evidence row instead
+    # multiplied every item by the number of defendants on its case
+    _CASE_NAMES_CTE = """
+                WITH case_names AS (
+                    SELECT cc.case_id, GROUP_CONCAT(DISTINCT cr.name) as related_criminals
+                    FROM case_criminals cc
+                    JOIN criminals cr ON cc.criminal_id = cr.id
+                    WHERE cc.case_id IN (
+                        SELECT case_id FROM evidence WHERE date_collected BETWEEN ?1 AND ?2
+                    )
+                    GROUP BY cc.case_id
+                )"""
     
     def __init__(self):
         super().__init__()
@@ -58,9 +78,9 @@ class EvidenceModel(BaseModel):
             ImageHelper.delete_image(record['image_path'])
         self.delete(id)
     
-    def get_by_case(self, case_id: int) -> List[Dict[str, Any]]:
+    def get_by_case(self, case_id: int, columns: Columns = None) -> List[Dict[str, Any]]:
         """Get all evidence for a specific case"""
-        return self.get_by_field('case_id', case_id)
+        return self.get_by_field('case_id', case_id, columns)
     
     def get_evidence_with_case_details(self, evidence_id: int) -> Optional[Dict[str, Any]]:
         """Get evidence with associated case details"""
@@ -79,8 +99,8 @@ class EvidenceModel(BaseModel):
         )
     
     def search_evidence(self, query: str) -> List[Dict[str, Any]]:
-        """Search evidence across multiple fields"""
-        return self.search(query, self.searchable_fields)
+        """Search evidence by name, description and notes, best matches first"""
+        return self.full_text_search(query, self.searchable_fields)
     
     def get_evidence_stats(self) -> Dict[str, Any]:
         """Get evidence statistics"""
@@ -93,16 +113,16 @@ class EvidenceModel(BaseModel):
             GROUP BY c.id, c.title
             ORDER BY evidence_count DESC
             LIMIT 10
-        """)
+        """, cache=True)
         
+        # Maintained by triggers (see database/migrations.py)
         monthly_stats = self.db.execute_query("""
-            SELECT strftime('%Y-%m', date_collected) as month,
-                   COUNT(*) as evidence_count
-            FROM evidence
-            GROUP BY month
+            SELECT month, evidence_count
+            FROM evidence_monthly
+            WHERE evidence_count > 0
             ORDER BY month DESC
             LIMIT 12
-        """)
+        """, cache=True)
         
         return {
             'total_evidence': total,
@@ -129,74 +149,78 @@ class EvidenceModel(BaseModel):
             ORDER BY e.date_collected DESC
         """, (case_id,))
 
-    def get_evidence_report(self, start_date, end_date) -> List[Dict[str, Any]]:
-        """Generate evidence report for the given date range"""
-        return self.db.execute_query("""
-            SELECT 
-                e.id,
-                e.evidence_number,
-                e.type,
-                e.description,
-                e.date_collected,
-                c.title as case_title,
-                c.status as case_status,
-                GROUP_CONCAT(DISTINCT cr.name) as related_criminals
-            FROM evidence e
-            LEFT JOIN cases c ON e.case_id = c.id
-            LEFT JOIN case_criminals cc ON c.id = cc.case_id
-            LEFT JOIN criminals cr ON cc.criminal_id = cr.id
-            WHERE e.date_collected BETWEEN ? AND ?
-            GROUP BY e.id
-            ORDER BY e.date_collected DESC
-        """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+    def get_evidence_report(self, start_date, end_date, row_format: str = 'dict') -> List[Dict[str, Any]]:
+        """Generate evidence report for the given date range
 
-    def get_statistics_report(self, start_date, end_date) -> List[Dict[str, Any]]:
+        Criminal names are concatenated once per case (see
+        _CASE_NAMES_CTE) rather than joined into every evidence row.
+        """
+        with self.db.read_snapshot():
+            return self.db.execute_query(self._CASE_NAMES_CTE + """
+                SELECT 
+                    e.id,
+                    e.evidence_number,
+                    e.type,
+                    e.description,
+                    e.date_collected,
+                    c.title as case_title,
+                    c.status as case_status,
+                    n.related_criminals
+                FROM evidence e
+                LEFT JOIN cases c ON e.case_id = c.id
+                LEFT JOIN case_names n ON c.id = n.case_id
+                WHERE e.date_collected BETWEEN ?1 AND ?2
+                ORDER BY e.date_collected DESC, e.id DESC
+            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), row_format=row_format)
+
+    def get_statistics_report(self, start_date, end_date, row_format: str = 'dict') -> List[Dict[str, Any]]:
         """Generate evidence statistics report for the given date range"""
-        return self.db.execute_query("""
-            SELECT 
-                type,
-                COUNT(*) as total_count,
-                COUNT(DISTINCT case_id) as case_count
-            FROM evidence
-            WHERE date_collected BETWEEN ? AND ?
-            GROUP BY type
-            ORDER BY total_count DESC
-        """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+        with self.db.read_snapshot():
+            return self.db.execute_query("""
+                SELECT 
+                    type,
+                    COUNT(*) as total_count,
+                    COUNT(DISTINCT case_id) as case_count
+                FROM evidence
+                WHERE date_collected BETWEEN ? AND ?
+                GROUP BY type
+                ORDER BY total_count DESC
+            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), row_format=row_format)
 
-    def get_inventory_report(self, start_date, end_date) -> List[Dict[str, Any]]:
+    def get_inventory_report(self, start_date, end_date, row_format: str = 'dict') -> List[Dict[str, Any]]:
         """Generate evidence inventory report for the given date range"""
-        return self.db.execute_query("""
-            SELECT 
-                e.id,
-                e.evidence_number,
-                e.type,
-                e.description,
-                e.notes,
-                e.date_collected,
-                c.title as case_title,
-                c.status as case_status
-            FROM evidence e
-            LEFT JOIN cases c ON e.case_id = c.id
-            WHERE e.date_collected BETWEEN ? AND ?
-            ORDER BY e.date_collected DESC
-        """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+        with self.db.read_snapshot():
+            return self.db.execute_query("""
+                SELECT 
+                    e.id,
+                    e.evidence_number,
+                    e.type,
+                    e.description,
+                    e.notes,
+                    e.date_collected,
+                    c.title as case_title,
+                    c.status as case_status
+                FROM evidence e
+                LEFT JOIN cases c ON e.case_id = c.id
+                WHERE e.date_collected BETWEEN ? AND ?
+                ORDER BY e.date_collected DESC
+            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), row_format=row_format)
 
-    def get_custody_report(self, start_date, end_date) -> List[Dict[str, Any]]:
+    def get_custody_report(self, start_date, end_date, row_format: str = 'dict') -> List[Dict[str, Any]]:
         """Generate chain of custody report for the given date range"""
-        return self.db.execute_query("""
-            SELECT 
-                e.id,
-                e.evidence_number,
-                e.type,
-                e.date_collected,
-                e.notes,
-                c.title as case_title,
-                GROUP_CONCAT(DISTINCT cr.name) as related_criminals
-            FROM evidence e
-            LEFT JOIN cases c ON e.case_id = c.id
-            LEFT JOIN case_criminals cc ON c.id = cc.case_id
-            LEFT JOIN criminals cr ON cc.criminal_id = cr.id
-            WHERE e.date_collected BETWEEN ? AND ?
-            GROUP BY e.id
-            ORDER BY e.date_collected DESC
-        """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))) 
\ No newline at end of file
+        with self.db.read_snapshot():
+            return self.db.execute_query(self._CASE_NAMES_CTE + """
+                SELECT 
+                    e.id,
+                    e.evidence_number,
+                    e.type,
+                    e.date_collected,
+                    e.notes,
+                    c.title as case_title,
+                    n.related_criminals
+                FROM evidence e
+                LEFT JOIN cases c ON e.case_id = c.id
+                LEFT JOIN case_names n ON c.id = n.case_id
+                WHERE e.date_collected BETWEEN ?1 AND ?2
+                ORDER BY e.date_collected DESC, e.id DESC
+            """, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), row_format=row_format) 
\ No newline at end of file
@@ -1,92 +1,196 @@
-from typing import Dict, List, Optional, Any, Tuple
+from typing import ClassVar, Dict, List, NamedTuple, Optional, Any, Union
 from datetime import datetime
 import bcrypt
-import sqlite3
 import logging
-import os
+import threading
+import time
 from .base_model import BaseModel
-from utils.db_helper import DatabaseHelper
+from utils.app_settings import get_setting
+from utils.login_throttle import LoginThrottle, LoginThrottled
+
+# bcrypt's own default; each step up doubles the time a hash takes
+DEFAULT_BCRYPT_ROUNDS = 12
+DEFAULT_SESSION_TTL = 300
+
+
+class UserSession(NamedTuple):
+    """What privilege checks need to know about a user, cached in memory"""
+    user_id: int
+    username: str
+    role: str
+    expires_at: float
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == 'admin'
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
 
 class UserModel(BaseModel):
     table_name = "users"
+    # Shared by every UserModel so pages see the same sessions
+    _sessions: ClassVar[Dict[int, UserSession]] = {}
+    _sessions_lock: ClassVar[threading.Lock] = threading.Lock()
+    # Failed-login limiter shared by every UserModel in the process
+    throttle: ClassVar[Optional[LoginThrottle]] = None
     
     def __init__(self):
         super().__init__()
         self.searchable_fields = ['username']
-        self.db_path = os.path.join('data', 'crime_records.db')
+        # Work factor for new hashes, from settings.json "bcrypt_rounds";
+        # bcrypt accepts 4 to 31
+        self.rounds = min(max(int(get_setting('bcrypt_rounds', DEFAULT_BCRYPT_ROUNDS)), 4), 31)
+        # Seconds a cached session is trusted before the role is re-read
+        self.session_ttl = float(get_setting('session_ttl_seconds', DEFAULT_SESSION_TTL))
+        if UserModel.throttle is None:
+            UserModel.throttle = LoginThrottle()
+    
+    def start_session(self, user: Dict[str, Any]) -> UserSession:
+        """Cache a user's role for privilege checks"""
+        session = UserSession(user['id'], user['username'], user['role'],
+                              time.monotonic() + self.session_ttl)
+        with self._sessions_lock:
+            self._sessions[session.user_id] = session
+        return session
+    
+    def get_session(self, user_id: int) -> Optional[UserSession]:
+        """The cached session for a user, reloaded once its TTL has passed
+        
+        Returns None for users that do not exist (any more).
+        """
+        with self._sessions_lock:
+            session = self._sessions.get(user_id)
+        if session is not None and not session.expired():
+            return session
+        
+        user = self.db.get_single_result(
+            f"SELECT id, username, role FROM {self.table_name} WHERE id = ?",
+            (user_id,)
+        )
+        if user is None:
+            self.invalidate_session(user_id)
+            return None
+        return self.start_session(user)
+    
+    def invalidate_session(self, user_id: int) -> None:
+        """Drop a user's cached session so the next check reads the database"""
+        with self._sessions_lock:
+            self._sessions.pop(user_id, None)
     
-    def get_connection(self):
-        """Get a database connection"""
-        return sqlite3.connect(self.db_path)
+    def update(self, id: int, data: Dict[str, Any]) -> None:
+        """Update a user and drop their cached session"""
+        super().update(id, data)
+        self.invalidate_session(id)
+    
+    def delete(self, id: int) -> None:
+        """Delete a user and drop their cached session"""
+        super().delete(id)
+        self.invalidate_session(id)
+    
+    def hash_password(self, password: str) -> str:
+        """bcrypt hash of a password at the configured work factor"""
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)).decode('utf-8')
+    
+    @staticmethod
+    def check_password(password: str, stored: Union[str, bytes]) -> bool:
+        """Whether a password matches a stored hash (TEXT or BLOB)"""
+        if isinstance(stored, str):
+            stored = stored.encode('utf-8')
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), stored)
+        except ValueError:
+            # Not a bcrypt hash at all
+            return False
+    
+    def needs_rehash(self, stored: Union[str, bytes]) -> bool:
+        """Whether a stored hash uses a lower work factor than configured"""
+        if isinstance(stored, bytes):
+            stored = stored.decode('utf-8', 'replace')
+        try:
+            # $2b$<rounds>$<salt and hash>
+            return int(stored.split('$')[2]) < self.rounds
+        except (IndexError, ValueError):
+            return False
     
     def create_user(self, username: str, password: str, role: str = 'user') -> bool:
         """Create a new user"""
         try:
-            hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            query = "INSERT INTO users (username, password, role) VALUES (?, ?, ?)"
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, (username, hashed, role))
-            conn.commit()
+            self.db.insert_and_get_id(self.table_name, {
+                'username': username,
+                'password': self.hash_password(password),
+                'role': role
+            })
             return True
         except Exception as e:
             logging.error(f"Error creating user: {str(e)}")
             return False
             
     def authenticate(self, username: str, password: str) -> Optional[Dict]:
-        """Authenticate a user with username and password"""
+        """Authenticate a user with username and password
+        
+        bcrypt is deliberately slow, so call this from a worker thread
+        (see LoginWindow). A hash below the configured work factor is
+        replaced on successful login. Raises LoginThrottled, without
+        hashing anything, while the username or the process has too many
+        recent failures.
+        """
+        retry_after = self.throttle.retry_after(username)
+        if retry_after > 0:
+            raise LoginThrottled(retry_after)
+        
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
-            user = cursor.fetchone()
+            user = self.db.get_single_result(
+                f"SELECT id, username, password, role FROM {self.table_name} WHERE username = ?",
+                (username,)
+            )
+            if not user or not self.check_password(password, user['password']):
+                self.throttle.record_failure(username)
+                return None
+            self.throttle.record_success(username)
             
-            if user:
-                stored_password = user[2].encode('utf-8')
-                if bcrypt.checkpw(password.encode('utf-8'), stored_password):
-                    # Update last login time
-                    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    cursor.execute(
-                        'UPDATE users SET last_login = ? WHERE id = ?',
-                        (now, user[0])
+            rehashed = self.hash_password(password) if self.needs_rehash(user['password']) else None
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            with self.db.transaction():
+                self.db.execute_query(
+                    f"UPDATE {self.table_name} SET last_login = ? WHERE id = ?",
+                    (now, user['id'])
+                )
+                if rehashed:
+                    # Skip if the password was changed since it was read
+                    self.db.execute_query(
+                        f"UPDATE {self.table_name} SET password = ? WHERE id = ? AND password = ?",
+                        (rehashed, user['id'], user['password'])
                     )
-                    conn.commit()
-                    
-                    return {
-                        'id': user[0],
-                        'username': user[1],
-                        'role': user[3],
-                        'last_login': now
-                    }
-            return None
+            
+            self.start_session(user)
+            return {
+                'id': user['id'],
+                'username': user['username'],
+                'role': user['role'],
+                'last_login': now
+            }
             
         except Exception as e:
             logging.error(f"Authentication error: {str(e)}")
             return None
-        finally:
-            if 'conn' in locals():
-                conn.close()
             
-    def get_user(self, user_id: int) -> Optional[Tuple]:
+    def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
         try:
-            query = "SELECT * FROM users WHERE id = ?"
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, (user_id,))
-            return cursor.fetchone()
+            return self.db.get_single_result(
+                f"SELECT * FROM {self.table_name} WHERE id = ?",
+                (user_id,)
+            )
         except Exception as e:
             logging.error(f'Error getting user: {str(e)}')
             return None
             
-    def get_all_users(self) -> list:
+    def get_all_users(self) -> List[Dict[str, Any]]:
         """Get all users"""
         try:
-            query = "SELECT id, username, role FROM users"
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query)
-            return cursor.fetchall()
+            return self.db.execute_query(f"SELECT id, username, role FROM {self.table_name}")
         except Exception as e:
             logging.error(f'Error getting users: {str(e)}')
             return []
@@ -94,11 +198,7 @@ class UserModel(BaseModel):
     def delete_user(self, user_id: int) -> bool:
         """Delete a user"""
         try:
-            query = "DELETE FROM users WHERE id = ?"
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, (user_id,))
-            conn.commit()
+            self.delete(user_id)
             logging.info(f'Deleted user ID: {user_id}')
             return True
         except Exception as e:
@@ -112,7 +212,7 @@ class UserModel(BaseModel):
             return False
             
         # Verify current password
-        if not bcrypt.checkpw(current_password.encode('utf-8'), user['password']):
+        if not self.check_password(current_password, user['password']):
             return False
             
         # Update password
@@ -121,12 +221,7 @@ class UserModel(BaseModel):
     def update_password(self, user_id: int, new_password: str) -> bool:
         """Update user's password"""
         try:
-            hashed = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
-            query = "UPDATE users SET password = ? WHERE id = ?"
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, (hashed, user_id))
-            conn.commit()
+            self.update(user_id, {'password': self.hash_password(new_password)})
             logging.info(f'Updated password for user ID: {user_id}')
             return True
         except Exception as e:
@@ -164,5 +259,5 @@ class UserModel(BaseModel):
     
     def is_admin(self, user_id: int) -> bool:
         """Check if user has admin role"""
-        user = self.get_user(user_id)
-        return user and user['role'] == 'admin' 
\ No newline at end of file
+        session = self.get_session(user_id)
+        return session is not None and session.is_admin 
\ No newline at end of file
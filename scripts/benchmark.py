@@ -0,0 +1,721 @@
+"""Micro-benchmarks for the database layer.
+
+Every benchmark builds its own throwaway database in a temporary
+directory, so it is safe to run from the project root::
+
+    python scripts/benchmark.py pool --rows 100000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.migrations import run_migrations
+from utils.db_helper import DatabaseHelper
+from utils.storage_profile import STORAGE_PROFILES, resolve_profile
+from utils.row_format import ROW_FORMATS
+
+CRIME_TYPES = ['Theft', 'Assault', 'Fraud', 'Drug Trafficking', 'Homicide', 'Cybercrime', 'Other']
+CRIMINAL_STATUSES = ['In Custody', 'Released', 'Wanted', 'Deceased']
+CASE_STATUSES = ['Open', 'Closed', 'Under Investigation', 'Cold Case']
+
+
+def create_schema(db_path, migrate=True):
+    """Create the application tables and indexes in an empty database
+
+    Pass migrate=False to bulk-load first and call run_migrations
+    afterwards, which backfills the derived tables in one pass instead of
+    firing their triggers per row.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP
+        );
+        CREATE TABLE criminals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            age INTEGER,
+            gender TEXT,
+            crime_type TEXT,
+            status TEXT,
+            arrest_date DATE,
+            address TEXT,
+            contact_info TEXT,
+            image_path TEXT,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE cases (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            case_number TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT,
+            date_reported DATE,
+            closed_date DATE,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE case_criminals (
+            case_id INTEGER,
+            criminal_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (case_id, criminal_id)
+        );
+        CREATE TABLE evidence (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            evidence_number TEXT NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            type TEXT,
+            storage_location TEXT,
+            status TEXT,
+            notes TEXT,
+            date_collected DATE,
+            case_id INTEGER NOT NULL,
+            criminal_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    ''')
+    conn.commit()
+    if migrate:
+        run_migrations(conn)
+    conn.close()
+
+
+def seed_criminals(db_path, rows, seed=42):
+    """Fill the criminals table with deterministic synthetic records"""
+    rng = random.Random(seed)
+    start = date(2000, 1, 1)
+
+    def generate():
+        for i in range(rows):
+            yield (
+                f"Person {i}",
+                rng.randint(18, 80),
+                rng.choice(['Male', 'Female']),
+                rng.choice(CRIME_TYPES),
+                rng.choice(CRIMINAL_STATUSES),
+                (start + timedelta(days=rng.randint(0, 9000))).isoformat(),
+                f"{rng.randint(1, 999)} Main Street",
+                f"555-{rng.randint(1000, 9999)}",
+                "Synthetic benchmark record " * 3,
+            )
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO criminals (name, age, gender, crime_type, status, arrest_date,
+                               address, contact_info, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', generate())
+    conn.commit()
+    conn.close()
+
+
+def use_database(db_path, profile=None):
+    """Point the shared DatabaseHelper at a benchmark database"""
+    db = DatabaseHelper()
+    db.close()
+    db.db_path = db_path
+    db.query_stats.slow_query_ms = 0  # Keep deliberately large workloads out of the slow log
+    if profile is not None:
+        db.storage_profile = profile
+    return db
+
+
+def time_calls(func, calls):
+    """Return per-call latencies in microseconds"""
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def report(label, samples):
+    """Print a one-line latency summary"""
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"  {label:<34} mean {statistics.mean(samples):9.1f} us   "
+          f"median {statistics.median(samples):9.1f} us   p95 {p95:9.1f} us")
+
+
+def bench_pool(args):
+    """Per-call latency with a fresh connection per call versus the pool"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        create_schema(db_path)
+        seed_criminals(db_path, args.rows)
+        db = use_database(db_path)
+        ids = [random.randint(1, args.rows) for _ in range(args.calls)]
+
+        def unpooled(query, params=()):
+            # Equivalent of the old get_connection(): connect, query, close
+            conn = sqlite3.connect(db_path)
+            conn.row_factory = sqlite3.Row
+            try:
+                return [dict(row) for row in conn.execute(query, params).fetchall()]
+            finally:
+                conn.close()
+
+        workloads = [
+            ("get_single_result by id",
+             lambda i: unpooled("SELECT * FROM criminals WHERE id = ?", (i,)),
+             lambda i: db.get_single_result("SELECT * FROM criminals WHERE id = ?", (i,))),
+            ("exists()",
+             lambda i: unpooled("SELECT 1 FROM criminals WHERE id = ?", (i,)),
+             lambda i: db.get_single_result("SELECT 1 FROM criminals WHERE id = ?", (i,))),
+            ("count()",
+             lambda i: unpooled("SELECT COUNT(*) as count FROM criminals"),
+             lambda i: db.get_single_result("SELECT COUNT(*) as count FROM criminals")),
+        ]
+
+        print(f"Connection pool benchmark: {args.rows} criminals, {args.calls} calls per workload")
+        for label, before, after in workloads:
+            it = iter(ids)
+            report(f"{label} (connect per call)", time_calls(lambda: before(next(it)), args.calls))
+            it = iter(ids)
+            report(f"{label} (pooled)", time_calls(lambda: after(next(it)), args.calls))
+        db.close()
+
+
+def bench_profiles(args):
+    """Compare storage profiles on interactive inserts, bulk loads and reports"""
+    profiles = [('sqlite defaults', {})]
+    profiles += [(name, resolve_profile(name)) for name in STORAGE_PROFILES]
+    start = date(2000, 1, 1)
+
+    print(f"Storage profile benchmark: {args.inserts} single inserts, "
+          f"{args.rows} bulk rows, {args.reports} report rounds")
+    for name, profile in profiles:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            create_schema(db_path)
+            db = use_database(db_path, profile)
+
+            started = time.perf_counter()
+            for i in range(args.inserts):
+                db.insert_and_get_id('criminals', {
+                    'name': f"Interactive {i}",
+                    'crime_type': CRIME_TYPES[i % len(CRIME_TYPES)],
+                    'status': CRIMINAL_STATUSES[i % len(CRIMINAL_STATUSES)],
+                    'arrest_date': (start + timedelta(days=i % 9000)).isoformat(),
+                })
+            single = time.perf_counter() - started
+
+            rows = [
+                (f"Bulk {i}", 18 + i % 60, CRIME_TYPES[i % len(CRIME_TYPES)],
+                 CRIMINAL_STATUSES[i % len(CRIMINAL_STATUSES)],
+                 (start + timedelta(days=i % 9000)).isoformat(), "Synthetic benchmark record " * 3)
+                for i in range(args.rows)
+            ]
+            started = time.perf_counter()
+            db.execute_many("""
+                INSERT INTO criminals (name, age, crime_type, status, arrest_date, notes)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            bulk = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for _ in range(args.reports):
+                db.execute_query("""
+                    SELECT crime_type, COUNT(*) as count, AVG(age) as average_age
+                    FROM criminals
+                    GROUP BY crime_type
+                """)
+                db.execute_query("""
+                    SELECT * FROM criminals
+                    WHERE arrest_date BETWEEN ? AND ?
+                    ORDER BY arrest_date DESC
+                """, ('2010-01-01', '2012-12-31'))
+            reports = time.perf_counter() - started
+
+            print(f"  {name:<16} single inserts {args.inserts / single:9.0f} rows/s   "
+                  f"bulk {args.rows / bulk:9.0f} rows/s   "
+                  f"reports {reports / args.reports * 1000:8.1f} ms/round")
+            db.close()
+
+
+def case_rows(count, offset=0):
+    """Synthetic case records as dicts, numbered from offset"""
+    start = date(2000, 1, 1)
+    return [
+        {
+            'case_number': f"CASE-{i:08d}",
+            'title': f"Case {i}",
+            'description': "Synthetic benchmark case " * 3,
+            'status': CASE_STATUSES[i % len(CASE_STATUSES)],
+            'date_reported': (start + timedelta(days=i % 9000)).isoformat(),
+        }
+        for i in range(offset, offset + count)
+    ]
+
+
+def bench_bulk(args):
+    """Rows per second for create() in a loop versus create_many and upsert_many"""
+    from models.case import CaseModel
+
+    print(f"Bulk write benchmark: {args.rows} cases per run")
+    runs = [
+        ("create() per row", lambda model, rows: [model.create(row) for row in rows]),
+        ("create_many()", lambda model, rows: model.create_many(rows)),
+        # Half of the rows update existing cases, half insert new ones
+        ("upsert_many() 50% existing", lambda model, rows: model.upsert_many(rows)),
+    ]
+    for label, write in runs:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            create_schema(db_path)
+            db = use_database(db_path)
+            model = CaseModel()
+            if label.startswith("upsert"):
+                model.create_many(case_rows(args.rows // 2))
+                rows = case_rows(args.rows)
+                for row in rows:
+                    row['status'] = 'Closed'
+            else:
+                rows = case_rows(args.rows)
+
+            started = time.perf_counter()
+            ids = write(model, rows)
+            elapsed = time.perf_counter() - started
+            assert len(ids) == len(rows) and model.count() >= len(rows)
+
+            print(f"  {label:<28} {len(rows) / elapsed:10.0f} rows/s   {elapsed:7.2f} s")
+            db.close()
+
+
+# The case reports as they were written before the fan-out join was
+# removed; bench_reports checks CaseModel still returns exactly these rows
+LEGACY_STATUS_REPORT = """
+    SELECT c.id, c.title, c.status, c.date_reported, c.closed_date,
+           (SELECT COUNT(*) FROM case_criminals cc WHERE cc.case_id = c.id) as criminal_count,
+           (SELECT COUNT(*) FROM evidence e WHERE e.case_id = c.id) as evidence_count
+    FROM cases c
+    WHERE c.date_reported BETWEEN ? AND ?
+    ORDER BY c.date_reported DESC
+"""
+
+LEGACY_TIMELINE_REPORT = """
+    SELECT c.id, c.title, c.description, c.status, c.date_reported, c.closed_date,
+           GROUP_CONCAT(cr.name, ', ') as criminals,
+           (SELECT GROUP_CONCAT(e.description || ' (' || e.type || ')', ', ')
+            FROM evidence e WHERE e.case_id = c.id) as evidence
+    FROM cases c
+    LEFT JOIN case_criminals cc ON c.id = cc.case_id
+    LEFT JOIN criminals cr ON cc.criminal_id = cr.id
+    WHERE c.date_reported BETWEEN ? AND ?
+    GROUP BY c.id
+    ORDER BY c.date_reported DESC
+"""
+
+
+def seed_case_graph(db_path, cases, evidence, criminals, seed=42):
+    """Fill cases, case_criminals and evidence with a linked synthetic graph
+
+    Every case links one to four criminals; evidence is spread over the
+    cases at random, so some cases have none.
+    """
+    seed_criminals(db_path, criminals, seed)
+    rng = random.Random(seed)
+    start = date(2000, 1, 1)
+    evidence_types = ['Physical', 'Digital', 'Document', 'Biological', 'Weapon', 'Other']
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO cases (case_number, title, description, status, date_reported, closed_date)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (
+        (f"CASE-{i:08d}", f"Case {i}", "Synthetic benchmark case",
+         CASE_STATUSES[i % len(CASE_STATUSES)],
+         (start + timedelta(days=i % 9000)).isoformat(),
+         (start + timedelta(days=i % 9000 + 30)).isoformat() if i % 4 == 1 else None)
+        for i in range(cases)
+    ))
+    conn.executemany("INSERT OR IGNORE INTO case_criminals (case_id, criminal_id) VALUES (?, ?)", (
+        (case_id, rng.randint(1, criminals))
+        for case_id in range(1, cases + 1)
+        for _ in range(rng.randint(1, 4))
+    ))
+    conn.executemany('''
+        INSERT INTO evidence (evidence_number, name, description, type, status, date_collected, case_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        (f"EV-{i:09d}", f"Item {i}", f"Item {i}", rng.choice(evidence_types), 'Stored',
+         (start + timedelta(days=rng.randint(0, 9000))).isoformat(), rng.randint(1, cases))
+        for i in range(evidence)
+    ))
+    conn.commit()
+    conn.close()
+
+
+def bench_reports(args):
+    """Case status/timeline reports against their previous queries
+
+    Exits non-zero if the current reports return different rows, so it
+    doubles as the regression check for the report queries.
+    """
+    from models.case import CaseModel
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        create_schema(db_path, migrate=False)
+        seed_case_graph(db_path, args.cases, args.evidence, args.criminals)
+        conn = sqlite3.connect(db_path)
+        run_migrations(conn)
+        conn.close()
+        db = use_database(db_path)
+        model = CaseModel()
+
+        print(f"Report benchmark: {args.cases} cases, {args.evidence} evidence, "
+              f"{args.criminals} criminals")
+        ranges = [
+            ("full range", date(2000, 1, 1), date(2030, 1, 1)),
+            ("one year", date(2010, 1, 1), date(2010, 12, 31)),
+        ]
+        reports = [
+            ("status", LEGACY_STATUS_REPORT, model.get_status_report),
+            ("timeline", LEGACY_TIMELINE_REPORT, model.get_timeline_report),
+        ]
+        mismatches = 0
+        for range_label, start, end in ranges:
+            params = (start.isoformat(), end.isoformat())
+            for name, legacy_query, method in reports:
+                db.execute_query(legacy_query, params)  # Warm the page cache for both runs
+                started = time.perf_counter()
+                legacy = db.execute_query(legacy_query, params, row_format='record')
+                legacy_elapsed = time.perf_counter() - started
+
+                started = time.perf_counter()
+                rows = method(start, end, row_format='record')
+                elapsed = time.perf_counter() - started
+
+                # The old queries leave ties on date_reported in no set order,
+                # so compare the date sequence and the rows separately
+                same = ([row['date_reported'] for row in legacy] == [row['date_reported'] for row in rows]
+                        and sorted(tuple(row.values()) for row in legacy)
+                        == sorted(tuple(row.values()) for row in rows))
+                if not same:
+                    mismatches += 1
+                print(f"  {name + ', ' + range_label:<22} {len(rows):8} rows   "
+                      f"previous {legacy_elapsed:7.2f} s   current {elapsed:7.2f} s   "
+                      f"{'ok' if same else 'MISMATCH'}")
+        db.close()
+
+    if mismatches:
+        sys.exit(f"{mismatches} report(s) differ from their previous queries")
+
+
+LEGACY_HISTORY_REPORT = """
+    SELECT cr.id, cr.name, cr.age, cr.gender, cr.crime_type, cr.status, cr.arrest_date,
+           COUNT(DISTINCT cc.case_id) as case_count,
+           GROUP_CONCAT(DISTINCT c.title) as cases,
+           (SELECT COUNT(*) FROM case_criminals cc2 JOIN cases c2 ON cc2.case_id = c2.id
+            WHERE cc2.criminal_id = cr.id AND c2.status = 'Closed') as closed_cases
+    FROM criminals cr
+    LEFT JOIN case_criminals cc ON cr.id = cc.criminal_id
+    LEFT JOIN cases c ON cc.case_id = c.id
+    WHERE cr.arrest_date BETWEEN ? AND ?
+    GROUP BY cr.id
+    ORDER BY cr.arrest_date DESC
+"""
+
+
+def bench_history(args):
+    """Criminal history report over a large registry
+
+    The previous query re-scanned every closed case per criminal, so it is
+    only compared on a --check-days window; a mismatch exits non-zero.
+    """
+    from models.criminal import CriminalModel
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        create_schema(db_path, migrate=False)
+        seed_case_graph(db_path, args.cases, 0, args.criminals)
+        conn = sqlite3.connect(db_path)
+        run_migrations(conn)
+        conn.close()
+        db = use_database(db_path)
+        model = CriminalModel()
+
+        print(f"History report benchmark: {args.criminals} criminals, {args.cases} cases")
+        ranges = [
+            ("full range", date(2000, 1, 1), date(2030, 1, 1)),
+            ("one year", date(2010, 1, 1), date(2010, 12, 31)),
+        ]
+        for label, start, end in ranges:
+            started = time.perf_counter()
+            rows = model.get_history_report(start, end, row_format='record')
+            elapsed = time.perf_counter() - started
+            print(f"  {label:<22} {len(rows):8} rows   {elapsed:7.2f} s")
+            del rows
+
+        start = date(2010, 1, 1)
+        end = start + timedelta(days=args.check_days - 1)
+        params = (start.isoformat(), end.isoformat())
+        started = time.perf_counter()
+        legacy = db.execute_query(LEGACY_HISTORY_REPORT, params, row_format='record')
+        legacy_elapsed = time.perf_counter() - started
+        started = time.perf_counter()
+        rows = model.get_history_report(start, end, row_format='record')
+        elapsed = time.perf_counter() - started
+        same = ([row['arrest_date'] for row in legacy] == [row['arrest_date'] for row in rows]
+                and sorted(tuple(row.values()) for row in legacy)
+                == sorted(tuple(row.values()) for row in rows))
+        print(f"  {f'{args.check_days} days vs previous':<22} {len(rows):8} rows   "
+              f"previous {legacy_elapsed:7.2f} s   current {elapsed:7.2f} s   "
+              f"{'ok' if same else 'MISMATCH'}")
+        db.close()
+
+    if not same:
+        sys.exit("History report differs from the previous query")
+
+
+LEGACY_EVIDENCE_REPORT = """
+    SELECT e.id, e.evidence_number, e.type, e.description, e.date_collected,
+           c.title as case_title, c.status as case_status,
+           GROUP_CONCAT(DISTINCT cr.name) as related_criminals
+    FROM evidence e
+    LEFT JOIN cases c ON e.case_id = c.id
+    LEFT JOIN case_criminals cc ON c.id = cc.case_id
+    LEFT JOIN criminals cr ON cc.criminal_id = cr.id
+    WHERE e.date_collected BETWEEN ? AND ?
+    GROUP BY e.id
+    ORDER BY e.date_collected DESC
+"""
+
+LEGACY_CUSTODY_REPORT = """
+    SELECT e.id, e.evidence_number, e.type, e.date_collected, e.notes,
+           c.title as case_title,
+           GROUP_CONCAT(DISTINCT cr.name) as related_criminals
+    FROM evidence e
+    LEFT JOIN cases c ON e.case_id = c.id
+    LEFT JOIN case_criminals cc ON c.id = cc.case_id
+    LEFT JOIN criminals cr ON cc.criminal_id = cr.id
+    WHERE e.date_collected BETWEEN ? AND ?
+    GROUP BY e.id
+    ORDER BY e.date_collected DESC
+"""
+
+
+def bench_fanout(args):
+    """Evidence reports as the number of defendants per case grows
+
+    The previous queries produced evidence x defendants rows before
+    deduplicating; the current ones should stay flat. Exits non-zero if
+    any report differs from its previous query.
+    """
+    from models.evidence import EvidenceModel
+
+    evidence = args.cases * args.evidence_per_case
+    print(f"Evidence fan-out benchmark: {args.cases} cases, {evidence} evidence")
+    start, end = date(2000, 1, 1), date(2030, 1, 1)
+    params = (start.isoformat(), end.isoformat())
+    mismatches = 0
+    for defendants in args.defendants:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            create_schema(db_path, migrate=False)
+            seed_criminals(db_path, max(args.defendants))
+            conn = sqlite3.connect(db_path)
+            conn.executemany(
+                "INSERT INTO cases (case_number, title, status, date_reported) VALUES (?, ?, 'Open', ?)",
+                ((f"CASE-{i:08d}", f"Case {i}", start.isoformat()) for i in range(args.cases))
+            )
+            rng = random.Random(42)
+            conn.executemany("INSERT INTO case_criminals (case_id, criminal_id) VALUES (?, ?)", (
+                (case_id, criminal_id)
+                for case_id in range(1, args.cases + 1)
+                for criminal_id in rng.sample(range(1, max(args.defendants) + 1), defendants)
+            ))
+            conn.executemany('''
+                INSERT INTO evidence (evidence_number, name, description, type, notes,
+                                      date_collected, case_id)
+                VALUES (?, ?, ?, 'Physical', 'Sealed', ?, ?)
+            ''', (
+                (f"EV-{i:09d}", f"Item {i}", f"Item {i}",
+                 (start + timedelta(days=i % 9000)).isoformat(), i % args.cases + 1)
+                for i in range(evidence)
+            ))
+            conn.commit()
+            run_migrations(conn)
+            conn.close()
+            db = use_database(db_path)
+            model = EvidenceModel()
+
+            reports = [
+                ("evidence", LEGACY_EVIDENCE_REPORT, model.get_evidence_report),
+                ("custody", LEGACY_CUSTODY_REPORT, model.get_custody_report),
+            ]
+            for name, legacy_query, method in reports:
+                started = time.perf_counter()
+                legacy = db.execute_query(legacy_query, params, row_format='record')
+                legacy_elapsed = time.perf_counter() - started
+
+                started = time.perf_counter()
+                rows = method(start, end, row_format='record')
+                elapsed = time.perf_counter() - started
+
+                same = ([row['date_collected'] for row in legacy] == [row['date_collected'] for row in rows]
+                        and sorted(tuple(row.values()) for row in legacy)
+                        == sorted(tuple(row.values()) for row in rows))
+                if not same:
+                    mismatches += 1
+                print(f"  {name + f', {defendants} defendants':<26} {len(rows):8} rows   "
+                      f"previous {legacy_elapsed:7.2f} s   current {elapsed:7.2f} s   "
+                      f"{'ok' if same else 'MISMATCH'}")
+            db.close()
+
+    if mismatches:
+        sys.exit(f"{mismatches} report(s) differ from their previous queries")
+
+
+def bench_login(args):
+    """bcrypt CPU spent on a scripted password-guessing loop
+
+    The attacker retries every --interval seconds against one account,
+    then against a new username each time; rejected attempts are retried
+    just as fast. Compares an effectively unlimited throttle with the
+    default limits.
+    """
+    import bcrypt
+    from models.user import UserModel
+    from utils.login_throttle import LoginThrottle, LoginThrottled, ThrottleLimit
+
+    unlimited = ThrottleLimit(max_failures=10 ** 9, window=1.0, base_delay=1.0, max_delay=1.0)
+    throttles = [
+        ("no throttle", lambda: LoginThrottle({'user': unlimited, 'process': unlimited}, persist=False)),
+        ("default limits", LoginThrottle),
+    ]
+    print(f"Login attack benchmark: bcrypt cost {args.rounds}, one attempt every "
+          f"{args.interval * 1000:.0f} ms for {args.seconds:.0f} s per attack")
+    for label, make_throttle in throttles:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            create_schema(db_path)
+            conn = sqlite3.connect(db_path)
+            conn.execute("INSERT INTO users (username, password, role) VALUES ('admin', ?, 'admin')",
+                         (bcrypt.hashpw(b'correct horse', bcrypt.gensalt(args.rounds)).decode(),))
+            conn.commit()
+            conn.close()
+            db = use_database(db_path)
+            model = UserModel()
+            model.rounds = args.rounds
+
+            for target in ("one account", "username spray"):
+                UserModel.throttle = make_throttle()
+                attempts = rejected = 0
+                cpu = 0.0
+                deadline = time.perf_counter() + args.seconds
+                while time.perf_counter() < deadline:
+                    username = 'admin' if target == "one account" else f"user{attempts}"
+                    started = time.thread_time()
+                    try:
+                        model.authenticate(username, f"guess {attempts}")
+                    except LoginThrottled:
+                        rejected += 1
+                    cpu += time.thread_time() - started
+                    attempts += 1
+                    time.sleep(args.interval)
+                print(f"  {label + ', ' + target:<30} {attempts:6} attempts   {rejected:6} rejected   "
+                      f"CPU {cpu:6.2f} s ({cpu / args.seconds:6.1%} of a core)")
+            UserModel.throttle = None
+            db.close()
+
+
+def bench_rows(args):
+    """Memory held by a full-table result in each row format"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        create_schema(db_path)
+        seed_criminals(db_path, args.rows)
+        db = use_database(db_path)
+
+        print(f"Row format benchmark: SELECT * over {args.rows} criminals")
+        for row_format in ROW_FORMATS:
+            tracemalloc.start()
+            started = time.perf_counter()
+            rows = db.execute_query("SELECT * FROM criminals", row_format=row_format)
+            elapsed = time.perf_counter() - started
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"  {row_format:<8} retained {retained / 2**20:8.1f} MiB   "
+                  f"peak {peak / 2**20:8.1f} MiB   "
+                  f"{retained / len(rows):6.0f} B/row   {elapsed:6.2f} s (traced)")
+            del rows
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database layer benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    pool_parser = subparsers.add_parser('pool', help="pooled vs per-call connections")
+    pool_parser.add_argument('--rows', type=int, default=100000)
+    pool_parser.add_argument('--calls', type=int, default=2000)
+    pool_parser.set_defaults(func=bench_pool)
+
+    profiles_parser = subparsers.add_parser('profiles', help="compare storage profiles")
+    profiles_parser.add_argument('--inserts', type=int, default=2000)
+    profiles_parser.add_argument('--rows', type=int, default=200000)
+    profiles_parser.add_argument('--reports', type=int, default=20)
+    profiles_parser.set_defaults(func=bench_profiles)
+
+    bulk_parser = subparsers.add_parser('bulk', help="bulk create/upsert throughput")
+    bulk_parser.add_argument('--rows', type=int, default=20000)
+    bulk_parser.set_defaults(func=bench_bulk)
+
+    reports_parser = subparsers.add_parser('reports', help="case report queries, checked against the old ones")
+    reports_parser.add_argument('--cases', type=int, default=100000)
+    reports_parser.add_argument('--evidence', type=int, default=1000000)
+    reports_parser.add_argument('--criminals', type=int, default=20000)
+    reports_parser.set_defaults(func=bench_reports)
+
+    history_parser = subparsers.add_parser('history', help="criminal history report at registry scale")
+    history_parser.add_argument('--criminals', type=int, default=1000000)
+    history_parser.add_argument('--cases', type=int, default=400000)
+    history_parser.add_argument('--check-days', type=int, default=7)
+    history_parser.set_defaults(func=bench_history)
+
+    fanout_parser = subparsers.add_parser('fanout', help="evidence reports on multi-defendant cases")
+    fanout_parser.add_argument('--cases', type=int, default=200)
+    fanout_parser.add_argument('--evidence-per-case', type=int, default=100)
+    fanout_parser.add_argument('--defendants', type=int, nargs='+', default=[1, 10, 50, 200])
+    fanout_parser.set_defaults(func=bench_fanout)
+
+    login_parser = subparsers.add_parser('login', help="bcrypt CPU under a password-guessing loop")
+    login_parser.add_argument('--rounds', type=int, default=12)
+    login_parser.add_argument('--seconds', type=float, default=20.0)
+    login_parser.add_argument('--interval', type=float, default=0.01)
+    login_parser.set_defaults(func=bench_login)
+
+    rows_parser = subparsers.add_parser('rows', help="memory per row format")
+    rows_parser.add_argument('--rows', type=int, default=1000000)
+    rows_parser.set_defaults(func=bench_rows)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Print per-statement query timings.
+
+By default this reads logs/query_stats.json, which the application writes
+on exit and from the diagnostics panel (Ctrl+Shift+D). With --profile it
+instead runs the dashboard, list and report queries against the current
+database and prints their timings directly::
+
+    python scripts/query_stats.py
+    python scripts/query_stats.py --profile --top 10
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.query_stats import STATS_FILE
+
+
+def profile(rounds):
+    """Run the application's read paths and return the collected statistics"""
+    from models.case import CaseModel
+    from models.criminal import CriminalModel
+    from models.evidence import EvidenceModel
+    from utils.db_helper import DatabaseHelper
+
+    db = DatabaseHelper()
+    db.query_stats.reset()
+    case_model, criminal_model, evidence_model = CaseModel(), CriminalModel(), EvidenceModel()
+    start, end = date(1900, 1, 1), date.today()
+
+    for _ in range(rounds):
+        # Dashboard
+        criminal_model.count()
+        case_model.count()
+        evidence_model.count()
+        case_model.get_cases_by_status('Open')
+        criminal_model.get_crime_type_stats()
+        case_model.get_case_stats()
+        # List pages
+        criminal_model.get_all()
+        case_model.get_all_cases()
+        evidence_model.get_all_with_case_titles()
+        # Reports
+        criminal_model.get_statistics_report(start, end)
+        criminal_model.get_history_report(start, end)
+        case_model.get_status_report(start, end)
+        case_model.get_timeline_report(start, end)
+        evidence_model.get_evidence_report(start, end)
+        evidence_model.get_custody_report(start, end)
+
+    return {
+        'slow_query_ms': db.query_stats.slow_query_ms,
+        'queries': db.query_stats.snapshot(),
+        'cache': db.cache_stats(),
+    }
+
+
+def print_stats(data, top):
+    """Print the slowest statements by total time"""
+    queries = data.get('queries', [])
+    print(f"{len(queries)} statements, slow threshold {data.get('slow_query_ms')} ms")
+    cache = data.get('cache')
+    if cache:
+        print(f"cache: {cache['hits']} hits, {cache['misses']} misses, "
+              f"{cache['entries']} entries, {cache['bytes']} bytes")
+    print()
+    print(f"{'calls':>7} {'total ms':>10} {'mean ms':>9} {'p95 ms':>8} {'max ms':>9}  statement")
+    for entry in queries[:top]:
+        sql = entry['sql'] if len(entry['sql']) <= 100 else entry['sql'][:97] + '...'
+        print(f"{entry['count']:>7} {entry['total_ms']:>10.1f} {entry['mean_ms']:>9.2f} "
+              f"{entry['p95_ms']:>8} {entry['max_ms']:>9.2f}  {sql}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show per-statement query timings")
+    parser.add_argument('--file', default=STATS_FILE, help="statistics dump to read")
+    parser.add_argument('--profile', action='store_true',
+                        help="run the application's read queries instead of reading a dump")
+    parser.add_argument('--rounds', type=int, default=3, help="workload repetitions for --profile")
+    parser.add_argument('--top', type=int, default=20, help="number of statements to show")
+    args = parser.parse_args()
+
+    if args.profile:
+        data = profile(args.rounds)
+    else:
+        if not os.path.exists(args.file):
+            parser.error(f"{args.file} not found; run the application or use --profile")
+        with open(args.file) as f:
+            data = json.load(f)
+
+    print_stats(data, args.top)
+
+
+if __name__ == '__main__':
+    main()
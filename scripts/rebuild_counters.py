@@ -0,0 +1,50 @@
+"""Recount entity_counters from the base tables.
+
+The dashboard totals come from entity_counters, which triggers keep in
+step with every insert, update and delete. Run this if the counters are
+ever suspected to have drifted, e.g. after the tables were edited with
+the triggers dropped; it rebuilds them in one transaction and lists
+every count that changed::
+
+    python scripts/rebuild_counters.py
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.migrations import rebuild_entity_counters
+from utils.db_helper import DatabaseHelper
+
+
+def read_counters(conn):
+    """Current counters keyed by (entity, dimension, value)"""
+    rows = conn.execute("SELECT entity, dimension, value, count FROM entity_counters")
+    return {(entity, dimension, value): count for entity, dimension, value, count in rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the trigger-maintained entity counters")
+    parser.parse_args()
+
+    db = DatabaseHelper()
+    if not db.table_exists('entity_counters'):
+        parser.error("entity_counters does not exist; start the application once to apply migrations")
+
+    with db.transaction() as conn:
+        before = read_counters(conn)
+        rebuild_entity_counters(conn.cursor())
+        after = read_counters(conn)
+
+    drifted = sorted(key for key in before.keys() | after.keys()
+                     if before.get(key, 0) != after.get(key, 0))
+    for entity, dimension, value in drifted:
+        label = f"{entity}.{dimension} = {value!r}" if dimension else f"{entity} total"
+        key = (entity, dimension, value)
+        print(f"  {label:<50} {before.get(key, 0):>8} -> {after.get(key, 0)}")
+    print(f"Rebuilt {len(after)} counters, {len(drifted)} corrected")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def pytest_configure(config):
+    # The application writes data/ and logs/ relative to the working
+    # directory, loggers as soon as the modules are imported
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    work = tempfile.mkdtemp(prefix='crms_tests_')
+    shutil.copy(os.path.join(ROOT, 'settings.json'), work)
+    os.chdir(work)
+
+
+@pytest.fixture(scope='session')
+def db():
+    """DatabaseHelper on a fresh sample database"""
+    from database.init_db import DatabaseInitializer
+    from utils.db_helper import DatabaseHelper
+    DatabaseInitializer().init_database()
+    helper = DatabaseHelper()
+    helper.close()
+    yield helper
+    helper.close()
+    # Nothing for the exit hook to write into the working tree
+    helper.query_stats.reset()
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """The QApplication widgets and AsyncDatabase need"""
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
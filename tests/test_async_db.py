@@ -0,0 +1,51 @@
+import threading
+import time
+
+from PyQt5.QtCore import QThreadPool
+
+from utils.async_db import AsyncDatabase
+from utils.db_helper import DatabaseHelper
+
+
+def test_workers_cycle_more_threads_than_connections(db, qapp, monkeypatch):
+    db.pool.timeout = 2.0
+    threads = AsyncDatabase.max_threads
+    rounds = DatabaseHelper._pool_size // threads + 2
+    results, errors, idents = [], [], set()
+    pools = []
+
+    def count_cases(barrier):
+        # Every worker of the round runs at once, on its own thread
+        barrier.wait(5)
+        idents.add(threading.get_ident())
+        return db.execute_query("SELECT COUNT(*) as n FROM cases")[0]['n']
+
+    for _ in range(rounds):
+        # A fresh Qt pool per round whose threads never expire, so every
+        # round runs on new threads while the old ones stay alive
+        pool = QThreadPool()
+        pool.setMaxThreadCount(threads)
+        pool.setExpiryTimeout(-1)
+        pools.append(pool)
+        monkeypatch.setattr(AsyncDatabase, '_pool', pool)
+
+        async_db = AsyncDatabase()
+        barrier = threading.Barrier(threads)
+        for _ in range(threads):
+            async_db.submit(None, count_cases, barrier,
+                            on_result=results.append, on_error=errors.append)
+        # QThreadPool.waitForDone() would also stop the pool's threads
+        deadline = time.monotonic() + 10
+        while len(results) + len(errors) < len(pools) * threads and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.01)
+
+    while any(pool.activeThreadCount() for pool in pools) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert errors == []
+    assert len(results) == rounds * threads
+    assert len(idents) > DatabaseHelper._pool_size
+    assert all(db.pool.connection_for(ident) is None for ident in idents)
+    for pool in pools:
+        pool.clear()
+        pool.waitForDone()
@@ -0,0 +1,44 @@
+from models.case import CaseModel
+from models.user import UserModel
+
+
+def count_queries(db, monkeypatch):
+    """Record every SQL statement DatabaseHelper runs from now on"""
+    queries = []
+    execute_query = db.execute_query
+
+    def recording(query, *args, **kwargs):
+        queries.append(query)
+        return execute_query(query, *args, **kwargs)
+
+    monkeypatch.setattr(db, 'execute_query', recording)
+    return queries
+
+
+def test_approximate_count_reads_counters(db, monkeypatch):
+    model = CaseModel()
+    expected = db.execute_query("SELECT COUNT(*) as n FROM cases WHERE status = 'Open'")[0]['n']
+    total = db.execute_query("SELECT COUNT(*) as n FROM cases")[0]['n']
+    queries = count_queries(db, monkeypatch)
+    assert model.approximate_count({'status': 'Open'}) == expected
+    assert model.approximate_count() == total
+    assert queries and not any('COUNT(*)' in query for query in queries)
+
+
+def test_approximate_count_falls_back_to_count(db):
+    model = CaseModel()
+    title = model.get_by_id(1)['title']
+    assert model.approximate_count({'title': title}) == 1
+    assert UserModel().approximate_count({'role': 'admin'}) == len(
+        db.execute_query("SELECT id FROM users WHERE role = 'admin'"))
+
+
+def test_page_total_follows_writes(db):
+    model = CaseModel()
+    before = model.get_page(filters={'status': 'Open'})['approx_total']
+    case_id = model.create({'case_number': 'T-PAGE-1', 'title': 'Paging', 'status': 'Open'})
+    try:
+        assert model.get_page(filters={'status': 'Open'})['approx_total'] == before + 1
+    finally:
+        model.delete(case_id)
+    assert model.get_page(filters={'status': 'Open'})['approx_total'] == before
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from models.case import CaseModel
+from utils.db_helper import DatabaseHelper
+
+
+CASE_COLUMNS = ['id', 'case_number', 'title', 'description', 'status', 'date_reported',
+                'closed_date', 'notes', 'created_at', 'updated_at']
+
+
+def test_case_rows_have_table_columns_only(db):
+    model = CaseModel()
+    assert list(model.get_by_id(1)) == CASE_COLUMNS
+    assert list(model.get_all()[0]) == CASE_COLUMNS
+    assert list(model.hydrate_case(1)) == CASE_COLUMNS + ['criminals', 'evidence']
+
+
+def test_case_row_written_back_unchanged(db):
+    model = CaseModel()
+    case = model.get_by_id(1)
+    model.update(1, {k: v for k, v in case.items() if k != 'id'})
+    assert model.get_by_id(1) == case
+
+
+def test_monthly_case_counts_match_dates(db):
+    counts = CaseModel().get_monthly_case_counts('2020-01-01', '2025-12-31')
+    assert [row['month'] for row in counts][:2] == ['2020-01', '2020-02']
+    expected = {
+        row['month']: row['n'] for row in db.execute_query("""
+            SELECT strftime('%Y-%m', date_reported) as month, COUNT(*) as n
+            FROM cases GROUP BY month
+        """)
+    }
+    assert all(row['count'] == expected.get(row['month'], 0) for row in counts)
+    assert sum(row['count'] for row in counts) > 0
+
+
+def test_hydrate_case_lists_links(db):
+    case = CaseModel().hydrate_case(1)
+    assert case['id'] == 1
+    assert all(evidence['case_id'] == 1 for evidence in case['evidence'])
+    linked = db.execute_query("SELECT criminal_id FROM case_criminals WHERE case_id = 1")
+    assert [c['id'] for c in case['criminals']] == sorted(row['criminal_id'] for row in linked)
+
+
+def test_hydrate_on_main_thread_while_workers_take_snapshots(db):
+    db.reader_pool.timeout = 2.0
+    db.release_connection()
+    model = CaseModel()
+    case_ids = [row['id'] for row in db.execute_query("SELECT id FROM cases")]
+    stop = threading.Event()
+    ran = []
+    errors = []
+
+    def worker():
+        # Report-style reads in a loop, then stay alive like a pool thread
+        try:
+            while not stop.is_set():
+                model.hydrate_cases(case_ids)
+                ran.append(1)
+        except Exception as e:
+            errors.append(e)
+        stop.wait()
+
+    threads = [threading.Thread(target=worker) for _ in range(DatabaseHelper._reader_pool_size * 2)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(20):
+            started = time.monotonic()
+            assert model.hydrate_case(1)['id'] == 1
+            assert time.monotonic() - started < db.reader_pool.timeout
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert ran
@@ -0,0 +1,66 @@
+from models.evidence import EvidenceModel
+from ui.widgets.data_table import DataTable
+
+COLUMNS = [
+    {'key': 'id', 'title': 'ID'},
+    {'key': 'name', 'title': 'Name'},
+    {'key': 'type', 'title': 'Type'},
+    {'key': 'storage_location', 'title': 'Storage Location'},
+    {'key': 'status', 'title': 'Status'},
+    {'key': 'case_id', 'title': 'Case ID'},
+]
+
+
+def evidence_table():
+    table = DataTable(COLUMNS, page_size=10)
+    table.set_model(EvidenceModel(), columns='list')
+    table.async_db.wait()
+    return table
+
+
+def search(table, text, column="All Columns"):
+    table.filter_combo.setCurrentText(column)
+    # Changing only the column does not search again
+    table.search_input.clear()
+    table.search_input.setText(text)
+    table.async_db.wait()
+    return {row['id'] for row in table.filtered_data}
+
+
+def expected(db, where, params=()):
+    return {row['id'] for row in db.execute_query(f"SELECT id FROM evidence WHERE {where}", params)}
+
+
+def test_model_pages_load_in_background(db, qapp):
+    table = evidence_table()
+    assert table.table.rowCount() == min(10, EvidenceModel().count())
+    assert table.table.item(0, 0).text() == '1'
+
+
+def test_search_matches_displayed_columns(db, qapp):
+    table = evidence_table()
+    assert search(table, "Physical") == expected(db, "type = 'Physical'")
+    assert search(table, "Evidence locker A1") == expected(db, "storage_location = 'Evidence locker A1'")
+    assert search(table, "Secured") == expected(db, "status = 'Secured'")
+    assert search(table, "1") >= expected(db, "CAST(id AS TEXT) LIKE '%1%'")
+
+
+def test_search_includes_full_text_hits(db, qapp):
+    table = evidence_table()
+    word = db.execute_query("SELECT description FROM evidence WHERE description != '' LIMIT 1")[0]
+    word = word['description'].split()[0]
+    assert search(table, word) >= {row['id'] for row in EvidenceModel().full_text_search(word, ['name'])}
+
+
+def test_search_in_one_column(db, qapp):
+    table = evidence_table()
+    assert search(table, "Secured", "Status") == expected(db, "status = 'Secured'")
+    assert search(table, "Secured", "Name") == expected(db, "name LIKE '%Secured%'")
+
+
+def test_clearing_search_reloads_first_page(db, qapp):
+    table = evidence_table()
+    search(table, "Physical")
+    search(table, "")
+    assert not table.searching
+    assert table.table.rowCount() == min(10, EvidenceModel().count())
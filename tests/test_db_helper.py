@@ -0,0 +1,122 @@
+import sqlite3
+import threading
+
+import pytest
+
+from utils.db_helper import DatabaseHelper
+
+
+def test_read_snapshot_releases_reader_connection(db):
+    with db.read_snapshot():
+        assert db.in_read_snapshot()
+        db.execute_query("SELECT COUNT(*) FROM cases")
+    assert not db.in_read_snapshot()
+    assert db.reader_pool.connection_for(threading.get_ident()) is None
+
+
+def test_snapshots_on_more_threads_than_reader_pool(db):
+    db.reader_pool.timeout = 2.0
+    count = DatabaseHelper._reader_pool_size * 3
+    finished = threading.Semaphore(0)
+    stop = threading.Event()
+    errors = []
+
+    def snapshot():
+        # Keep the thread alive afterwards, so only the release at the end
+        # of read_snapshot() lets the next thread in
+        try:
+            with db.read_snapshot():
+                db.execute_query("SELECT COUNT(*) FROM cases")
+        except Exception as e:
+            errors.append(e)
+        finished.release()
+        stop.wait(10)
+
+    threads = [threading.Thread(target=snapshot) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(count):
+            assert finished.acquire(timeout=10)
+        assert errors == []
+        with db.read_snapshot():
+            assert db.execute_query("SELECT COUNT(*) as n FROM cases")
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    assert db.reader_pool.size <= DatabaseHelper._reader_pool_size
+
+
+@pytest.fixture
+def scratch(db):
+    """An empty table for transaction tests"""
+    db.execute_query("CREATE TABLE IF NOT EXISTS tx_test (id INTEGER PRIMARY KEY, name TEXT)")
+    db.execute_query("DELETE FROM tx_test")
+    yield
+    db.execute_query("DROP TABLE tx_test")
+
+
+def names(db):
+    return [row['name'] for row in db.execute_query("SELECT name FROM tx_test ORDER BY id")]
+
+
+def committed_names(db):
+    """Rows another connection can see"""
+    conn = sqlite3.connect(db.db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT name FROM tx_test ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_transaction_commits_once_at_the_end(db, scratch):
+    with db.transaction():
+        db.execute_query("INSERT INTO tx_test (name) VALUES ('a')")
+        with db.transaction():
+            db.execute_query("INSERT INTO tx_test (name) VALUES ('b')")
+        assert names(db) == ['a', 'b']
+        assert committed_names(db) == []
+    assert not db.in_transaction()
+    assert committed_names(db) == ['a', 'b']
+
+
+def test_inner_failure_rolls_back_only_its_savepoint(db, scratch):
+    with db.transaction():
+        db.execute_query("INSERT INTO tx_test (name) VALUES ('a')")
+        with pytest.raises(ValueError):
+            with db.transaction():
+                db.execute_query("INSERT INTO tx_test (name) VALUES ('b')")
+                raise ValueError("bad row")
+        assert db.in_transaction()
+        db.execute_query("INSERT INTO tx_test (name) VALUES ('c')")
+    assert committed_names(db) == ['a', 'c']
+
+
+def test_outer_failure_discards_inner_work(db, scratch):
+    with pytest.raises(ValueError):
+        with db.transaction():
+            db.execute_query("INSERT INTO tx_test (name) VALUES ('a')")
+            with db.transaction():
+                db.execute_query("INSERT INTO tx_test (name) VALUES ('b')")
+            raise ValueError("abort")
+    assert not db.in_transaction()
+    assert committed_names(db) == []
+    assert names(db) == []
+
+
+def test_transaction_end_invalidates_reads_cached_meanwhile(db, scratch):
+    query = "SELECT COUNT(*) as n FROM tx_test"
+    assert db.execute_query(query, cache=True)[0]['n'] == 0
+    seen = []
+
+    with db.transaction():
+        db.execute_query("INSERT INTO tx_test (name) VALUES ('a')")
+        before = db.query_cache.snapshot(frozenset(['tx_test']))
+        # Another thread still reads the committed state and caches it
+        reader = threading.Thread(target=lambda: seen.append(db.execute_query(query, cache=True)[0]['n']))
+        reader.start()
+        reader.join()
+        assert seen == [0]
+    assert db.query_cache.snapshot(frozenset(['tx_test'])) > before
+    assert db.execute_query(query, cache=True)[0]['n'] == 1
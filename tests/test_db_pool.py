@@ -0,0 +1,147 @@
+import _thread
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from utils.db_pool import ConnectionPool, PoolTimeoutError
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_connections=1, timeout=2.0)
+    yield pool
+    pool.close_all()
+
+
+def run_foreign_thread(func):
+    """Run func to completion on a thread threading never sees exit"""
+    done = threading.Event()
+    errors = []
+
+    def target():
+        try:
+            func()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    _thread.start_new_thread(target, ())
+    assert done.wait(10)
+    return errors
+
+
+def test_connection_reclaimed_after_foreign_thread_exits(pool):
+    owned = []
+    assert run_foreign_thread(lambda: owned.append(pool.acquire())) == []
+    # The thread's dummy threading object still reports it as alive
+    assert pool.acquire() is owned[0]
+    assert pool.size == 1
+
+
+def test_foreign_threads_cycle_through_single_connection(pool):
+    for _ in range(5):
+        assert run_foreign_thread(lambda: pool.acquire().execute("SELECT 1")) == []
+    assert pool.size == 1
+
+
+def test_release_hands_connection_to_next_thread(pool):
+    conn = pool.acquire()
+    errors = run_foreign_thread(pool.acquire)
+    assert len(errors) == 1 and isinstance(errors[0], PoolTimeoutError)
+
+    pool.release()
+    assert run_foreign_thread(lambda: pool.acquire().execute("SELECT 1")) == []
+    assert pool.connection_for(threading.get_ident()) is None
+    assert pool.acquire() is conn
+
+
+def test_waiting_thread_served_before_busy_thread(pool):
+    stop = threading.Event()
+
+    def busy():
+        while not stop.is_set():
+            pool.acquire().execute("SELECT 1")
+            pool.release()
+
+    thread = threading.Thread(target=busy)
+    thread.start()
+    try:
+        time.sleep(0.05)
+        started = time.monotonic()
+        pool.acquire()
+        assert time.monotonic() - started < 1.0
+    finally:
+        stop.set()
+        pool.release()
+        thread.join()
+
+
+def test_opening_a_connection_does_not_block_owners(tmp_path):
+    opening = threading.Event()
+    proceed = threading.Event()
+
+    def slow_connect(conn):
+        # Stands in for PRAGMAs waiting on another process's lock
+        if threading.current_thread().name == 'opener':
+            opening.set()
+            proceed.wait(10)
+
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_connections=2, on_connect=slow_connect)
+    try:
+        conn = pool.acquire()
+        opener = threading.Thread(target=pool.acquire, name='opener')
+        opener.start()
+        assert opening.wait(10)
+        started = time.monotonic()
+        assert pool.acquire() is conn
+        assert time.monotonic() - started < 0.5
+        proceed.set()
+        opener.join()
+        assert pool.size == 2
+    finally:
+        proceed.set()
+        pool.close_all()
+
+
+def test_failed_open_frees_its_slot(tmp_path):
+    failures = [sqlite3.OperationalError("database is locked")]
+
+    def flaky_connect(conn):
+        if failures:
+            raise failures.pop()
+
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_connections=1, timeout=1.0,
+                          on_connect=flaky_connect)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire()
+        assert pool.size == 0
+        assert pool.acquire().execute("SELECT 1").fetchone() == (1,)
+        assert pool.size == 1
+    finally:
+        pool.close_all()
+
+
+def test_failed_replacement_of_dead_connection(tmp_path):
+    failures = []
+
+    def flaky_connect(conn):
+        if failures:
+            raise failures.pop()
+
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_connections=1, timeout=1.0,
+                          health_check_interval=0, on_connect=flaky_connect)
+    try:
+        pool.acquire().close()
+        failures.append(sqlite3.OperationalError("database is locked"))
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire()
+        assert pool.size == 0
+        assert pool.connection_for(threading.get_ident()) is None
+        assert pool.acquire().execute("SELECT 1").fetchone() == (1,)
+        assert pool.size == 1
+    finally:
+        pool.close_all()
@@ -0,0 +1,167 @@
+import random
+import sqlite3
+
+import pytest
+
+from database.migrations import rebuild_entity_counters
+from models.case import CaseModel
+from models.criminal import CriminalModel
+from models.evidence import EvidenceModel
+
+STATUSES = ['Open', 'Closed', 'Under Investigation', '', None]
+CRIME_TYPES = ['Theft', 'Fraud', None]
+
+
+def counters(db):
+    """entity_counters as the triggers left them, zero rows aside"""
+    return {tuple(row.values()) for row in db.execute_query("""
+        SELECT entity, dimension, value, count FROM entity_counters WHERE count != 0
+    """)}
+
+
+def rebuilt_counters(db):
+    """entity_counters recounted from the base tables, without keeping it"""
+    conn = sqlite3.connect(db.db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rebuild_entity_counters(conn.cursor())
+        return set(conn.execute("SELECT entity, dimension, value, count FROM entity_counters"))
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+@pytest.fixture
+def changes(db):
+    """Random inserts, updates and deletes across the counted tables"""
+    rng = random.Random(16)
+    cases, criminals, evidence = CaseModel(), CriminalModel(), EvidenceModel()
+    created = {cases: [], criminals: [], evidence: []}
+
+    def run(steps):
+        for step in range(steps):
+            n = len(created[cases]) + len(created[criminals]) + len(created[evidence])
+            action = rng.choice(['create', 'create', 'update', 'delete'])
+            model = rng.choice(list(created))
+            if action == 'create' or not created[model]:
+                if model is cases:
+                    data = {'case_number': f"T-{step}-{n}", 'title': 'Test case'}
+                elif model is criminals:
+                    data = {'name': 'Test criminal', 'crime_type': rng.choice(CRIME_TYPES)}
+                else:
+                    data = {'evidence_number': f"T-{step}-{n}", 'name': 'Test item',
+                            'description': 'Test item', 'case_id': 1}
+                data['status'] = rng.choice(STATUSES)
+                created[model].append(model.create(data))
+            elif action == 'update':
+                data = {'status': rng.choice(STATUSES)}
+                if model is criminals and rng.random() < 0.5:
+                    data['crime_type'] = rng.choice(CRIME_TYPES)
+                model.update(rng.choice(created[model]), data)
+            else:
+                ids = created[model]
+                model.delete(ids.pop(rng.randrange(len(ids))))
+
+    yield run
+    for model, ids in created.items():
+        for id in ids:
+            model.delete(id)
+
+
+def test_counters_follow_inserts_updates_and_deletes(db, changes):
+    assert counters(db) == rebuilt_counters(db)
+    changes(300)
+    assert counters(db) == rebuilt_counters(db)
+
+
+def test_count_accessors_agree(db, changes):
+    changes(100)
+    for model, fields in [(CaseModel(), ['status']), (CriminalModel(), ['status', 'crime_type'])]:
+        for field in fields:
+            by_value = model.counts_by(field)
+            assert by_value.get(None, 0) == model.count_where(field, None)
+            for value, count in by_value.items():
+                assert model.count_where(field, value) == count
+            assert sum(by_value.values()) == model.count()
+
+
+def test_count_where_none_without_counters(db):
+    model = CaseModel()
+    model._counters = False
+    case_id = model.create({'case_number': 'T-NULL-1', 'title': 'No status', 'status': None})
+    try:
+        nulls = db.execute_query("SELECT COUNT(*) as n FROM cases WHERE status IS NULL")[0]['n']
+        assert nulls >= 1
+        assert model.count_where('status', None) == nulls == model.counts_by('status')[None]
+    finally:
+        model.delete(case_id)
+
+
+def case_months(db):
+    return {tuple(row.values()) for row in db.execute_query("""
+        SELECT month, total_cases, closed_cases FROM case_monthly WHERE total_cases != 0
+    """)}
+
+
+def evidence_months(db):
+    return {tuple(row.values()) for row in db.execute_query("""
+        SELECT month, evidence_count FROM evidence_monthly WHERE evidence_count != 0
+    """)}
+
+
+def regrouped(db):
+    """The rollups recomputed with a fresh GROUP BY over the base tables"""
+    cases = {tuple(row.values()) for row in db.execute_query("""
+        SELECT strftime('%Y-%m', date_reported) as month, COUNT(*),
+               SUM(CASE WHEN status = 'Closed' THEN 1 ELSE 0 END)
+        FROM cases WHERE date_reported IS NOT NULL GROUP BY month
+    """)}
+    evidence = {tuple(row.values()) for row in db.execute_query("""
+        SELECT strftime('%Y-%m', date_collected) as month, COUNT(*)
+        FROM evidence WHERE date_collected IS NOT NULL GROUP BY month
+    """)}
+    return cases, evidence
+
+
+def test_monthly_rollups_follow_changes(db):
+    cases, evidence = CaseModel(), EvidenceModel()
+    assert (case_months(db), evidence_months(db)) == regrouped(db)
+
+    case_ids = [
+        cases.create({'case_number': 'T-MONTH-1', 'title': 'Rollup', 'status': 'Open',
+                      'date_reported': '2031-01-15'}),
+        cases.create({'case_number': 'T-MONTH-2', 'title': 'Rollup', 'status': 'Closed',
+                      'date_reported': '2031-01-20 09:30:00'}),
+        cases.create({'case_number': 'T-MONTH-3', 'title': 'Rollup', 'status': 'Open',
+                      'date_reported': None}),
+    ]
+    evidence_ids = [
+        evidence.create({'evidence_number': f'T-MONTH-{i}', 'name': 'Rollup', 'description': 'Rollup',
+                         'case_id': case_ids[0], 'date_collected': date})
+        for i, date in enumerate(['2031-01-16', '2031-02-01', None])
+    ]
+    try:
+        steps = [
+            (cases, case_ids[0], {'status': 'Closed'}),
+            (cases, case_ids[1], {'status': 'Open'}),
+            (cases, case_ids[0], {'date_reported': '2031-03-01'}),
+            (cases, case_ids[1], {'date_reported': None, 'status': 'Closed'}),
+            (cases, case_ids[2], {'date_reported': '2031-03-31', 'status': 'Closed'}),
+            (cases, case_ids[0], {'title': 'Renamed'}),
+            (evidence, evidence_ids[0], {'date_collected': '2031-02-28'}),
+            (evidence, evidence_ids[1], {'date_collected': None}),
+            (evidence, evidence_ids[2], {'date_collected': '2031-01-01'}),
+        ]
+        for model, id, data in steps:
+            model.update(id, data)
+            assert (case_months(db), evidence_months(db)) == regrouped(db), data
+
+        evidence.delete(evidence_ids.pop(0))
+        cases.delete(case_ids.pop(0))
+        assert (case_months(db), evidence_months(db)) == regrouped(db)
+    finally:
+        for id in evidence_ids:
+            evidence.delete(id)
+        for id in case_ids:
+            cases.delete(id)
+    assert (case_months(db), evidence_months(db)) == regrouped(db)
@@ -0,0 +1,116 @@
+import pytest
+
+from utils.login_throttle import DEFAULT_LIMITS, LoginThrottle, ThrottleLimit
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def throttle_with(clock, persist=False, **limits):
+    return LoginThrottle(dict(DEFAULT_LIMITS, **limits), clock=clock, persist=persist)
+
+
+def fail(throttle, username, times):
+    for _ in range(times):
+        throttle.record_failure(username)
+
+
+def test_fifth_failure_locks_the_user():
+    clock = FakeClock()
+    throttle = throttle_with(clock)
+    fail(throttle, 'alice', 4)
+    assert throttle.retry_after('alice') == 0
+    fail(throttle, 'alice', 1)
+    assert throttle.retry_after('alice') == DEFAULT_LIMITS['user'].base_delay
+    # Usernames are matched case-insensitively; others are unaffected
+    assert throttle.retry_after(' Alice ') > 0
+    assert throttle.retry_after('bob') == 0
+    clock.advance(DEFAULT_LIMITS['user'].base_delay)
+    assert throttle.retry_after('alice') == 0
+
+
+def test_delay_doubles_up_to_max_delay():
+    clock = FakeClock()
+    throttle = throttle_with(clock, user=ThrottleLimit(max_failures=3, window=900.0,
+                                                       base_delay=1.0, max_delay=8.0))
+    fail(throttle, 'alice', 2)
+    delays = []
+    for _ in range(6):
+        fail(throttle, 'alice', 1)
+        delays.append(throttle.retry_after('alice'))
+        clock.advance(delays[-1])
+    assert delays == [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+
+
+def test_failures_expire_after_the_window():
+    clock = FakeClock()
+    throttle = throttle_with(clock)
+    fail(throttle, 'alice', 5)
+    clock.advance(DEFAULT_LIMITS['user'].window)
+    assert throttle.retry_after('alice') == 0
+    fail(throttle, 'alice', 1)
+    assert throttle.retry_after('alice') == 0
+
+
+def test_success_clears_only_the_user():
+    clock = FakeClock()
+    throttle = throttle_with(clock, process=ThrottleLimit(max_failures=7, window=900.0,
+                                                          base_delay=1.0, max_delay=300.0))
+    fail(throttle, 'alice', 5)
+    throttle.record_success('alice')
+    assert throttle.retry_after('alice') == 0
+    # The process still remembers alice's five failures
+    fail(throttle, 'bob', 2)
+    assert throttle.retry_after('carol') == 1.0
+
+
+def test_stale_keys_are_swept():
+    clock = FakeClock()
+    throttle = throttle_with(clock)
+    throttle.max_tracked = 10
+    for i in range(10):
+        throttle.record_failure(f"user{i}")
+    clock.advance(DEFAULT_LIMITS['user'].window)
+    throttle.record_failure('late')
+    assert set(throttle._failures) == {('user', 'late'), ('process', '')}
+
+
+@pytest.fixture
+def login_failures(db):
+    db.execute_query("DELETE FROM login_failures")
+    yield
+    db.execute_query("DELETE FROM login_failures")
+
+
+def test_new_instance_restores_failures(db, login_failures):
+    clock = FakeClock()
+    throttle = throttle_with(clock, persist=True)
+    fail(throttle, 'alice', 5)
+    throttle.record_failure('bob')
+    waiting = throttle.retry_after('alice')
+    assert waiting > 0
+
+    restarted = throttle_with(clock, persist=True)
+    assert restarted.retry_after('alice') == waiting
+    assert restarted.retry_after('bob') == 0
+
+    # Failures that left every window are neither restored nor kept
+    clock.advance(max(limit.window for limit in DEFAULT_LIMITS.values()))
+    assert throttle_with(clock, persist=True).retry_after('alice') == 0
+    assert db.execute_query("SELECT COUNT(*) as n FROM login_failures")[0]['n'] == 0
+
+
+def test_success_is_persisted(db, login_failures):
+    clock = FakeClock()
+    throttle = throttle_with(clock, persist=True)
+    fail(throttle, 'alice', 5)
+    throttle.record_success('alice')
+    assert throttle_with(clock, persist=True).retry_after('alice') == 0
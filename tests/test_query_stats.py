@@ -0,0 +1,37 @@
+import logging
+import sqlite3
+
+from utils.query_stats import QueryStats
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_slow_log_redacts_parameter_values():
+    stats = QueryStats(slow_query_ms=0.001)
+    capture = _Capture()
+    stats.slow_logger.addHandler(capture)
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE users (username TEXT, password TEXT)")
+    try:
+        stats.record(conn, "SELECT * FROM users WHERE username = ? AND password = ?",
+                     ('j.doe', '$2b$12$secrethash'), 1.0)
+        stats.record(conn, "INSERT INTO users VALUES (?, ?)",
+                     [('j.doe', '$2b$12$secrethash')] * 2, 1.0)
+    finally:
+        stats.slow_logger.removeHandler(capture)
+        conn.close()
+
+    assert len(capture.messages) == 2
+    for message in capture.messages:
+        assert 'j.doe' not in message and 'secrethash' not in message
+    assert 'params: 2 (str, str)' in capture.messages[0]
+    assert 'params: 2 rows of (str, str)' in capture.messages[1]
+    # The plan still sees the real parameters
+    assert 'SCAN users' in capture.messages[0]
@@ -0,0 +1,99 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                            QLabel, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QMessageBox)
+from PyQt5.QtCore import Qt
+from utils.db_helper import DatabaseHelper
+
+class DiagnosticsDialog(QDialog):
+    """Hidden panel showing query timings and cache counters (Ctrl+Shift+D)"""
+
+    COLUMNS = [
+        ('sql', 'Statement'),
+        ('count', 'Calls'),
+        ('total_ms', 'Total (ms)'),
+        ('mean_ms', 'Mean (ms)'),
+        ('p50_ms', 'p50 (ms)'),
+        ('p95_ms', 'p95 (ms)'),
+        ('max_ms', 'Max (ms)'),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.db = DatabaseHelper()
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        """Setup the dialog UI"""
+        self.setWindowTitle("Database Diagnostics")
+        self.resize(1000, 600)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+        layout.setContentsMargins(16, 16, 16, 16)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([label for _, label in self.COLUMNS])
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(self.COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        dump_btn = QPushButton("Dump to File")
+        dump_btn.clicked.connect(self.dump)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+
+        for btn in (refresh_btn, reset_btn, dump_btn, close_btn):
+            button_layout.addWidget(btn)
+        layout.addLayout(button_layout)
+
+    def refresh(self):
+        """Reload statistics from the database helper"""
+        stats = self.db.query_stats.snapshot()
+        cache = self.db.cache_stats()
+
+        self.summary_label.setText(
+            f"{len(stats)} statements, slow threshold {self.db.query_stats.slow_query_ms:g} ms  |  "
+            f"cache: {cache['hits']} hits, {cache['misses']} misses "
+            f"({cache['hit_rate']:.0%}), {cache['entries']} entries, "
+            f"{cache['bytes'] / 1024:.0f} of {cache['max_bytes'] / 1024:.0f} KiB"
+        )
+
+        self.table.setRowCount(len(stats))
+        for row, entry in enumerate(stats):
+            for column, (key, _) in enumerate(self.COLUMNS):
+                item = QTableWidgetItem(str(entry[key]))
+                if key == 'sql':
+                    item.setToolTip(entry[key])
+                else:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def reset(self):
+        """Clear the recorded timings"""
+        self.db.query_stats.reset()
+        self.refresh()
+
+    def dump(self):
+        """Write the statistics to logs/query_stats.json"""
+        try:
+            path = self.db.dump_query_stats()
+            QMessageBox.information(self, "Diagnostics", f"Query statistics written to {path}")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to write query statistics: {str(e)}")
@@ -261,7 +261,7 @@ class EvidenceDialog(QDialog):
             
     def get_case_options(self):
         """Get list of cases for dropdown"""
-        cases = self.case_model.get_all()
+        cases = self.case_model.get_all(columns=('id', 'title'))
         return [f"Case-{case['id']}: {case['title']}" for case in cases]
             
     def handle_submit(self):
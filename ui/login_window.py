@@ -7,6 +7,8 @@ import sqlite3
 import logging
 from utils.db_helper import DatabaseHelper
 from models.user import UserModel
+from utils.login_throttle import LoginThrottled
+from utils.async_db import AsyncDatabase
 from ui.main_window import MainWindow
 
 class LoginWindow(QMainWindow):
@@ -15,6 +17,7 @@ class LoginWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.user_model = UserModel()
+        self.async_db = AsyncDatabase(self)
         self.setup_ui()
         
     def setup_ui(self):
@@ -56,8 +59,8 @@ class LoginWindow(QMainWindow):
         layout.addWidget(self.password_input)
         
         # Login button
-        login_button = QPushButton("Login")
-        login_button.setStyleSheet("""
+        self.login_button = QPushButton("Login")
+        self.login_button.setStyleSheet("""
             QPushButton {
                 padding: 8px;
                 background-color: #2196F3;
@@ -69,8 +72,8 @@ class LoginWindow(QMainWindow):
                 background-color: #1976D2;
             }
         """)
-        login_button.clicked.connect(self.handle_login)
-        layout.addWidget(login_button)
+        self.login_button.clicked.connect(self.handle_login)
+        layout.addWidget(self.login_button)
         
         # Set window icon
         self.setWindowIcon(QIcon("assets/images/icon.png"))
@@ -84,7 +87,33 @@ class LoginWindow(QMainWindow):
             QMessageBox.warning(self, "Login Failed", "Please enter both username and password.")
             return
             
-        user = self.user_model.authenticate(username, password)
+        # bcrypt takes a noticeable fraction of a second; hash on a worker
+        # so the window keeps painting
+        self.login_button.setEnabled(False)
+        self.login_button.setText("Signing in...")
+        self.async_db.submit(
+            'login',
+            self.user_model.authenticate,
+            username,
+            password,
+            on_result=self.finish_login,
+            on_error=self.login_error
+        )
+        
+    def login_error(self, error):
+        """Report a throttled login; anything else is a failed login"""
+        if isinstance(error, LoginThrottled):
+            self.login_button.setEnabled(True)
+            self.login_button.setText("Login")
+            QMessageBox.warning(self, "Login Failed", str(error))
+            self.password_input.clear()
+        else:
+            self.finish_login(None)
+        
+    def finish_login(self, user):
+        """Open the main window or report a failed login"""
+        self.login_button.setEnabled(True)
+        self.login_button.setText("Login")
         
         if user:
             # Create and show main window
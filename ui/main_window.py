@@ -1,9 +1,9 @@
 import os
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QStackedWidget, QFrame, QSpacerItem,
-                             QSizePolicy)
+                             QSizePolicy, QShortcut)
 from PyQt5.QtCore import Qt, QSize, QTimer
-from PyQt5.QtGui import QFont, QIcon, QColor
+from PyQt5.QtGui import QFont, QIcon, QColor, QKeySequence
 from ui.pages.dashboard import DashboardPage
 from ui.pages.criminals import CriminalsPage
 from ui.pages.cases import CasesPage
@@ -167,6 +167,10 @@ class MainWindow(QMainWindow):
         self.nav_buttons[0].style().unpolish(self.nav_buttons[0])
         self.nav_buttons[0].style().polish(self.nav_buttons[0])
         
+        # Hidden database diagnostics panel
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self.show_diagnostics)
+        
         # Apply stylesheet
         self.setStyleSheet("""
             QMainWindow {
@@ -288,6 +292,10 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setCurrentIndex(4)
         self.update_active_nav_button(4)
         
+    def show_diagnostics(self):
+        from ui.dialogs.diagnostics_dialog import DiagnosticsDialog
+        DiagnosticsDialog(self).exec_()
+        
     def update_active_nav_button(self, active_index):
         for i, btn in enumerate(self.nav_buttons):
             btn.setProperty("active", i == active_index)
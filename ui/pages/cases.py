@@ -10,6 +10,8 @@ from models.case import CaseModel
 from models.criminal import CriminalModel
 from models.evidence import EvidenceModel
 from models.user import UserModel
+from utils.async_db import AsyncDatabase
+from utils.export_helper import generate_case_report
 from datetime import datetime
 
 class CaseDialog(QDialog):
@@ -244,6 +246,13 @@ class CaseDialog(QDialog):
         button_layout.setSpacing(16)
         button_layout.addStretch()
         
+        # Export the hydrated case as a PDF report (existing cases only)
+        if self.case_data:
+            export_btn = QPushButton("Export Report")
+            export_btn.setObjectName("secondary-button")
+            export_btn.clicked.connect(self.handle_export)
+            button_layout.addWidget(export_btn)
+        
         # Cancel button
         cancel_btn = QPushButton("Cancel")
         cancel_btn.setObjectName("secondary-button")
@@ -347,7 +356,7 @@ class CaseDialog(QDialog):
         """)
         
         # Load criminals list with improved formatting
-        criminals = self.criminal_model.get_all()
+        criminals = self.criminal_model.get_all(columns=('id', 'name'))
         for criminal in criminals:
             item = QListWidgetItem(f"{criminal['name']} (ID: {criminal['id']})")
             item.setData(Qt.UserRole, criminal['id'])
@@ -356,18 +365,18 @@ class CaseDialog(QDialog):
         
         # Load initial data
         if self.case_data:
-            # Get case details including criminals
-            case_details = self.case_model.get_case_with_details(self.case_data['id'])
-            self.form.set_data(case_details)
+            # Callers usually pass a hydrated case; only fetch it if not
+            if 'criminals' not in self.case_data or 'evidence' not in self.case_data:
+                self.case_data = self.case_model.hydrate_case(self.case_data['id'])
+            self.form.set_data(self.case_data)
             
             # Select linked criminals
-            if 'criminals' in case_details:
-                for i in range(self.criminals_list.count()):
-                    item = self.criminals_list.item(i)
-                    criminal_id = item.data(Qt.UserRole)
-                    if any(c['id'] == criminal_id for c in case_details['criminals']):
-                        item.setSelected(True)
-                        item.setBackground(Qt.lightGray)  # Highlight selected criminals
+            linked_ids = {criminal['id'] for criminal in self.case_data['criminals']}
+            for i in range(self.criminals_list.count()):
+                item = self.criminals_list.item(i)
+                if item.data(Qt.UserRole) in linked_ids:
+                    item.setSelected(True)
+                    item.setBackground(Qt.lightGray)  # Highlight selected criminals
         
     def handle_submit(self):
         """Handle form submission"""
@@ -381,6 +390,14 @@ class CaseDialog(QDialog):
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
     
+    def handle_export(self):
+        """Write the case, its criminals and its evidence to a PDF report"""
+        try:
+            file_path = generate_case_report(self.case_data)
+            QMessageBox.information(self, "Report Exported", f"Case report saved to {file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export case report: {str(e)}")
+    
     def get_selected_criminals(self):
         """Get list of selected criminal IDs"""
         return [
@@ -393,6 +410,7 @@ class CasesPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.case_model = CaseModel()
+        self.async_db = AsyncDatabase(self)
         self.setup_ui()
         
     def setup_ui(self):
@@ -599,11 +617,21 @@ class CasesPage(QWidget):
         
     def refresh(self):
         """Refresh the table data"""
-        try:
-            cases = self.case_model.get_all_cases()
-            self.update_table(cases)
-        except Exception as e:
-            print(f"Error refreshing cases: {str(e)}")
+        self.load_async(self.case_model.get_all_cases, "Error refreshing cases", 'list')
+        
+    def load_async(self, fetch, error_message, *args):
+        """Run fetch(*args) on a worker thread and show the cases it returns
+        
+        Refreshes, searches and filters share one key, so a newer request
+        cancels the one still running.
+        """
+        self.async_db.submit(
+            'cases',
+            fetch,
+            *args,
+            on_result=self.update_table,
+            on_error=lambda e: print(f"{error_message}: {str(e)}")
+        )
             
     def update_table(self, cases):
         """Update table with filtered data"""
@@ -637,45 +665,37 @@ class CasesPage(QWidget):
     def get_case_data(self, row):
         """Get case data from table row"""
         case_id = int(self.table.item(row, 0).text())
-        # Get complete case details including description and criminals
-        return self.case_model.get_case_with_details(case_id)
+        # Case, linked criminals and evidence in one batched read
+        return self.case_model.hydrate_case(case_id)
         
     def handle_search(self, text):
         """Handle search input changes"""
-        try:
-            text = text.lower().strip()
-            if text:
-                cases = []
-                all_cases = self.case_model.get_all_cases()
-                for case in all_cases:
-                    # Search in multiple fields
-                    if (text in str(case['id']).lower() or
-                        text in case['case_number'].lower() or
-                        text in case['title'].lower() or
-                        text in case['status'].lower() or
-                        text in case['date_reported'].lower() or
-                        text in str(case.get('closed_date', '')).lower()):
-                        cases.append(case)
-            else:
-                cases = self.case_model.get_all_cases()
-                
-            self.update_table(cases)
+        self.load_async(self.fetch_matching, "Error searching cases", text.lower().strip())
+        
+    def fetch_matching(self, text):
+        """Cases matching a search text (runs on a worker thread)"""
+        all_cases = self.case_model.get_all_cases('list')
+        if not text:
+            return all_cases
             
-        except Exception as e:
-            print(f"Error searching cases: {str(e)}")
+        cases = []
+        for case in all_cases:
+            # Search in multiple fields
+            if (text in str(case['id']).lower() or
+                text in case['case_number'].lower() or
+                text in case['title'].lower() or
+                text in case['status'].lower() or
+                text in case['date_reported'].lower() or
+                text in str(case.get('closed_date', '')).lower()):
+                cases.append(case)
+        return cases
             
     def handle_filter(self, status):
         """Handle filter changes"""
-        try:
-            if status == "All":
-                cases = self.case_model.get_all_cases()
-            else:
-                cases = self.case_model.get_cases_by_status(status)
-                
-            self.update_table(cases)
-            
-        except Exception as e:
-            print(f"Error filtering cases: {str(e)}")
+        if status == "All":
+            self.load_async(self.case_model.get_all_cases, "Error filtering cases", 'list')
+        else:
+            self.load_async(self.case_model.get_cases_by_status, "Error filtering cases", status, 'list')
         
     def handle_add(self):
         """Handle add button click"""
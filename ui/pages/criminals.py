@@ -7,6 +7,7 @@ from PyQt5.QtGui import QFont, QColor, QIcon
 from ui.widgets.data_table import DataTable
 from ui.widgets.form_widget import FormWidget
 from models.criminal import CriminalModel
+from utils.async_db import AsyncDatabase
 from datetime import datetime
 from ui.dialogs.add_criminal import AddCriminalDialog
 
@@ -110,6 +111,7 @@ class CriminalsPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.criminal_model = CriminalModel()
+        self.async_db = AsyncDatabase(self)
         self.setup_ui()
         
     def setup_ui(self):
@@ -316,26 +318,25 @@ class CriminalsPage(QWidget):
         
     def load_data(self):
         """Load criminals data into table"""
-        try:
-            criminals = self.criminal_model.get_all()
-            self.table.setRowCount(len(criminals))
-            
-            for row, criminal in enumerate(criminals):
-                self.table.setItem(row, 0, QTableWidgetItem(str(criminal['id'])))
-                self.table.setItem(row, 1, QTableWidgetItem(criminal['name']))
-                self.table.setItem(row, 2, QTableWidgetItem(str(criminal['age'])))
-                self.table.setItem(row, 3, QTableWidgetItem(criminal['gender']))
-                self.table.setItem(row, 4, QTableWidgetItem(criminal['crime_type']))
-                self.table.setItem(row, 5, QTableWidgetItem(criminal['status']))
-                self.table.setItem(row, 6, QTableWidgetItem(criminal['arrest_date']))
-                
-                # Set item properties
-                for col in range(7):
-                    item = self.table.item(row, col)
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                    
-        except Exception as e:
-            print(f"Error loading criminals: {str(e)}")
+        self.load_async(self.fetch_all, "Error loading criminals")
+        
+    def load_async(self, fetch, error_message, *args):
+        """Run fetch(*args) on a worker thread and show the rows it returns
+        
+        Loads, searches and filters share one key, so a newer request
+        (e.g. the next keystroke) cancels the one still running.
+        """
+        self.async_db.submit(
+            'criminals',
+            fetch,
+            *args,
+            on_result=self.update_table,
+            on_error=lambda e: print(f"{error_message}: {str(e)}")
+        )
+        
+    def fetch_all(self):
+        """All criminals as compact records (runs on a worker thread)"""
+        return list(self.criminal_model.iter_all(row_format='record', columns='list'))
             
     def show_add_dialog(self):
         """Show add criminal dialog"""
@@ -345,46 +346,38 @@ class CriminalsPage(QWidget):
             
     def handle_search(self, text):
         """Handle search input changes"""
-        try:
-            text = text.lower().strip()
-            if text:
-                criminals = []
-                all_criminals = self.criminal_model.get_all()
-                for criminal in all_criminals:
-                    # Search in multiple fields
-                    if (text in str(criminal['id']).lower() or
-                        text in criminal['name'].lower() or
-                        text in str(criminal['age']).lower() or
-                        text in criminal['gender'].lower() or
-                        text in criminal['crime_type'].lower() or
-                        text in criminal['status'].lower()):
-                        criminals.append(criminal)
-            else:
-                criminals = self.criminal_model.get_all()
-                
-            self.update_table(criminals)
+        self.load_async(self.fetch_matching, "Error searching criminals", text.lower().strip())
+        
+    def fetch_matching(self, text):
+        """Criminals matching a search text (runs on a worker thread)"""
+        if not text:
+            return self.fetch_all()
             
-        except Exception as e:
-            print(f"Error searching criminals: {str(e)}")
+        criminals = []
+        for criminal in self.criminal_model.iter_all(row_format='record', columns='list'):
+            # Search in multiple fields
+            if (text in str(criminal['id']).lower() or
+                text in criminal['name'].lower() or
+                text in str(criminal['age']).lower() or
+                text in criminal['gender'].lower() or
+                text in criminal['crime_type'].lower() or
+                text in criminal['status'].lower()):
+                criminals.append(criminal)
+        return criminals
             
     def handle_filter(self, status):
         """Handle filter changes"""
-        try:
-            if status == "All":
-                criminals = self.criminal_model.get_all()
-            else:
-                criminals = self.criminal_model.get_by_status(status)
-                
-            self.update_table(criminals)
-            
-        except Exception as e:
-            print(f"Error filtering criminals: {str(e)}")
+        if status == "All":
+            self.load_async(self.fetch_all, "Error filtering criminals")
+        else:
+            self.load_async(self.criminal_model.get_by_status, "Error filtering criminals", status, 'list')
             
     def update_table(self, criminals):
-        """Update table with filtered data"""
-        self.table.setRowCount(len(criminals))
+        """Update table with filtered data (any iterable of rows)"""
+        self.table.setRowCount(0)
         
         for row, criminal in enumerate(criminals):
+            self.table.insertRow(row)
             self.table.setItem(row, 0, QTableWidgetItem(str(criminal['id'])))
             self.table.setItem(row, 1, QTableWidgetItem(criminal['name']))
             self.table.setItem(row, 2, QTableWidgetItem(str(criminal['age'])))
@@ -8,6 +8,7 @@ from ui.widgets.stat_card import StatCard
 from models.criminal import CriminalModel
 from models.case import CaseModel
 from models.evidence import EvidenceModel
+from utils.async_db import AsyncDatabase
 
 class DashboardPage(QWidget):
     def __init__(self, parent=None):
@@ -15,6 +16,7 @@ class DashboardPage(QWidget):
         self.criminal_model = CriminalModel()
         self.case_model = CaseModel()
         self.evidence_model = EvidenceModel()
+        self.async_db = AsyncDatabase(self)
         self.setup_ui()
         
         # Setup refresh timer
@@ -64,8 +66,8 @@ class DashboardPage(QWidget):
         charts_layout.setContentsMargins(0, 0, 0, 0)
         charts_layout.setSpacing(20)
         
-        # Add charts
-        self.create_charts(charts_layout)
+        # Add empty charts; refresh() fills them once the data has loaded
+        self.create_charts(charts_layout, {'crime_stats': [], 'monthly_stats': []})
         layout.addWidget(charts_section)
 
         # Set styling
@@ -101,14 +103,13 @@ class DashboardPage(QWidget):
         # Initial data load
         self.refresh()
         
-    def create_pie_chart(self):
+    def create_pie_chart(self, crime_stats):
         """Create pie chart with real crime type distribution"""
         series = QPieSeries()
         series.setHoleSize(0.45)  # Increased hole size for better appearance
         
         try:
-            # Get actual crime type distribution from database
-            crime_stats = self.criminal_model.get_crime_type_stats()
+            # Crime type distribution loaded by load_dashboard_data
             total_criminals = sum(int(stat['count']) for stat in crime_stats)
             
             # Completely distinct color palette with high contrast between adjacent colors
@@ -183,7 +184,7 @@ class DashboardPage(QWidget):
         
         return chart_view
         
-    def create_line_chart(self):
+    def create_line_chart(self, monthly_stats):
         """Create line chart with real case trends"""
         chart = QChart()
         chart.setBackgroundVisible(False)
@@ -200,10 +201,7 @@ class DashboardPage(QWidget):
             end_date = QDateTime.currentDateTime()
             start_date = end_date.addMonths(-11)
             
-            # Get monthly stats
-            case_stats = self.case_model.get_case_stats()
-            monthly_stats = case_stats.get('monthly_stats', [])
-            
+            # Monthly stats loaded by load_dashboard_data
             # Process data points
             max_count = 0
             if monthly_stats:
@@ -270,35 +268,37 @@ class DashboardPage(QWidget):
         chart_view.setRenderHint(QPainter.Antialiasing)
         return chart_view
         
-    def update_statistics(self):
+    def load_dashboard_data(self):
+        """Query everything the dashboard shows (runs on a worker thread)"""
+        return {
+            'total_criminals': self.criminal_model.count(),
+            'total_cases': self.case_model.count(),
+            'open_cases': self.case_model.count_by_status('Open'),
+            'total_evidence': self.evidence_model.count(),
+            'crime_stats': self.criminal_model.get_crime_type_stats(),
+            'monthly_stats': self.case_model.get_case_stats().get('monthly_stats', []),
+        }
+        
+    def update_statistics(self, data):
         """Update statistics cards with real data"""
-        try:
-            # Get total criminals
-            total_criminals = self.criminal_model.count()
-            self.stat_cards[0].update_value(str(total_criminals))
-            
-            # Get case statistics
-            total_cases = self.case_model.count()
-            open_cases = len(self.case_model.get_cases_by_status('Open'))
-            
-            self.stat_cards[1].update_value(str(total_cases))
-            self.stat_cards[2].update_value(str(open_cases))
-            
-            # Get total evidence
-            total_evidence = self.evidence_model.count()
-            self.stat_cards[3].update_value(str(total_evidence))
-            
-        except Exception as e:
-            print(f"Error updating statistics: {str(e)}")
-            # Set default values in case of error
-            default_values = ["0", "0", "0", "0"]
-            for card, value in zip(self.stat_cards, default_values):
-                card.update_value(value)
+        self.stat_cards[0].update_value(str(data['total_criminals']))
+        self.stat_cards[1].update_value(str(data['total_cases']))
+        self.stat_cards[2].update_value(str(data['open_cases']))
+        self.stat_cards[3].update_value(str(data['total_evidence']))
                 
     def refresh(self):
-        """Refresh all dashboard data"""
+        """Refresh all dashboard data without blocking the window"""
+        self.async_db.submit(
+            'dashboard',
+            self.load_dashboard_data,
+            on_result=self.apply_dashboard_data,
+            on_error=self.handle_load_error
+        )
+        
+    def apply_dashboard_data(self, data):
+        """Show freshly loaded dashboard data"""
         # Update statistics first
-        self.update_statistics()
+        self.update_statistics(data)
         
         # Then update charts
         charts_section = self.findChild(QFrame, "charts-section")
@@ -308,7 +308,15 @@ class DashboardPage(QWidget):
                 charts_section.layout().itemAt(i).widget().setParent(None)
             
             # Create new charts
-            self.create_charts(charts_section.layout())
+            self.create_charts(charts_section.layout(), data)
+            
+    def handle_load_error(self, error):
+        """Fall back to empty values when loading fails"""
+        print(f"Error updating statistics: {str(error)}")
+        # Set default values in case of error
+        default_values = ["0", "0", "0", "0"]
+        for card, value in zip(self.stat_cards, default_values):
+            card.update_value(value)
 
     def showEvent(self, event):
         """Handle show event"""
@@ -322,6 +330,7 @@ class DashboardPage(QWidget):
     def closeEvent(self, event):
         super().closeEvent(event)
         self.refresh_timer.stop()
+        self.async_db.cancel_all()
 
     def create_stat_cards(self, layout):
         """Create statistics cards"""
@@ -358,7 +367,7 @@ class DashboardPage(QWidget):
             }
         """)
 
-    def create_charts(self, layout):
+    def create_charts(self, layout, data):
         """Create charts section"""
         # Create pie chart container
         pie_container = QFrame()
@@ -371,7 +380,7 @@ class DashboardPage(QWidget):
         pie_title.setObjectName("chart-title")
         pie_layout.addWidget(pie_title)
         
-        self.pie_chart = self.create_pie_chart()
+        self.pie_chart = self.create_pie_chart(data['crime_stats'])
         pie_layout.addWidget(self.pie_chart)
         layout.addWidget(pie_container)
         
@@ -424,7 +433,7 @@ class DashboardPage(QWidget):
         
         line_layout.addWidget(header_widget)
         
-        self.line_chart = self.create_line_chart()
+        self.line_chart = self.create_line_chart(data['monthly_stats'])
         line_layout.addWidget(self.line_chart)
         layout.addWidget(line_container)
         
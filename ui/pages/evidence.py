@@ -28,7 +28,7 @@ class EvidenceDialog(QDialog):
         layout.setSpacing(20)
         
         # Get cases for linking
-        cases = self.case_model.get_all()
+        cases = self.case_model.get_all(columns=('id', 'title'))
         case_options = [{'label': f"{case['title']} (ID: {case['id']})", 
                         'value': case['id']} for case in cases]
         
@@ -211,8 +211,7 @@ class EvidencePage(QWidget):
     def refresh(self):
         """Refresh the table data"""
         try:
-            evidence_list = self.evidence_model.get_all()
-            self.table.set_data(evidence_list)
+            self.table.set_model(self.evidence_model, columns='list')
         except Exception as e:
             print(f"Error refreshing evidence: {str(e)}")
             
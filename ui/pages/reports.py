@@ -7,10 +7,10 @@ from PyQt5.QtGui import QPainter, QFont
 from models.case import CaseModel
 from models.criminal import CriminalModel
 from models.evidence import EvidenceModel
-from utils.export_helper import export_to_excel, export_to_pdf
+from utils.export_helper import export_to_excel, export_to_pdf, write_csv
+from utils.async_db import AsyncDatabase
 from datetime import datetime, timedelta
 import os
-import csv
 
 class ReportButton(QPushButton):
     def __init__(self, text, parent=None):
@@ -57,6 +57,7 @@ class ReportsPage(QWidget):
         self.case_model = CaseModel()
         self.criminal_model = CriminalModel()
         self.evidence_model = EvidenceModel()
+        self.async_db = AsyncDatabase(self)
         self.setup_ui()
         
     def setup_ui(self):
@@ -418,13 +419,13 @@ class ReportsPage(QWidget):
             end_date = self.end_date.date().toPyDate()
             
             if report_type == 'status':
-                data = self.case_model.get_status_report(start_date, end_date)
+                query = self.case_model.get_status_report
                 title = "Case Status Report"
             else:  # timeline
-                data = self.case_model.get_timeline_report(start_date, end_date)
+                query = self.case_model.get_timeline_report
                 title = "Case Timeline Report"
             
-            self.export_report(data, title)
+            self.run_report(query, start_date, end_date, title, "Failed to generate case report")
             
         except Exception as e:
             self.show_error("Failed to generate case report", str(e))
@@ -436,13 +437,13 @@ class ReportsPage(QWidget):
             end_date = self.end_date.date().toPyDate()
             
             if report_type == 'stats':
-                data = self.criminal_model.get_statistics_report(start_date, end_date)
+                query = self.criminal_model.get_statistics_report
                 title = "Criminal Statistics Report"
             else:  # history
-                data = self.criminal_model.get_history_report(start_date, end_date)
+                query = self.criminal_model.get_history_report
                 title = "Criminal History Report"
             
-            self.export_report(data, title)
+            self.run_report(query, start_date, end_date, title, "Failed to generate criminal report")
             
         except Exception as e:
             self.show_error("Failed to generate criminal report", str(e))
@@ -454,17 +455,32 @@ class ReportsPage(QWidget):
             end_date = self.end_date.date().toPyDate()
             
             if report_type == 'inventory':
-                data = self.evidence_model.get_inventory_report(start_date, end_date)
+                query = self.evidence_model.get_inventory_report
                 title = "Evidence Inventory Report"
             else:  # custody
-                data = self.evidence_model.get_custody_report(start_date, end_date)
+                query = self.evidence_model.get_custody_report
                 title = "Chain of Custody Report"
             
-            self.export_report(data, title)
+            self.run_report(query, start_date, end_date, title, "Failed to generate evidence report")
             
         except Exception as e:
             self.show_error("Failed to generate evidence report", str(e))
     
+    def run_report(self, query, start_date, end_date, title, error_title):
+        """Run a report query on a worker thread, then offer to export it
+        
+        Starting another report cancels one that is still running.
+        """
+        self.async_db.submit(
+            'report',
+            query,
+            start_date,
+            end_date,
+            row_format='record',
+            on_result=lambda data: self.export_report(data, title),
+            on_error=lambda e: self.show_error(error_title, str(e))
+        )
+    
     def export_report(self, data, title):
         """Export report data to selected format"""
         try:
@@ -507,9 +523,7 @@ class ReportsPage(QWidget):
                     # Ensure the file has .csv extension
                     if not file_path.lower().endswith('.csv'):
                         file_path += '.csv'
-                    with open(file_path, 'w', newline='') as f:
-                        writer = csv.writer(f)
-                        writer.writerows(data)
+                    write_csv(data, file_path)
             
             if file_path:
                 QMessageBox.information(
@@ -147,13 +147,15 @@ class SettingsPage(QWidget):
     def save_settings(self):
         """Save settings to file"""
         try:
-            settings = {
+            # Keep keys not edited on this page (e.g. storage_profile)
+            settings = dict(self.settings)
+            settings.update({
                 'theme': self.theme_combo.currentText(),
                 'font_size': self.font_size.value(),
                 'auto_refresh': self.auto_refresh.isChecked(),
                 'refresh_interval': self.refresh_interval.value(),
                 'default_export_format': self.export_format.currentText()
-            }
+            })
             
             with open(self.settings_file, 'w') as f:
                 json.dump(settings, f, indent=4)
@@ -2,7 +2,8 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
                              QTableWidgetItem, QHeaderView, QLineEdit, QComboBox,
                              QPushButton, QLabel, QFrame)
 from PyQt5.QtCore import Qt, pyqtSignal
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Mapping
+from utils.async_db import AsyncDatabase
 import math
 
 class DataTable(QWidget):
@@ -26,6 +27,16 @@ class DataTable(QWidget):
         self.total_pages = 1
         self.filtered_data = []
         self.all_data = []
+        # Set by set_model(): pages are then fetched on demand with keyset
+        # pagination instead of slicing all_data
+        self.model = None
+        self.order_by = 'id'
+        self.descending = False
+        self.filters: Dict[str, Any] = {}
+        self.projection = None
+        self.page_keys: List[Optional[tuple]] = [None]
+        self.searching = False
+        self.async_db = AsyncDatabase(self)
         self.setup_ui()
         
     def setup_ui(self):
@@ -203,20 +214,102 @@ class DataTable(QWidget):
             }
         """)
         
-    def set_data(self, data: List[Dict[str, Any]]):
-        """Set table data and refresh display"""
-        self.all_data = data
-        self.filtered_data = data.copy()
+    def set_data(self, data: Iterable[Mapping[str, Any]]):
+        """Set table data and refresh display
+        
+        Rows may be dicts or read-only Records (row_format='record').
+        """
+        self.model = None
+        self.searching = False
+        self.async_db.cancel('rows')
+        self.all_data = list(data)
+        self.filtered_data = self.all_data.copy()
+        self.current_page = 1
+        self.refresh_table()
+        
+    def set_model(self, model, order_by: str = 'id', descending: bool = False,
+                  filters: Optional[Dict[str, Any]] = None, columns=None):
+        """Page through a model's table, loading one page at a time
+        
+        Pages come from model.get_page(), so only the visible rows are read;
+        columns limits them to a projection of the model. Searching matches
+        the displayed columns over all rows, full-text hits first. Pages and
+        searches are read on a worker thread.
+        """
+        self.model = model
+        self.order_by = order_by
+        self.descending = descending
+        self.filters = filters or {}
+        self.projection = columns
+        self.searching = False
+        self.all_data = []
+        self.filtered_data = []
+        if self.searchable and self.search_input.text():
+            self.handle_search(self.search_input.text())
+        else:
+            self.reload()
+        
+    def reload(self):
+        """Go back to the first page, re-reading it from the model if one is set"""
+        self.page_keys = [None]
         self.current_page = 1
         self.refresh_table()
         
     def refresh_table(self):
         """Refresh table display"""
+        if self.model is not None and not self.searching:
+            self.refresh_model_page()
+            return
+        
         # Calculate pagination
         start_idx = (self.current_page - 1) * self.page_size
         end_idx = start_idx + self.page_size
         page_data = self.filtered_data[start_idx:end_idx]
+        self.show_rows(page_data)
+        
+        # Update pagination controls
+        self.total_pages = math.ceil(len(self.filtered_data) / self.page_size)
+        self.page_label.setText(f"Page {self.current_page} of {self.total_pages}")
+        self.prev_btn.setEnabled(self.current_page > 1)
+        self.next_btn.setEnabled(self.current_page < self.total_pages)
+        
+    def refresh_model_page(self):
+        """Fetch the current page from the model on a worker thread"""
+        # Paging waits for the page in flight, so page_keys stays in step
+        self.prev_btn.setEnabled(False)
+        self.next_btn.setEnabled(False)
+        self.async_db.submit(
+            'rows',
+            self.model.get_page,
+            order_by=self.order_by,
+            after_key=self.page_keys[self.current_page - 1],
+            limit=self.page_size,
+            filters=self.filters,
+            descending=self.descending,
+            row_format='record',
+            columns=self.projection,
+            on_result=self.show_model_page,
+            on_error=lambda e: print(f"Error loading page: {str(e)}")
+        )
         
+    def show_model_page(self, page: Dict[str, Any]):
+        """Show a page fetched by refresh_model_page()"""
+        self.show_rows(page['rows'])
+        
+        # Remember where the next page starts so it can seek straight there
+        del self.page_keys[self.current_page:]
+        if page['next_key'] is not None:
+            self.page_keys.append(page['next_key'])
+        
+        has_next = page['next_key'] is not None
+        self.total_pages = max(math.ceil(page['approx_total'] / self.page_size),
+                               self.current_page + has_next)
+        self.page_label.setText(f"Page {self.current_page} of {self.total_pages}")
+        self.prev_btn.setEnabled(self.current_page > 1)
+        self.next_btn.setEnabled(has_next)
+        
+    def show_rows(self, page_data: List[Mapping[str, Any]]):
+        """Fill the table widget with one page of rows"""
         # Update table
         self.table.setRowCount(len(page_data))
         
@@ -227,14 +320,24 @@ class DataTable(QWidget):
                 item.setData(Qt.UserRole, row_data)  # Store full row data
                 self.table.setItem(row_idx, col_idx, item)
         
-        # Update pagination controls
-        self.total_pages = math.ceil(len(self.filtered_data) / self.page_size)
-        self.page_label.setText(f"Page {self.current_page} of {self.total_pages}")
-        self.prev_btn.setEnabled(self.current_page > 1)
-        self.next_btn.setEnabled(self.current_page < self.total_pages)
-        
     def handle_search(self, search_text: str):
         """Handle search input changes"""
+        if self.model is not None:
+            # Only the current page is loaded; search the whole table instead
+            self.searching = bool(search_text)
+            if not self.searching:
+                self.reload()
+                return
+            self.async_db.submit(
+                'rows',
+                self.fetch_matches,
+                search_text,
+                self.search_fields(),
+                on_result=self.show_matches,
+                on_error=lambda e: print(f"Error searching: {str(e)}")
+            )
+            return
+        
         if not search_text:
             self.filtered_data = self.all_data.copy()
         else:
@@ -264,21 +367,58 @@ class DataTable(QWidget):
         self.current_page = 1
         self.refresh_table()
         
+    def search_fields(self) -> List[str]:
+        """Keys of the columns the search box applies to"""
+        selected_column = self.filter_combo.currentText()
+        if selected_column == "All Columns":
+            return [col['key'] for col in self.columns]
+        return [col['key'] for col in self.columns if col['title'] == selected_column]
+        
+    def fetch_matches(self, search_text: str, fields: List[str]) -> List[Dict[str, Any]]:
+        """Rows matching a search over the model (runs on a worker thread)
+        
+        Full-text hits come first, best match first, followed by the other
+        rows whose displayed fields contain the text, e.g. an ID or status.
+        The full-text index is skipped when searching a single column.
+        """
+        pk = self.model.primary_key
+        known = self.model.column_names()
+        fields = [field for field in fields if field in known]
+        if not fields:
+            return []
+        matches = {}
+        if len(fields) > 1:
+            for row in self.model.full_text_search(search_text, fields):
+                matches.setdefault(row[pk], row)
+        for row in self.model.search(search_text, fields):
+            matches.setdefault(row[pk], row)
+        return [
+            row for row in matches.values()
+            if all(row.get(field) == value for field, value in self.filters.items())
+        ]
+        
+    def show_matches(self, rows: List[Dict[str, Any]]):
+        """Show the rows found by fetch_matches() from the first page"""
+        self.all_data = rows
+        self.filtered_data = self.all_data.copy()
+        self.current_page = 1
+        self.refresh_table()
+        
     def handle_selection(self):
         """Handle row selection"""
         selected_items = self.table.selectedItems()
         if selected_items:
             row_data = selected_items[0].data(Qt.UserRole)
-            self.row_selected.emit(row_data)
+            self.row_selected.emit(dict(row_data))
             
     def handle_double_click(self, item):
         """Handle row double click"""
         row_data = item.data(Qt.UserRole)
-        self.row_double_clicked.emit(row_data)
+        self.row_double_clicked.emit(dict(row_data))
         
     def next_page(self):
         """Go to next page"""
-        if self.current_page < self.total_pages:
+        if self.next_btn.isEnabled():
             self.current_page += 1
             self.refresh_table()
             
@@ -296,5 +436,5 @@ class DataTable(QWidget):
         """Get data from selected row"""
         selected_items = self.table.selectedItems()
         if selected_items:
-            return selected_items[0].data(Qt.UserRole)
+            return dict(selected_items[0].data(Qt.UserRole))
         return None 
\ No newline at end of file
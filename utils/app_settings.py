@@ -0,0 +1,21 @@
+import json
+import os
+from typing import Any, Dict
+
+SETTINGS_FILE = 'settings.json'
+
+
+def load_settings(settings_file: str = SETTINGS_FILE) -> Dict[str, Any]:
+    """Load application settings, returning an empty dict if unavailable"""
+    try:
+        if os.path.exists(settings_file):
+            with open(settings_file, 'r') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def get_setting(key: str, default: Any = None, settings_file: str = SETTINGS_FILE) -> Any:
+    """Get a single setting value"""
+    return load_settings(settings_file).get(key, default)
@@ -0,0 +1,181 @@
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QCoreApplication, pyqtSignal
+from .db_helper import DatabaseHelper
+from .log_config import setup_logging
+
+
+class AsyncRequest:
+    """Handle for one submitted call
+
+    ``future`` resolves with the call's result on the worker thread; the
+    on_result/on_error callbacks run later on the GUI thread, and only if
+    the request was not cancelled or superseded in the meantime.
+    """
+
+    def __init__(self, key: Optional[str], func: Callable, args: tuple, kwargs: Dict[str, Any],
+                 on_result: Optional[Callable] = None, on_error: Optional[Callable] = None):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_result = on_result
+        self.on_error = on_error
+        self.future: Future = Future()
+        self.cancelled = False
+        self._db: Optional[DatabaseHelper] = None
+        self._thread: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """Drop the result and interrupt the query if it is running"""
+        with self._lock:
+            self.cancelled = True
+            self.future.cancel()
+            if self._thread is not None:
+                # Aborts the statement the worker is executing right now,
+                # on its read-write or its snapshot connection
+                self._db.interrupt(self._thread)
+
+
+class _Signals(QObject):
+    finished = pyqtSignal(object, object)  # request, result
+    failed = pyqtSignal(object, object)    # request, exception
+
+
+class _Task(QRunnable):
+    """Runs one request on a worker thread"""
+
+    def __init__(self, request: AsyncRequest, signals: _Signals):
+        super().__init__()
+        self.request = request
+        self.signals = signals
+        self.db = DatabaseHelper()
+
+    def run(self):
+        request = self.request
+        if not request.future.set_running_or_notify_cancel():
+            return
+
+        try:
+            # Pin this thread's pooled connection so cancel() can interrupt it;
+            # every query made by func reuses the same connection
+            with self.db.get_connection():
+                with request._lock:
+                    if not request.cancelled:
+                        request._db = self.db
+                        request._thread = threading.get_ident()
+                if request.cancelled:
+                    raise sqlite3.OperationalError("interrupted")
+                try:
+                    result = request.func(*request.args, **request.kwargs)
+                finally:
+                    with request._lock:
+                        request._thread = None
+        except Exception as e:
+            request.future.set_exception(e)
+            if not request.cancelled:
+                self.signals.failed.emit(request, e)
+            return
+        finally:
+            # Qt worker threads are not threading.Thread objects, so the pools
+            # cannot tell when they exit; give the connections back explicitly
+            self.db.release_connection()
+
+        request.future.set_result(result)
+        if not request.cancelled:
+            self.signals.finished.emit(request, result)
+
+
+class AsyncDatabase(QObject):
+    """Run model calls off the GUI thread and deliver results back to it
+
+    Requests submitted with the same key supersede each other: submitting
+    a new one cancels the previous request, so only the latest result for
+    a key ever reaches its callback. Results are delivered through Qt's
+    queued signals, so callbacks may touch widgets freely.
+    """
+
+    _pool: Optional[QThreadPool] = None
+    max_threads = 4
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.logger = setup_logging('database')
+        self._latest: Dict[str, AsyncRequest] = {}
+        self._signals = _Signals(self)
+        self._signals.finished.connect(self._deliver_result)
+        self._signals.failed.connect(self._deliver_error)
+
+    @classmethod
+    def thread_pool(cls) -> QThreadPool:
+        """Worker pool shared by all pages"""
+        if cls._pool is None:
+            cls._pool = QThreadPool()
+            cls._pool.setMaxThreadCount(cls.max_threads)
+        return cls._pool
+
+    def submit(self, key: Optional[str], func: Callable, *args,
+               on_result: Optional[Callable] = None, on_error: Optional[Callable] = None,
+               **kwargs) -> AsyncRequest:
+        """Run func(*args, **kwargs) on a worker thread
+
+        Pass key=None for requests that should never supersede each other.
+        """
+        request = AsyncRequest(key, func, args, kwargs, on_result, on_error)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = request
+
+        self.thread_pool().start(_Task(request, self._signals))
+        return request
+
+    def cancel(self, key: str) -> None:
+        """Cancel the pending request for a key, if any"""
+        request = self._latest.pop(key, None)
+        if request is not None:
+            request.cancel()
+
+    def cancel_all(self) -> None:
+        """Cancel every pending request made through this facade"""
+        for key in list(self._latest):
+            self.cancel(key)
+
+    def is_busy(self, key: str) -> bool:
+        """Whether a request for the key is still waiting for its result"""
+        return key in self._latest
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until all workers are idle, then deliver queued results
+
+        Meant for shutdown and scripted use; pages should rely on callbacks.
+        """
+        done = self.thread_pool().waitForDone(msecs)
+        QCoreApplication.processEvents()
+        return done
+
+    def _is_current(self, request: AsyncRequest) -> bool:
+        if request.cancelled:
+            return False
+        if request.key is None:
+            return True
+        if self._latest.get(request.key) is not request:
+            return False
+        del self._latest[request.key]
+        return True
+
+    def _deliver_result(self, request: AsyncRequest, result: Any) -> None:
+        if self._is_current(request) and request.on_result is not None:
+            request.on_result(result)
+
+    def _deliver_error(self, request: AsyncRequest, error: Exception) -> None:
+        if not self._is_current(request):
+            return
+        if request.on_error is not None:
+            request.on_error(error)
+        else:
+            self.logger.error(f"Background database call failed: {str(error)}")
@@ -1,13 +1,25 @@
 import sqlite3
+import atexit
+import threading
+import time
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Sequence
 import os
 from .log_config import setup_logging
+from .db_pool import ConnectionPool
+from .storage_profile import load_storage_profile, load_reader_profile, apply_storage_profile
+from .query_cache import QueryCache, DEFAULT_CACHE_MB, read_tables, written_table
+from .query_stats import QueryStats, DEFAULT_SLOW_QUERY_MS, STATS_FILE
+from .row_format import make_rows
+from .app_settings import get_setting
+from database.migrations import DERIVED_TABLES
 
 class DatabaseHelper:
     _instance = None
     _db_dir = 'data'
     _db_name = 'crime_records.db'
+    _pool_size = 8
+    _reader_pool_size = 4
     
     def __new__(cls):
         if cls._instance is None:
@@ -15,6 +27,23 @@ class DatabaseHelper:
             cls._instance._ensure_data_dir()
             cls._instance.db_path = os.path.join(cls._db_dir, cls._db_name)
             cls._instance.logger = setup_logging('database')
+            cls._instance.storage_profile = load_storage_profile()
+            cls._instance.reader_profile = load_reader_profile()
+            cls._instance._pool = None
+            cls._instance._reader_pool = None
+            cls._instance._max_variables = None
+            cls._instance._pool_lock = threading.Lock()
+            cls._instance._local = threading.local()
+            cls._instance.query_cache = QueryCache(
+                int(get_setting('query_cache_mb', DEFAULT_CACHE_MB) * 1024 * 1024)
+            )
+            for table, derived in DERIVED_TABLES.items():
+                cls._instance.query_cache.add_derived(table, *derived)
+            cls._instance.query_stats = QueryStats(
+                float(get_setting('slow_query_ms', DEFAULT_SLOW_QUERY_MS))
+            )
+            atexit.register(cls._instance.close)
+            atexit.register(cls._instance._dump_stats_at_exit)
         return cls._instance
     
     @classmethod
@@ -28,49 +57,312 @@ class DatabaseHelper:
         cls._ensure_data_dir()
         return os.path.join(cls._db_dir, cls._db_name)
     
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool for the current database, created on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        self.db_path,
+                        max_connections=self._pool_size,
+                        on_connect=self._configure_connection
+                    )
+        return self._pool
+    
+    @property
+    def reader_pool(self) -> ConnectionPool:
+        """Read-only connections used by read_snapshot(), created on first use"""
+        if self._reader_pool is None:
+            with self._pool_lock:
+                if self._reader_pool is None:
+                    self._reader_pool = ConnectionPool(
+                        self.db_path,
+                        max_connections=self._reader_pool_size,
+                        on_connect=self._configure_reader,
+                        read_only=True
+                    )
+        return self._reader_pool
+    
+    def _configure_connection(self, conn: sqlite3.Connection) -> None:
+        """Prepare a freshly opened pooled connection"""
+        conn.row_factory = sqlite3.Row  # Enable row factory for named columns
+        # Autocommit mode: single statements commit on their own and
+        # transaction() issues BEGIN/SAVEPOINT explicitly
+        conn.isolation_level = None
+        apply_storage_profile(conn, self.storage_profile)
+    
+    def _configure_reader(self, conn: sqlite3.Connection) -> None:
+        """Prepare a freshly opened read-only connection"""
+        conn.row_factory = sqlite3.Row
+        conn.isolation_level = None
+        apply_storage_profile(conn, self.reader_profile, read_only=True)
+        conn.execute("PRAGMA query_only = ON")
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable row factory for named columns
+        """Context manager yielding this thread's pooled connection
+        
+        Inside read_snapshot() this is the snapshot's read-only connection,
+        unless a transaction() is open.
+        """
+        reader = getattr(self._local, 'reader', None)
+        if reader is not None and not self.in_transaction():
+            yield reader
+            return
+        
+        with self._writer_connection() as conn:
+            yield conn
+    
+    @contextmanager
+    def _writer_connection(self):
+        """This thread's connection from the read-write pool"""
+        conn = self.pool.acquire()
         try:
             yield conn
+        except Exception:
+            # Never leave a half-finished write on a long-lived connection,
+            # unless an enclosing transaction() owns the rollback decision
+            if conn.in_transaction and not self.in_transaction():
+                conn.rollback()
+            raise
+    
+    def in_transaction(self) -> bool:
+        """Whether the calling thread is inside transaction()"""
+        return getattr(self._local, 'depth', 0) > 0
+    
+    @contextmanager
+    def transaction(self):
+        """Run everything in the block as one unit of work
+        
+        Every DatabaseHelper call made by this thread inside the block uses the
+        same connection and therefore joins the transaction. Nested blocks
+        become savepoints, so an inner failure can be caught without losing
+        the outer work. The outermost block commits once on success.
+        """
+        with self._writer_connection() as conn:
+            depth = getattr(self._local, 'depth', 0)
+            savepoint = f"sp_{depth}"
+            if depth == 0:
+                conn.execute("BEGIN IMMEDIATE")
+            else:
+                conn.execute(f"SAVEPOINT {savepoint}")
+            self._local.depth = depth + 1
+            if depth == 0:
+                self._local.written = set()
+            
+            try:
+                yield conn
+            except BaseException:
+                self._local.depth = depth
+                if depth == 0:
+                    conn.rollback()
+                    self._end_transaction()
+                else:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                raise
+            
+            self._local.depth = depth
+            if depth == 0:
+                try:
+                    conn.execute("COMMIT")
+                finally:
+                    self._end_transaction()
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+    
+    def in_read_snapshot(self) -> bool:
+        """Whether the calling thread is inside read_snapshot()"""
+        return getattr(self._local, 'reader', None) is not None
+    
+    @contextmanager
+    def read_snapshot(self):
+        """Serve every read in the block from one consistent snapshot
+        
+        Queries run on a read-only (mode=ro, query_only) connection inside a
+        single read transaction, so under WAL they all see the database as
+        of the first read, run in parallel with other readers and never
+        block or wait for the writer. Writes in the block fail. Nested
+        blocks, and blocks opened inside transaction(), reuse the current
+        connection.
+        """
+        if self.in_read_snapshot() or self.in_transaction():
+            yield
+            return
+        
+        pool = self.reader_pool
+        conn = pool.acquire()
+        try:
+            conn.execute("BEGIN")
+            self._local.reader = conn
+            yield
         finally:
-            conn.close()
+            self._local.reader = None
+            try:
+                if conn.in_transaction:
+                    conn.execute("COMMIT")  # Ends the read transaction; nothing to write
+            finally:
+                # The reader pool is small; hand the connection on right away
+                # instead of pinning it to this thread until the thread exits
+                pool.release()
+    
+    def interrupt(self, thread_ident: int) -> None:
+        """Abort whatever statement the given thread is running"""
+        for pool in (self._pool, self._reader_pool):
+            conn = pool.connection_for(thread_ident) if pool is not None else None
+            if conn is not None:
+                conn.interrupt()
+    
+    def _end_transaction(self) -> None:
+        """Invalidate cache entries other threads may have read mid-transaction"""
+        written, self._local.written = self._local.written, set()
+        if written:
+            self.query_cache.bump(*written)
+    
+    def _table_written(self, table: Optional[str]) -> None:
+        """Record a write so cached reads of the table are invalidated"""
+        if table is None:
+            return
+        self.query_cache.bump(table)
+        if self.in_transaction():
+            self._local.written.add(table.lower())
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the SELECT result cache"""
+        return self.query_cache.stats()
+    
+    def _dump_stats_at_exit(self) -> None:
+        """Leave the session's timings behind for scripts/query_stats.py"""
+        if self.query_stats.snapshot():
+            try:
+                self.dump_query_stats()
+            except OSError as e:
+                self.logger.error(f"Could not write query stats: {str(e)}")
+    
+    def dump_query_stats(self, path: str = STATS_FILE) -> str:
+        """Write per-statement timings and cache counters to a JSON file"""
+        return self.query_stats.dump(path, extra={'cache': self.cache_stats()})
+    
+    def release_connection(self) -> None:
+        """Return the calling thread's connections to their pools
+        
+        Call this when a thread the pools cannot watch, such as a Qt worker,
+        is done with the database.
+        """
+        if self.in_transaction() or self.in_read_snapshot():
+            raise sqlite3.ProgrammingError("Cannot release a connection that is still in use")
+        for pool in (self._pool, self._reader_pool):
+            if pool is not None:
+                pool.release()
+    
+    def close(self) -> None:
+        """Close all pooled connections; the pool is recreated on next use"""
+        with self._pool_lock:
+            pools = (self._pool, self._reader_pool)
+            self._pool = self._reader_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.close_all()
+        self.query_cache.clear()
             
-    def execute_query(self, query: str, params: tuple = ()) -> Optional[List[Dict[str, Any]]]:
-        """Execute a query and return results as a list of dictionaries"""
+    def execute_query(self, query: str, params: tuple = (), cache: bool = False,
+                      row_format: str = 'dict') -> Optional[List[Dict[str, Any]]]:
+        """Execute a query and return results as a list of dictionaries
+        
+        With cache=True a SELECT result is served from and stored in the
+        query cache until one of the tables it reads is written. With
+        row_format='record' rows are compact read-only Records instead of
+        dicts (see utils.row_format).
+        """
+        key = None
+        # Reads inside a transaction may see uncommitted rows and snapshot
+        # reads may be older than the table versions; never share either
+        if (cache and self.query_cache.enabled and not self.in_transaction()
+                and not self.in_read_snapshot()):
+            key = self.query_cache.key(query, params, row_format)
+            if key is not None:
+                cached = self.query_cache.get(key)
+                if cached is not None:
+                    return cached
+                versions = self.query_cache.snapshot(read_tables(query))
+        
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None  # Plain tuples; make_rows builds the rows
+                started = time.perf_counter()
+                # Writes commit on their own unless inside transaction()
                 cursor.execute(query, params)
                 
-                if query.strip().upper().startswith('SELECT'):
-                    results = cursor.fetchall()
-                    return [dict(row) for row in results]
+                if cursor.description is not None:
+                    rows = cursor.fetchall()
+                    self.query_stats.record(conn, query, params, time.perf_counter() - started)
+                    columns = [column[0] for column in cursor.description]
+                    results = make_rows(columns, rows, row_format)
+                    if key is not None:
+                        self.query_cache.put(key, versions, results)
+                    return results
                 else:
-                    conn.commit()
+                    self.query_stats.record(conn, query, params, time.perf_counter() - started)
+                    self._table_written(written_table(query))
                     return None
                     
         except sqlite3.Error as e:
             self.logger.error(f"Database error: {str(e)}")
             raise
-            
+
+    def iter_query(self, query: str, params: tuple = (), batch_size: int = 500,
+                   row_format: str = 'dict') -> Iterator[Dict[str, Any]]:
+        """Yield rows of a query one at a time, fetching batch_size rows per fetch
+
+        The cursor stays open until the generator is exhausted or closed, so
+        consumers never hold more than one batch of rows in memory.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                # Only time spent inside SQLite counts, not the consumer's work
+                elapsed = 0.0
+                try:
+                    started = time.perf_counter()
+                    cursor.execute(query, params)
+                    elapsed += time.perf_counter() - started
+                    columns = [column[0] for column in cursor.description or ()]
+                    while True:
+                        started = time.perf_counter()
+                        rows = cursor.fetchmany(batch_size)
+                        elapsed += time.perf_counter() - started
+                        if not rows:
+                            break
+                        yield from make_rows(columns, rows, row_format)
+                finally:
+                    cursor.close()
+                    self.query_stats.record(conn, query, params, elapsed)
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error in iter_query: {str(e)}")
+            raise
+
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
         """Execute many queries at once"""
         try:
-            with self.get_connection() as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
+                started = time.perf_counter()
                 cursor.executemany(query, params_list)
-                conn.commit()
+                self.query_stats.record(conn, query, params_list, time.perf_counter() - started)
+                self._table_written(written_table(query))
                 
         except sqlite3.Error as e:
             self.logger.error(f"Database error in execute_many: {str(e)}")
             raise
             
-    def get_single_result(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+    def get_single_result(self, query: str, params: tuple = (), cache: bool = False,
+                          row_format: str = 'dict') -> Optional[Dict[str, Any]]:
         """Execute a query and return a single result"""
-        results = self.execute_query(query, params)
+        results = self.execute_query(query, params, cache=cache, row_format=row_format)
         return results[0] if results else None
         
     def insert_and_get_id(self, table: str, data: Dict[str, Any]) -> int:
@@ -82,14 +374,102 @@ class DatabaseHelper:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                started = time.perf_counter()
                 cursor.execute(query, tuple(data.values()))
-                conn.commit()
+                self.query_stats.record(conn, query, tuple(data.values()), time.perf_counter() - started)
+                self._table_written(table)
                 return cursor.lastrowid
                 
         except sqlite3.Error as e:
             self.logger.error(f"Database error in insert_and_get_id: {str(e)}")
             raise
             
+    def insert_many(self, table: str, rows: Sequence[Dict[str, Any]], primary_key: str = 'id') -> List[int]:
+        """Insert records with one executemany in a single transaction
+        
+        Returns the new IDs in row order. Every row must have the same keys.
+        """
+        rows = list(rows)
+        columns = self._bulk_columns(rows)
+        if not columns:
+            return []
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        
+        try:
+            with self.transaction() as conn:
+                self._execute_bulk(conn, table, query, columns, rows)
+                if primary_key in columns:
+                    return [row[primary_key] for row in rows]
+                # The write lock keeps other inserts out, so the rows got
+                # consecutive rowids ending at the last one assigned
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                return list(range(last_id - len(rows) + 1, last_id + 1))
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error in insert_many: {str(e)}")
+            raise
+            
+    def upsert_many(self, table: str, rows: Sequence[Dict[str, Any]], key: Sequence[str],
+                    primary_key: str = 'id') -> List[int]:
+        """Insert records, updating the existing ones whose key columns match
+        
+        key needs a UNIQUE index to act as the ON CONFLICT target. Returns
+        the ID of each row's record, inserted or updated, in row order.
+        """
+        rows = list(rows)
+        columns = self._bulk_columns(rows)
+        if not columns:
+            return []
+        missing = [column for column in key if column not in columns]
+        if missing:
+            raise ValueError(f"Rows lack key column(s) {', '.join(missing)}")
+        
+        updates = [column for column in columns if column not in key and column != primary_key]
+        action = ("DO UPDATE SET " + ", ".join(f"{column} = excluded.{column}" for column in updates)
+                  if updates else "DO NOTHING")
+        query = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                 f"ON CONFLICT ({', '.join(key)}) {action}")
+        
+        try:
+            with self.transaction() as conn:
+                self._execute_bulk(conn, table, query, columns, rows)
+                
+                # Updated rows report no rowid, so look every key up afterwards
+                keys = list(dict.fromkeys(tuple(row[column] for column in key) for row in rows))
+                ids = {}
+                chunk_size = max(1, self.max_variables() // len(key))
+                row_placeholder = f"({', '.join('?' * len(key))})"
+                for start in range(0, len(keys), chunk_size):
+                    chunk = keys[start:start + chunk_size]
+                    lookup = (f"SELECT {primary_key}, {', '.join(key)} FROM {table} "
+                              f"WHERE ({', '.join(key)}) IN (VALUES {', '.join([row_placeholder] * len(chunk))})")
+                    for found in conn.execute(lookup, [value for values in chunk for value in values]):
+                        ids[tuple(found)[1:]] = found[0]
+                return [ids[tuple(row[column] for column in key)] for row in rows]
+                
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error in upsert_many: {str(e)}")
+            raise
+            
+    def _bulk_columns(self, rows: Sequence[Dict[str, Any]]) -> List[str]:
+        """Shared column list of bulk rows"""
+        if not rows:
+            return []
+        columns = list(rows[0])
+        for row in rows:
+            if len(row) != len(columns) or any(column not in row for column in columns):
+                raise ValueError("All rows of a bulk write must have the same columns")
+        return columns
+            
+    def _execute_bulk(self, conn: sqlite3.Connection, table: str, query: str,
+                      columns: List[str], rows: Sequence[Dict[str, Any]]) -> None:
+        """executemany one statement over dict rows, timed and cache-invalidating"""
+        params_list = [tuple(row[column] for column in columns) for row in rows]
+        started = time.perf_counter()
+        conn.executemany(query, params_list)
+        self.query_stats.record(conn, query, params_list, time.perf_counter() - started)
+        self._table_written(table)
+            
     def update_record(self, table: str, data: Dict[str, Any], condition: str, condition_params: tuple) -> None:
         """Update a record in the database"""
         set_clause = ', '.join([f"{k} = ?" for k in data.keys()])
@@ -110,4 +490,13 @@ class DatabaseHelper:
         WHERE type='table' AND name=?
         """
         result = self.execute_query(query, (table_name,))
-        return bool(result) 
\ No newline at end of file
+        return bool(result)
+    
+    def max_variables(self) -> int:
+        """Most ? parameters a single statement may bind"""
+        if self._max_variables is None:
+            with self.get_connection() as conn:
+                getlimit = getattr(conn, 'getlimit', None)  # Python 3.11+
+                # 999 was the compiled-in limit before SQLite 3.32
+                self._max_variables = getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) if getlimit else 999
+        return self._max_variables 
\ No newline at end of file
@@ -0,0 +1,236 @@
+import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from .log_config import setup_logging
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class _Owner:
+    """Marker held in thread-local storage, freed when its thread ends"""
+    __slots__ = ('__weakref__',)
+
+
+class ConnectionPool:
+    """Bounded pool that keeps one long-lived SQLite connection per thread.
+
+    A thread keeps the connection it was handed for as long as it lives, so
+    the sqlite statement cache survives between calls. Ownership is tied to
+    a marker in thread-local storage rather than to threading.Thread, since
+    threads not started through threading (Qt workers, _thread) never report
+    as dead. Python frees the marker when the thread ends, and the connection
+    is handed to the next thread. Threads that outlive their database work
+    should call release() instead of holding on to a connection.
+    With read_only=True connections are opened with a mode=ro URI and can
+    never write to the database file.
+    """
+
+    def __init__(self, db_path: str, max_connections: int = 8, timeout: float = 30.0,
+                 health_check_interval: float = 60.0,
+                 on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 read_only: bool = False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.on_connect = on_connect
+        self.logger = setup_logging('database')
+
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._owners: Dict[int, Tuple[weakref.ref, sqlite3.Connection]] = {}
+        self._idle: List[sqlite3.Connection] = []
+        # Threads waiting for a connection, served first come first served
+        self._waiting: Deque[object] = deque()
+        self._last_checked: Dict[int, float] = {}
+        self._size = 0
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or owned"""
+        return self._size
+
+    def acquire(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, checking one out if needed"""
+        owner = getattr(self._local, 'owner', None)
+        if owner is None:
+            owner = self._local.owner = _Owner()
+        ident = threading.get_ident()
+        with self._cond:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool has been closed")
+
+            entry = self._owners.get(ident)
+            if entry is not None and entry[0]() is owner:
+                conn = entry[1]
+            else:
+                if entry is not None:
+                    # A reused thread ident means the previous owner has exited
+                    del self._owners[ident]
+                    self._make_idle(entry[1])
+                conn = self._checkout(ident, owner)
+
+        if conn is None:
+            return self._open(ident, owner)
+        return self._ensure_healthy(ident, owner, conn)
+
+    def connection_for(self, thread_ident: int) -> Optional[sqlite3.Connection]:
+        """Connection currently owned by the given thread, if any"""
+        with self._cond:
+            owner = self._owners.get(thread_ident)
+            return owner[1] if owner is not None else None
+
+    def release(self) -> None:
+        """Hand the calling thread's connection back to the idle list"""
+        with self._cond:
+            owner = self._owners.pop(threading.get_ident(), None)
+            if owner is not None:
+                self._make_idle(owner[1])
+                self._cond.notify_all()
+
+    def close_all(self) -> None:
+        """Close every connection and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            connections = [conn for _, conn in self._owners.values()] + self._idle
+            self._owners.clear()
+            self._idle.clear()
+            self._last_checked.clear()
+            self._size = 0
+            self._cond.notify_all()
+
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Error closing pooled connection: {str(e)}")
+
+    def _checkout(self, ident: int, owner: _Owner) -> Optional[sqlite3.Connection]:
+        """Take an idle connection or reserve a slot; caller holds the lock
+
+        Returns None after reserving a slot for a new connection, which the
+        caller opens with _open() once the lock is released. Callers queue
+        up in arrival order, so a thread that keeps releasing and
+        re-acquiring cannot starve one that is already waiting.
+        """
+        deadline = time.monotonic() + self.timeout
+        ticket = object()
+        self._waiting.append(ticket)
+        try:
+            while True:
+                self._reap_dead_threads()
+                if self._waiting[0] is ticket:
+                    if self._idle:
+                        conn = self._idle.pop()
+                        break
+                    if self._size < self.max_connections:
+                        self._size += 1
+                        return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.timeout}s "
+                        f"({self.max_connections} in use)"
+                    )
+                # Thread exit is not signalled, so wake up periodically to reap
+                self._cond.wait(min(remaining, 0.5))
+        finally:
+            self._waiting.remove(ticket)
+            if self._waiting:
+                # The next in line may find a connection as well
+                self._cond.notify_all()
+
+        self._owners[ident] = (weakref.ref(owner), conn)
+        return conn
+
+    def _reap_dead_threads(self) -> None:
+        """Reclaim connections owned by threads that have exited"""
+        for ident, (owner, conn) in list(self._owners.items()):
+            if owner() is None:
+                del self._owners[ident]
+                self._make_idle(conn)
+
+    def _make_idle(self, conn: sqlite3.Connection) -> None:
+        """Roll back anything left open and park the connection"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.append(conn)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Discarding pooled connection: {str(e)}")
+            self._discard(conn)
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Close a connection and free its slot; caller holds the lock"""
+        self._last_checked.pop(id(conn), None)
+        self._size -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _open(self, ident: int, owner: _Owner) -> sqlite3.Connection:
+        """Open a connection for a slot reserved under the lock
+
+        Opening runs the storage PRAGMAs, which may wait on the database, so
+        it happens without the lock; only registering the result takes it.
+        """
+        try:
+            conn = self._create()
+        except BaseException:
+            with self._cond:
+                if not self._closed:
+                    self._size -= 1
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            if self._closed:
+                conn.close()
+                raise sqlite3.ProgrammingError("Connection pool has been closed")
+            self._last_checked[id(conn)] = time.monotonic()
+            self._owners[ident] = (weakref.ref(owner), conn)
+        return conn
+
+    def _create(self) -> sqlite3.Connection:
+        """Open a new connection shared safely between pool threads"""
+        if self.read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.on_connect:
+            try:
+                self.on_connect(conn)
+            except BaseException:
+                conn.close()
+                raise
+        return conn
+
+    def _ensure_healthy(self, ident: int, owner: _Owner, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Ping connections that have been idle for a while and replace dead ones"""
+        now = time.monotonic()
+        if now - self._last_checked.get(id(conn), 0.0) < self.health_check_interval:
+            return conn
+
+        try:
+            conn.execute("SELECT 1").fetchone()
+            self._last_checked[id(conn)] = now
+            return conn
+        except sqlite3.Error as e:
+            self.logger.warning(f"Replacing unhealthy pooled connection: {str(e)}")
+            with self._cond:
+                # Keep the slot reserved for the replacement
+                self._owners.pop(ident, None)
+                self._discard(conn)
+                self._size += 1
+            return self._open(ident, owner)
@@ -1,5 +1,7 @@
-from typing import List, Dict, Any
-import pandas as pd
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+import csv
+import itertools
+from openpyxl import Workbook
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
@@ -10,30 +12,49 @@ from datetime import datetime
 
 class ExportHelper:
     @staticmethod
-    def export_to_excel(data: List[Dict[str, Any]], file_path: str) -> str:
-        """Export data to Excel file"""
-        if not data:
+    def _peek_rows(data: Iterable[Dict[str, Any]]) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+        """Return the column names and an iterator over all rows
+        
+        Works with lists as well as generators such as DatabaseHelper.iter_query,
+        without materializing the rows.
+        """
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
             raise ValueError("No data to export")
-            
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
+        return list(first.keys()), itertools.chain([first], rows)
+    
+    @staticmethod
+    def export_to_excel(data: Iterable[Dict[str, Any]], file_path: str) -> str:
+        """Export data to Excel file"""
+        headers, rows = ExportHelper._peek_rows(data)
         
         # Ensure parent directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
-        # Export to Excel
-        df.to_excel(file_path, index=False, engine='openpyxl')
+        # Write-only workbooks stream rows to disk instead of keeping them in memory
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Sheet1')
+        sheet.append(headers)
+        for row in rows:
+            sheet.append([row.get(col) for col in headers])
+        workbook.save(file_path)
         return file_path
     
     @staticmethod
-    def export_to_csv(data: List[Dict[str, Any]], filename: str) -> str:
-        """Export data to CSV file"""
-        if not data:
-            raise ValueError("No data to export")
-            
-        # Convert to DataFrame
-        df = pd.DataFrame(data)
+    def write_csv(data: Iterable[Dict[str, Any]], file_path: str) -> str:
+        """Write data to the given CSV file"""
+        headers, rows = ExportHelper._peek_rows(data)
         
+        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=headers)
+            writer.writeheader()
+            writer.writerows(rows)
+        return file_path
+    
+    @staticmethod
+    def export_to_csv(data: Iterable[Dict[str, Any]], filename: str) -> str:
+        """Export data to CSV file"""
         # Ensure export directory exists
         export_dir = 'exports'
         os.makedirs(export_dir, exist_ok=True)
@@ -43,14 +64,12 @@ class ExportHelper:
         file_path = os.path.join(export_dir, f"{filename}_{timestamp}.csv")
         
         # Export to CSV
-        df.to_csv(file_path, index=False)
-        return file_path
+        return ExportHelper.write_csv(data, file_path)
     
     @staticmethod
-    def export_to_pdf(data: List[Dict[str, Any]], file_path: str, title: str) -> str:
+    def export_to_pdf(data: Iterable[Dict[str, Any]], file_path: str, title: str) -> str:
         """Export data to PDF file"""
-        if not data:
-            raise ValueError("No data to export")
+        headers, rows = ExportHelper._peek_rows(data)
             
         # Ensure parent directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -81,42 +100,48 @@ class ExportHelper:
         story.append(Paragraph(title, title_style))
         story.append(Spacer(1, 12))
         
-        # Prepare table data
-        if data:
-            headers = list(data[0].keys())
-            table_data = [headers]
-            for item in data:
-                row = [str(item.get(col, '')) for col in headers]
-                table_data.append(row)
-            
-            # Create table
-            table = Table(table_data, repeatRows=1)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-            ]))
-            
-            story.append(table)
+        # Prepare table data (only the rendered strings are kept)
+        table_data = [headers]
+        for item in rows:
+            table_data.append([str(item.get(col, '')) for col in headers])
+        
+        # Create table
+        table = Table(table_data, repeatRows=1)
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 12),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ]))
+        
+        story.append(table)
         
         # Build PDF
         doc.build(story)
         return file_path
     
     @staticmethod
-    def generate_case_report(case_data: Dict[str, Any], evidence_list: List[Dict[str, Any]],
-                           criminal_list: List[Dict[str, Any]]) -> str:
-        """Generate a comprehensive case report in PDF format"""
+    def generate_case_report(case_data: Dict[str, Any], evidence_list: Optional[List[Dict[str, Any]]] = None,
+                           criminal_list: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate a comprehensive case report in PDF format
+        
+        The lists default to the 'evidence' and 'criminals' of a case from
+        CaseModel.hydrate_case.
+        """
+        if evidence_list is None:
+            evidence_list = case_data.get('evidence', [])
+        if criminal_list is None:
+            criminal_list = case_data.get('criminals', [])
+        
         # Ensure export directory exists
         export_dir = 'exports'
         os.makedirs(export_dir, exist_ok=True)
@@ -163,8 +188,8 @@ class ExportHelper:
             ["Case ID:", str(case_data['id'])],
             ["Status:", case_data['status']],
             ["Officer:", case_data.get('officer_name', 'Not Assigned')],
-            ["Opened Date:", case_data['opened_date']],
-            ["Closed Date:", case_data.get('closed_date', 'Not Closed')]
+            ["Opened Date:", case_data.get('date_reported') or ''],
+            ["Closed Date:", case_data.get('closed_date') or 'Not Closed']
         ]
         
         case_table = Table(case_details)
@@ -213,7 +238,7 @@ class ExportHelper:
                 evidence_data.append([
                     str(evidence['id']),
                     evidence['description'],
-                    evidence['collected_on']
+                    evidence.get('date_collected') or ''
                 ])
             
             evidence_table = Table(evidence_data, repeatRows=1)
@@ -231,19 +256,23 @@ class ExportHelper:
         return file_path
 
 # Module-level functions that use the ExportHelper class
-def export_to_excel(data: List[Dict[str, Any]], file_path: str) -> str:
+def export_to_excel(data: Iterable[Dict[str, Any]], file_path: str) -> str:
     """Export data to Excel using the ExportHelper class"""
     return ExportHelper.export_to_excel(data, file_path)
 
-def export_to_csv(data: List[Dict[str, Any]], filename: str) -> str:
+def write_csv(data: Iterable[Dict[str, Any]], file_path: str) -> str:
+    """Write data to a CSV file using the ExportHelper class"""
+    return ExportHelper.write_csv(data, file_path)
+
+def export_to_csv(data: Iterable[Dict[str, Any]], filename: str) -> str:
     """Export data to CSV using the ExportHelper class"""
     return ExportHelper.export_to_csv(data, filename)
 
-def export_to_pdf(data: List[Dict[str, Any]], file_path: str, title: str) -> str:
+def export_to_pdf(data: Iterable[Dict[str, Any]], file_path: str, title: str) -> str:
     """Export data to PDF using the ExportHelper class"""
     return ExportHelper.export_to_pdf(data, file_path, title)
 
-def generate_case_report(case_data: Dict[str, Any], evidence_list: List[Dict[str, Any]],
-                        criminal_list: List[Dict[str, Any]]) -> str:
+def generate_case_report(case_data: Dict[str, Any], evidence_list: Optional[List[Dict[str, Any]]] = None,
+                        criminal_list: Optional[List[Dict[str, Any]]] = None) -> str:
     """Generate a case report using the ExportHelper class"""
     return ExportHelper.generate_case_report(case_data, evidence_list, criminal_list) 
\ No newline at end of file
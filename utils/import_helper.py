@@ -51,29 +51,40 @@ class DataImporter:
         success_count = 0
         error_count = 0
 
-        for _, row in df.iterrows():
-            try:
-                # First, verify that all referenced criminals exist
-                criminal_ids = [int(id.strip()) for id in str(row['criminal_ids']).split(',') if id.strip()]
-                for criminal_id in criminal_ids:
-                    if not self.criminal_model.get_criminal(criminal_id):
-                        raise ValueError(f"Criminal ID {criminal_id} does not exist")
-
-                # Create the case
-                case_data = {
-                    'title': row['title'],
-                    'description': row['description'],
-                    'status': row['status'],
-                    'priority': row['priority'],
-                    'date_opened': datetime.now().strftime('%Y-%m-%d'),
-                    'last_updated': datetime.now().strftime('%Y-%m-%d')
-                }
-                case_id = self.case_model.create_case(case_data, criminal_ids)
-
-                success_count += 1
-            except Exception as e:
-                logger.error(f"Error importing case: {str(e)}")
-                error_count += 1
+        # Check every referenced criminal ID up front in a few batched queries
+        referenced_ids = {
+            int(id.strip())
+            for value in df['criminal_ids'] for id in str(value).split(',') if id.strip().isdigit()
+        }
+        known_criminal_ids = referenced_ids.difference(self.criminal_model.missing_ids(referenced_ids))
+
+        # One transaction for the whole file; each row is a savepoint so
+        # a bad row is rolled back on its own without losing the others
+        with self.case_model.db.transaction():
+            for _, row in df.iterrows():
+                try:
+                    with self.case_model.db.transaction():
+                        # First, verify that all referenced criminals exist
+                        criminal_ids = [int(id.strip()) for id in str(row['criminal_ids']).split(',') if id.strip()]
+                        for criminal_id in criminal_ids:
+                            if criminal_id not in known_criminal_ids:
+                                raise ValueError(f"Criminal ID {criminal_id} does not exist")
+
+                        # Create the case
+                        case_data = {
+                            'title': row['title'],
+                            'description': row['description'],
+                            'status': row['status'],
+                            'priority': row['priority'],
+                            'date_opened': datetime.now().strftime('%Y-%m-%d'),
+                            'last_updated': datetime.now().strftime('%Y-%m-%d')
+                        }
+                        case_id = self.case_model.create_case(case_data, criminal_ids)
+
+                    success_count += 1
+                except Exception as e:
+                    logger.error(f"Error importing case: {str(e)}")
+                    error_count += 1
 
         return success_count, error_count
 
@@ -93,38 +104,42 @@ class DataImporter:
         success_count = 0
         error_count = 0
 
-        for _, row in df.iterrows():
-            try:
-                # First create/update the criminal
-                criminal_data = {
-                    'name': row['name'],
-                    'age': int(row['age']),
-                    'gender': row['gender'],
-                    'nationality': row['nationality'],
-                    'status': row.get('status', 'Active'),
-                    'description': row.get('description', ''),
-                    'date_added': datetime.now().strftime('%Y-%m-%d')
-                }
-                criminal_id = self.criminal_model.add_criminal(criminal_data)
-
-                # Then create the case and link it
-                case_data = {
-                    'title': row['case_title'],
-                    'description': row['case_description'],
-                    'status': row['case_status'],
-                    'priority': row['case_priority'],
-                    'date_opened': datetime.now().strftime('%Y-%m-%d'),
-                    'last_updated': datetime.now().strftime('%Y-%m-%d')
-                }
-                case_id = self.case_model.create_case(case_data)
-
-                # Link the criminal to the case
-                self.case_model.link_criminals(case_id, [criminal_id])
-
-                success_count += 1
-            except Exception as e:
-                logger.error(f"Error importing case-criminal: {str(e)}")
-                error_count += 1
+        # One transaction for the whole file; each row is a savepoint so
+        # a bad row is rolled back on its own without losing the others
+        with self.case_model.db.transaction():
+            for _, row in df.iterrows():
+                try:
+                    with self.case_model.db.transaction():
+                        # First create/update the criminal
+                        criminal_data = {
+                            'name': row['name'],
+                            'age': int(row['age']),
+                            'gender': row['gender'],
+                            'nationality': row['nationality'],
+                            'status': row.get('status', 'Active'),
+                            'description': row.get('description', ''),
+                            'date_added': datetime.now().strftime('%Y-%m-%d')
+                        }
+                        criminal_id = self.criminal_model.add_criminal(criminal_data)
+
+                        # Then create the case and link it
+                        case_data = {
+                            'title': row['case_title'],
+                            'description': row['case_description'],
+                            'status': row['case_status'],
+                            'priority': row['case_priority'],
+                            'date_opened': datetime.now().strftime('%Y-%m-%d'),
+                            'last_updated': datetime.now().strftime('%Y-%m-%d')
+                        }
+                        case_id = self.case_model.create_case(case_data)
+
+                        # Link the criminal to the case
+                        self.case_model.link_criminals(case_id, [criminal_id])
+
+                    success_count += 1
+                except Exception as e:
+                    logger.error(f"Error importing case-criminal: {str(e)}")
+                    error_count += 1
 
         return success_count, error_count
 
@@ -141,27 +156,35 @@ class DataImporter:
         success_count = 0
         error_count = 0
 
-        for _, row in df.iterrows():
-            try:
-                # Verify the case exists
-                case_id = int(row['case_id'])
-                if not self.case_model.get_case(case_id):
-                    raise ValueError(f"Case ID {case_id} does not exist")
-
-                evidence_data = {
-                    'name': row['name'],
-                    'type': row['type'],
-                    'description': row['description'],
-                    'case_id': case_id,
-                    'status': row.get('status', 'Active'),
-                    'date_added': datetime.now().strftime('%Y-%m-%d'),
-                    'location': row['location']
-                }
-                self.evidence_model.add_evidence(evidence_data)
-                success_count += 1
-            except Exception as e:
-                logger.error(f"Error importing evidence: {str(e)}")
-                error_count += 1
+        # Check every referenced case ID up front in a few batched queries
+        referenced_ids = {int(value) for value in pd.to_numeric(df['case_id'], errors='coerce').dropna()}
+        known_case_ids = referenced_ids.difference(self.case_model.missing_ids(referenced_ids))
+
+        # One transaction for the whole file; each row is a savepoint so
+        # a bad row is rolled back on its own without losing the others
+        with self.case_model.db.transaction():
+            for _, row in df.iterrows():
+                try:
+                    with self.case_model.db.transaction():
+                        # Verify the case exists
+                        case_id = int(row['case_id'])
+                        if case_id not in known_case_ids:
+                            raise ValueError(f"Case ID {case_id} does not exist")
+
+                        evidence_data = {
+                            'name': row['name'],
+                            'type': row['type'],
+                            'description': row['description'],
+                            'case_id': case_id,
+                            'status': row.get('status', 'Active'),
+                            'date_added': datetime.now().strftime('%Y-%m-%d'),
+                            'location': row['location']
+                        }
+                        self.evidence_model.add_evidence(evidence_data)
+                    success_count += 1
+                except Exception as e:
+                    logger.error(f"Error importing evidence: {str(e)}")
+                    error_count += 1
 
         return success_count, error_count
 
@@ -0,0 +1,157 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, NamedTuple, Optional, Tuple
+from .db_helper import DatabaseHelper
+from .log_config import setup_logging
+
+
+class LoginThrottled(Exception):
+    """Raised instead of checking a password while its login is locked out"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many failed logins, try again in {math.ceil(retry_after)} s")
+        self.retry_after = retry_after
+
+
+class ThrottleLimit(NamedTuple):
+    # Failures inside the window before backoff starts
+    max_failures: int
+    # Seconds a failure keeps counting
+    window: float
+    # Lockout after reaching max_failures; doubles with every further failure
+    base_delay: float
+    max_delay: float
+
+
+# 'user' limits each username, 'process' every login made by this
+# application, so guessing across many usernames is bounded as well
+DEFAULT_LIMITS: Dict[str, ThrottleLimit] = {
+    'user': ThrottleLimit(max_failures=5, window=900.0, base_delay=1.0, max_delay=900.0),
+    'process': ThrottleLimit(max_failures=50, window=900.0, base_delay=1.0, max_delay=300.0),
+}
+
+
+class LoginThrottle:
+    """Sliding-window limiter for failed logins with exponential backoff
+
+    Failures are kept as timestamps per (scope, key); only those inside
+    the scope's window count. Once a key reaches max_failures, the next
+    attempt must wait base_delay after the latest failure, doubling with
+    each further failure up to max_delay. Callers check retry_after()
+    before hashing, so a locked-out login costs no bcrypt work.
+
+    Failures are also written to login_failures and reloaded on first
+    use, so restarting the application does not reset the counters.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, ThrottleLimit]] = None,
+                 clock: Callable[[], float] = time.time, persist: bool = True):
+        self.limits = dict(limits or DEFAULT_LIMITS)
+        self.clock = clock
+        self.persist = persist
+        self.db = DatabaseHelper()
+        self.logger = setup_logging('database')
+        self._failures: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._loaded = not persist
+        # Keys held before stale ones are swept, e.g. under a username spray
+        self.max_tracked = 1024
+
+    @staticmethod
+    def _keys(username: str) -> Tuple[Tuple[str, str], ...]:
+        return (('user', username.strip().lower()), ('process', ''))
+
+    def _history(self, scope: str, key: str) -> Deque[float]:
+        history = self._failures.get((scope, key))
+        if history is None:
+            limit = self.limits[scope]
+            # Failures past the point where the delay hits max_delay change nothing
+            steps = math.ceil(math.log2(max(limit.max_delay / limit.base_delay, 1)))
+            history = self._failures[(scope, key)] = deque(maxlen=limit.max_failures + steps + 1)
+        return history
+
+    def _load(self) -> None:
+        """Reload recent failures from login_failures once"""
+        if self._loaded:
+            return
+        self._loaded = True
+        oldest = self.clock() - max(limit.window for limit in self.limits.values())
+        try:
+            rows = self.db.execute_query(
+                "SELECT scope, key, failed_at FROM login_failures WHERE failed_at > ? ORDER BY failed_at",
+                (oldest,)
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Login failures not restored: {str(e)}")
+            return
+        for row in rows:
+            if row['scope'] in self.limits:
+                self._history(row['scope'], row['key']).append(row['failed_at'])
+        self._write("DELETE FROM login_failures WHERE failed_at <= ?", [(oldest,)])
+
+    def _expire(self, scope: str, key: str, now: float) -> Deque[float]:
+        history = self._history(scope, key)
+        window = self.limits[scope].window
+        while history and history[0] <= now - window:
+            history.popleft()
+        if not history:
+            del self._failures[(scope, key)]
+        return history
+
+    def _sweep(self, now: float) -> None:
+        """Forget every key whose failures have all left the window"""
+        for scope, key in list(self._failures):
+            self._expire(scope, key, now)
+
+    def retry_after(self, username: str) -> float:
+        """Seconds until a login for username may be attempted; 0 if now"""
+        with self._lock:
+            self._load()
+            now = self.clock()
+            wait = 0.0
+            for scope, key in self._keys(username):
+                history = self._expire(scope, key, now)
+                limit = self.limits[scope]
+                if len(history) >= limit.max_failures:
+                    delay = min(limit.base_delay * 2 ** (len(history) - limit.max_failures),
+                                limit.max_delay)
+                    wait = max(wait, history[-1] + delay - now)
+            return wait
+
+    def record_failure(self, username: str) -> None:
+        """Count a failed login against the username and the process"""
+        with self._lock:
+            self._load()
+            now = self.clock()
+            keys = self._keys(username)
+            for scope, key in keys:
+                self._history(scope, key).append(now)
+            if len(self._failures) > self.max_tracked:
+                self._sweep(now)
+        if self.persist:
+            self._write(
+                "INSERT INTO login_failures (scope, key, failed_at) VALUES (?, ?, ?)",
+                [(scope, key, now) for scope, key in keys]
+            )
+
+    def record_success(self, username: str) -> None:
+        """Clear the username's failures; the process count is left alone"""
+        scope, key = self._keys(username)[0]
+        with self._lock:
+            self._load()
+            self._failures.pop((scope, key), None)
+        if self.persist:
+            # Also prune rows that have left every window
+            oldest = self.clock() - max(limit.window for limit in self.limits.values())
+            self._write("DELETE FROM login_failures WHERE (scope = ? AND key = ?) OR failed_at <= ?",
+                        [(scope, key, oldest)])
+
+    def _write(self, query: str, params_list) -> None:
+        # Throttling keeps working in memory if the table is unavailable
+        try:
+            self.db.execute_many(query, params_list)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Login failures not saved: {str(e)}")
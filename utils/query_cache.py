@@ -0,0 +1,155 @@
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+DEFAULT_CACHE_MB = 32
+
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_]*)', re.IGNORECASE)
+_WRITE_TARGET = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)'
+    r'\s+([A-Za-z_][A-Za-z0-9_]*)',
+    re.IGNORECASE
+)
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace so formatting differences share a cache entry"""
+    return ' '.join(query.split())
+
+
+def read_tables(query: str) -> FrozenSet[str]:
+    """Tables (and CTE names) a SELECT reads from"""
+    return frozenset(name.lower() for name in _TABLE_REF.findall(query))
+
+
+def written_table(query: str) -> Optional[str]:
+    """Table an INSERT/UPDATE/DELETE statement writes to, if any"""
+    match = _WRITE_TARGET.match(query)
+    return match.group(1).lower() if match else None
+
+
+def _copy_rows(rows: List[Any]) -> List[Any]:
+    """Copy dict rows so callers cannot mutate cached ones; records are read-only"""
+    if rows and isinstance(rows[0], dict):
+        return [dict(row) for row in rows]
+    return list(rows)
+
+
+def estimate_size(rows: List[Dict[str, Any]]) -> int:
+    """Rough memory footprint of a result set in bytes"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+class QueryCache:
+    """LRU cache of SELECT results invalidated by per-table versions
+
+    Each entry remembers the version of every table its query read. A write
+    bumps the version of the written table, so only entries depending on
+    that table stop matching; unrelated entries stay warm.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (table versions, rows, size)
+        self._versions: Dict[str, int] = {}
+        self._derived: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def key(self, query: str, params: tuple, row_format: str = 'dict') -> Optional[Hashable]:
+        """Cache key for a query, or None if its parameters are unhashable"""
+        key = (row_format, normalize_sql(query), tuple(params))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def snapshot(self, tables: FrozenSet[str]) -> Tuple[Tuple[str, int], ...]:
+        """Current versions of the given tables"""
+        with self._lock:
+            return tuple(sorted((t, self._versions.get(t, 0)) for t in tables))
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of a still-valid cached result, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                versions, rows, size = entry
+                if all(self._versions.get(t, 0) == v for t, v in versions):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    # Callers may mutate the rows they get back
+                    return _copy_rows(rows)
+                del self._entries[key]
+                self._bytes -= size
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, versions: Tuple[Tuple[str, int], ...], rows: List[Dict[str, Any]]) -> None:
+        """Store a result read while the tables were at the given versions"""
+        size = estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        rows = _copy_rows(rows)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (versions, rows, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def add_derived(self, table: str, *derived: str) -> None:
+        """Declare tables that triggers rewrite whenever table is written"""
+        with self._lock:
+            self._derived.setdefault(table.lower(), set()).update(t.lower() for t in derived)
+
+    def bump(self, *tables: str) -> None:
+        """Invalidate every entry that read one of the given tables"""
+        with self._lock:
+            for table in tables:
+                table = table.lower()
+                for affected in (table, *self._derived.get(table, ())):
+                    self._versions[affected] = self._versions.get(affected, 0) + 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size, for tuning"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
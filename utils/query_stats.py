@@ -0,0 +1,148 @@
+import bisect
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+from .log_config import setup_logging
+from .query_cache import normalize_sql
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+STATS_FILE = os.path.join('logs', 'query_stats.json')
+
+# Upper bounds of the latency histogram buckets in milliseconds; the last
+# bucket collects everything slower
+BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class _Histogram:
+    """Latency distribution of one normalized statement"""
+
+    __slots__ = ('count', 'total_ms', 'max_ms', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples"""
+        target = fraction * self.count
+        seen = 0
+        for bound, hits in zip(BUCKETS_MS, self.buckets):
+            seen += hits
+            if seen >= target:
+                return bound
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': round(self.max_ms, 3),
+            'histogram': {
+                (f"<={bound}" if i < len(BUCKETS_MS) else f">{BUCKETS_MS[-1]}"): hits
+                for i, (bound, hits) in enumerate(zip(BUCKETS_MS + [None], self.buckets))
+                if hits
+            },
+        }
+
+
+class QueryStats:
+    """Per-statement latency histograms and a slow-query log
+
+    Statements are grouped by whitespace-normalized SQL, so the same query
+    with different parameters shares one histogram. Anything slower than
+    slow_query_ms is written to logs/slow_queries.log with its plan and
+    the types, never the values, of its parameters.
+    """
+
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self.slow_logger = setup_logging('slow_queries')
+        self._histograms: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, conn: sqlite3.Connection, query: str, params: Any, elapsed: float) -> None:
+        """Record one execution that took elapsed seconds"""
+        elapsed_ms = elapsed * 1000
+        sql = normalize_sql(query)
+        with self._lock:
+            histogram = self._histograms.get(sql)
+            if histogram is None:
+                histogram = self._histograms[sql] = _Histogram()
+            histogram.add(elapsed_ms)
+
+        if self.slow_query_ms and elapsed_ms >= self.slow_query_ms:
+            self._log_slow(conn, sql, query, params, elapsed_ms)
+
+    def _log_slow(self, conn: sqlite3.Connection, sql: str, query: str, params: Any, elapsed_ms: float) -> None:
+        """Write a slow statement and its query plan to the slow log"""
+        plan = self.explain(conn, query, params)
+        self.slow_logger.warning(
+            f"{elapsed_ms:.1f} ms: {sql}\n"
+            f"    params: {self.describe_params(params)}\n"
+            f"    plan:\n" + "\n".join(f"      {line}" for line in plan)
+        )
+
+    @staticmethod
+    def describe_params(params: Any) -> str:
+        """Parameter count and types only; the values may be personal data"""
+        def types(row: Any) -> str:
+            if isinstance(row, dict):
+                return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in row.items()) + "}"
+            return "(" + ", ".join(type(value).__name__ for value in row) + ")"
+
+        # executemany parameters are a list of rows; the first one is representative
+        if isinstance(params, list):
+            return f"{len(params)} rows of {types(params[0])}" if params else "no rows"
+        return f"{len(params)} {types(params)}"
+
+    @staticmethod
+    def explain(conn: sqlite3.Connection, query: str, params: Any = ()) -> List[str]:
+        """EXPLAIN QUERY PLAN output as indented lines"""
+        # executemany parameters are a list of rows; the first one is representative
+        if isinstance(params, list):
+            params = params[0] if params else ()
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        except (sqlite3.Error, ValueError) as e:
+            return [f"(plan unavailable: {e})"]
+
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node_id] + detail)
+        return lines
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Statistics per statement, slowest total time first"""
+        with self._lock:
+            stats = [dict(sql=sql, **h.to_dict()) for sql, h in self._histograms.items()]
+        return sorted(stats, key=lambda s: s['total_ms'], reverse=True)
+
+    def reset(self) -> None:
+        """Forget all recorded timings"""
+        with self._lock:
+            self._histograms.clear()
+
+    def dump(self, path: str = STATS_FILE, extra: Optional[Dict[str, Any]] = None) -> str:
+        """Write the current statistics as JSON and return the path"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        data = {'slow_query_ms': self.slow_query_ms, 'queries': self.snapshot()}
+        if extra:
+            data.update(extra)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+        return path
@@ -0,0 +1,103 @@
+import keyword
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Sequence, Tuple, Type
+
+# 'dict' builds one dictionary per row; 'record' builds a read-only Record
+# whose column names live once on a class shared by every row of that shape
+ROW_FORMATS = ('dict', 'record')
+
+
+class Record(Mapping):
+    """Read-only mapping over one result row
+
+    Subclasses are generated per column list by record_class() and store
+    their values in __slots__, so a row costs roughly a tuple's worth of
+    memory instead of a dict's. Records support the read side of the dict
+    API (``row['name']``, ``get``, ``keys``, ``items``, ``dict(row)``) and
+    columns that are valid identifiers are also attributes (``row.name``).
+    """
+
+    __slots__ = ()
+    _columns: Tuple[str, ...] = ()
+    _slot_of: Dict[str, str] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            slot = self._slot_of[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return getattr(self, slot)
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slot_of
+
+    def __repr__(self) -> str:
+        return f"Record({dict(self)!r})"
+
+    def __reduce__(self):
+        return (_rebuild_record, (self._columns, tuple(self.values())))
+
+
+_record_classes: Dict[Tuple[str, ...], Type[Record]] = {}
+_record_classes_lock = threading.Lock()
+
+
+def _slot_name(column: str, position: int, taken: set) -> str:
+    """Attribute name for a column, falling back to a positional name"""
+    if (column.isidentifier() and not keyword.iskeyword(column)
+            and not column.startswith('_') and column != 'self'
+            and not hasattr(Record, column) and column not in taken):
+        return column
+    return f"_{position}"
+
+
+def record_class(columns: Sequence[str]) -> Type[Record]:
+    """Return the Record subclass for a column list, creating it once"""
+    columns = tuple(columns)
+    cls = _record_classes.get(columns)
+    if cls is not None:
+        return cls
+
+    with _record_classes_lock:
+        cls = _record_classes.get(columns)
+        if cls is None:
+            slots = []
+            for position, column in enumerate(columns):
+                slots.append(_slot_name(column, position, set(slots)))
+
+            # Generated like collections.namedtuple: a plain positional
+            # __init__ is far cheaper per row than a loop over setattr
+            body = ''.join(f"    self.{slot} = {slot}\n" for slot in slots) or "    pass\n"
+            params = ''.join(f", {slot}" for slot in slots)
+            namespace: Dict[str, Any] = {}
+            exec(f"def __init__(self{params}):\n{body}", namespace)
+
+            cls = type('Record', (Record,), {
+                '__slots__': tuple(slots),
+                '__init__': namespace['__init__'],
+                '_columns': columns,
+                '_slot_of': dict(zip(columns, slots)),
+            })
+            _record_classes[columns] = cls
+    return cls
+
+
+def _rebuild_record(columns: Tuple[str, ...], values: Tuple[Any, ...]) -> Record:
+    return record_class(columns)(*values)
+
+
+def make_rows(columns: Sequence[str], rows: Iterable[Sequence[Any]], row_format: str = 'dict') -> list:
+    """Convert raw value tuples into rows of the requested format"""
+    if row_format == 'record':
+        cls = record_class(columns)
+        return [cls(*row) for row in rows]
+    if row_format == 'dict':
+        return [dict(zip(columns, row)) for row in rows]
+    raise ValueError(f"Unknown row format '{row_format}', expected one of {', '.join(ROW_FORMATS)}")
@@ -0,0 +1,112 @@
+import sqlite3
+from typing import Any, Dict, Optional
+from .app_settings import load_settings
+from .log_config import setup_logging
+
+DEFAULT_PROFILE = 'desktop'
+DEFAULT_READER_PROFILE = 'reporting'
+
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Interactive use: WAL keeps readers and the writer out of each other's way
+    'desktop': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,          # ~16 MB
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # Large imports: durability of the last transactions traded for throughput
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -131072,         # ~128 MB
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+    },
+    # Read-heavy report sessions: big cache and memory-mapped reads
+    'reporting': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,          # ~64 MB
+        'mmap_size': 1024 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+    },
+}
+
+_CHOICES = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY'},
+}
+_INTEGERS = {'cache_size', 'mmap_size', 'busy_timeout'}
+
+# busy_timeout goes first so switching journal_mode can wait out other writers
+_PRAGMA_ORDER = ('busy_timeout', 'journal_mode', 'synchronous',
+                 'cache_size', 'mmap_size', 'temp_store')
+
+# Settings that change the database file rather than the connection; the
+# writer owns them, read-only connections leave them alone
+_WRITER_PRAGMAS = ('journal_mode', 'synchronous')
+
+logger = setup_logging('database')
+
+
+def resolve_profile(name: str, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Return a validated copy of a named profile with optional overrides"""
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile: {name}")
+
+    profile = dict(STORAGE_PROFILES[name])
+    profile.update(overrides or {})
+
+    validated = {}
+    for pragma, value in profile.items():
+        if pragma in _CHOICES:
+            value = str(value).upper()
+            if value not in _CHOICES[pragma]:
+                raise ValueError(f"Invalid value for {pragma}: {value}")
+        elif pragma in _INTEGERS:
+            value = int(value)
+        else:
+            raise ValueError(f"Unsupported storage setting: {pragma}")
+        validated[pragma] = value
+    return validated
+
+
+def load_storage_profile(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Resolve the profile configured in settings.json"""
+    if settings is None:
+        settings = load_settings()
+
+    name = settings.get('storage_profile', DEFAULT_PROFILE)
+    try:
+        return resolve_profile(name, settings.get('storage_overrides'))
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Falling back to '{DEFAULT_PROFILE}' storage profile: {str(e)}")
+        return resolve_profile(DEFAULT_PROFILE)
+
+
+def load_reader_profile(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Resolve the profile for read-only report connections"""
+    if settings is None:
+        settings = load_settings()
+
+    name = settings.get('reader_storage_profile', DEFAULT_READER_PROFILE)
+    try:
+        return resolve_profile(name)
+    except ValueError as e:
+        logger.warning(f"Falling back to '{DEFAULT_READER_PROFILE}' reader profile: {str(e)}")
+        return resolve_profile(DEFAULT_READER_PROFILE)
+
+
+def apply_storage_profile(conn: sqlite3.Connection, profile: Dict[str, Any], read_only: bool = False) -> None:
+    """Apply a resolved profile to a connection"""
+    for pragma in _PRAGMA_ORDER:
+        if read_only and pragma in _WRITER_PRAGMAS:
+            continue
+        if pragma in profile:
+            # PRAGMA does not accept bound parameters; values are validated above
+            conn.execute(f"PRAGMA {pragma} = {profile[pragma]}").fetchall()